@@ -0,0 +1,112 @@
+"""Benchmark: event-loop health with sync vs. aiosqlite project tools.
+
+Each simulated session waits on a fake model call, then runs a search and a
+lookup against the catalog, the way an agent turn would. A ticker task
+measures how late the event loop wakes it up; sessions are "handled" at a
+given concurrency while p99 loop lag stays under the budget.
+
+Usage:
+    uv run python benchmarks/bench_async_tools.py --rows 5000 --lag-budget-ms 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import toddle_ops.agents.project_database_team.async_tools as async_tools
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.connection import close_pools
+from toddle_ops.models.projects import Difficulty, Project
+
+WORDS = "paper glue paint crayon salt dough leaf sponge bubble tape rice".split()
+
+
+def _project(i: int) -> Project:
+    word = WORDS[i % len(WORDS)]
+    return Project(
+        name=f"{word.title()} Project {i}",
+        description=f"A toddler project about {word} and {WORDS[(i * 7) % len(WORDS)]}.",
+        difficulty=Difficulty.EASY,
+        duration_minutes=15,
+        materials=f"{word}, paper, crayons",
+        instructions="Set up the table. Make the project. Clean up together.",
+    )
+
+
+async def _sync_turn(query: str) -> None:
+    for hit in tools.search_projects(query, limit=5):
+        tools.get_project(hit["project_id"])
+
+
+async def _async_turn(query: str) -> None:
+    for hit in await async_tools.search_projects(query, limit=5):
+        await async_tools.get_project(hit["project_id"])
+
+
+async def _measure(turn, sessions: int, model_latency: float) -> tuple[float, float]:
+    """Returns (sessions per second, p99 loop lag in ms)."""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        interval = 0.005
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append((time.perf_counter() - start - interval) * 1000)
+
+    async def session(i: int):
+        await asyncio.sleep(model_latency)  # waiting on the model
+        await turn(WORDS[i % len(WORDS)])
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+
+    p99 = statistics.quantiles(lags, n=100)[98] if len(lags) > 1 else 0.0
+    return sessions / elapsed, p99
+
+
+async def _run(levels: list[int], model_latency: float, budget_ms: float) -> None:
+    await async_tools.get_project("warm-up")
+    for label, turn in (("sync sqlite3", _sync_turn), ("aiosqlite", _async_turn)):
+        handled = 0
+        print(f"\n{label}")
+        for sessions in levels:
+            rate, p99 = await _measure(turn, sessions, model_latency)
+            ok = p99 <= budget_ms
+            handled = sessions if ok else handled
+            print(
+                f"  {sessions:>5} sessions: {rate:>8,.0f} sessions/s   "
+                f"p99 loop lag {p99:>8.1f} ms {'' if ok else '(over budget)'}"
+            )
+        print(f"  -> handles {handled} concurrent sessions within {budget_ms} ms lag")
+    await async_tools.close_connections()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--model-latency", type=float, default=0.05)
+    parser.add_argument("--lag-budget-ms", type=float, default=50.0)
+    parser.add_argument(
+        "--levels", type=int, nargs="+", default=[1, 10, 50, 100, 250, 500]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tools.DATABASE_FILE = Path(tmp) / "bench.db"
+        tools.init_db()
+        tools.create_projects(_project(i) for i in range(args.rows))
+        asyncio.run(_run(args.levels, args.model_latency, args.lag_budget_ms))
+        close_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Micro-benchmark: pooled WAL connections vs. opening SQLite on every call.
+
+Usage:
+    uv run python benchmarks/bench_db_connection.py --rows 2000
+"""
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.connection import close_pools
+from toddle_ops.models.projects import Difficulty, Project
+
+
+class _OpenPerCall:
+    """Reproduces the original `_get_db_connection` behavior."""
+
+    def __init__(self, database):
+        self.database = database
+
+    def __enter__(self):
+        self.conn = sqlite3.connect(self.database)
+        self.conn.row_factory = sqlite3.Row
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.commit()
+        self.conn.close()
+
+
+def _project(i: int) -> Project:
+    return Project(
+        name=f"Benchmark Project {i}",
+        description="A project used for benchmarking.",
+        difficulty=Difficulty.EASY,
+        duration_minutes=15,
+        materials="paper, crayons",
+        instructions="Draw something. Show someone.",
+    )
+
+
+def _run(label: str, rows: int) -> None:
+    projects = [_project(i) for i in range(rows)]
+
+    start = time.perf_counter()
+    for project in projects:
+        tools.create_project(project)
+    write_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for project in projects:
+        tools.get_project(project.project_id)
+    read_s = time.perf_counter() - start
+
+    print(
+        f"{label:<14} create: {rows / write_s:>9,.0f} ops/s   "
+        f"get: {rows / read_s:>9,.0f} ops/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # baseline: a fresh rollback-journal database, one connection per call
+        tools.DATABASE_FILE = Path(tmp) / "open_per_call.db"
+        original = tools._get_db_connection
+        tools._get_db_connection = lambda: _OpenPerCall(tools.DATABASE_FILE)
+        tools.init_db()
+        _run("open-per-call", args.rows)
+        tools._get_db_connection = original
+
+        tools.DATABASE_FILE = Path(tmp) / "pooled.db"
+        tools.init_db()
+        _run("pooled (WAL)", args.rows)
+        close_pools()
+
+
+if __name__ == "__main__":
+    main()
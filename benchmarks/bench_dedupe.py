@@ -0,0 +1,82 @@
+"""Benchmark: near-duplicate lookup latency as the catalog grows.
+
+Loads synthetic projects in steps and times signing and the LSH lookup
+(`dedupe.find_duplicate`) for fresh candidates at each catalog size. The
+lookup should stay flat.
+
+Usage:
+    uv run python benchmarks/bench_dedupe.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import toddle_ops.agents.project_database_team.dedupe as dedupe
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.connection import close_pools
+from toddle_ops.models.projects import Difficulty, Project
+
+NOUNS = (
+    "paper plate cup straw leaf rock sponge bubble ribbon button sock box tube "
+    "feather pom-pom spoon bottle cork shell pinecone bean pasta rice tape"
+).split()
+VERBS = "paint glue stack sort roll stamp cut fold squish pour dip thread".split()
+
+
+def _project(rng: random.Random, i: int) -> Project:
+    nouns = rng.sample(NOUNS, 4)
+    steps = " ".join(
+        f"{rng.choice(VERBS).title()} the {rng.choice(nouns)} {rng.randint(1, 9)} times."
+        for _ in range(6)
+    )
+    return Project(
+        name=f"{nouns[0].title()} {rng.choice(VERBS).title()} {i}",
+        description="A synthetic benchmark project.",
+        difficulty=Difficulty.EASY,
+        duration_minutes=rng.randint(5, 60),
+        materials=", ".join(nouns),
+        instructions=steps,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        tools.DATABASE_FILE = Path(tmp) / "bench.db"
+        tools.init_db()
+        loaded = 0
+        for size in sorted(args.sizes):
+            tools.create_projects(_project(rng, i) for i in range(loaded, size))
+            loaded = size
+
+            candidates = [_project(rng, -i) for i in range(args.lookups)]
+            signature_ms, lookup_ms = [], []
+            with tools._get_db_connection() as conn:
+                for candidate in candidates:
+                    start = time.perf_counter()
+                    sig = dedupe.signature(candidate)
+                    signed = time.perf_counter()
+                    dedupe.find_duplicate(conn, sig)
+                    lookup_ms.append((time.perf_counter() - signed) * 1000)
+                    signature_ms.append((signed - start) * 1000)
+
+            print(
+                f"{size:>9,} projects   signature p50 "
+                f"{statistics.median(signature_ms):.3f} ms   lookup p50 "
+                f"{statistics.median(lookup_ms):.3f} ms   p99 "
+                f"{statistics.quantiles(lookup_ms, n=100)[98]:.3f} ms"
+            )
+        close_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark: research-team tail latency, ParallelAgent vs. HedgedParallelAgent.
+
+Researchers are simulated: each takes a lognormal "search" time and, with
+some probability, hits a 429 and waits out a `retry_config` backoff (7s, or
+49s on a second 429). Compares the old team (two researchers, wait for
+both) with the hedged team (four researchers, first two win, 20s deadline).
+Times are scaled down by `--scale` so the run finishes quickly; reported
+latencies are scaled back up.
+
+Usage:
+    uv run python benchmarks/bench_hedged_research.py --requests 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent, ParallelAgent
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from toddle_ops.services.hedged_parallel import HedgedParallelAgent
+
+
+class SimulatedResearcher(BaseAgent):
+    """Sleeps for a search-like latency, then writes `output_key`."""
+
+    output_key: str
+    rng: random.Random
+    scale: float
+    rate_limit: float
+
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        seconds = self.rng.lognormvariate(1.0, 0.4)
+        if self.rng.random() < self.rate_limit:
+            seconds += 7
+            if self.rng.random() < self.rate_limit:
+                seconds += 49
+        await asyncio.sleep(seconds * self.scale)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={self.output_key: "research"}),
+        )
+
+
+def _researchers(names, rng, args):
+    return [
+        SimulatedResearcher(
+            name=name,
+            output_key=name.lower(),
+            rng=rng,
+            scale=args.scale,
+            rate_limit=args.rate_limit,
+        )
+        for name in names
+    ]
+
+
+async def _latencies(agent, requests: int, scale: float) -> list[float]:
+    sessions = InMemorySessionService()
+    runner = Runner(agent=agent, app_name="bench", session_service=sessions)
+    message = types.Content(role="user", parts=[types.Part(text="go")])
+    latencies = []
+    for _ in range(requests):
+        session = await sessions.create_session(app_name="bench", user_id="user")
+        start = time.perf_counter()
+        async for _ in runner.run_async(
+            user_id="user", session_id=session.id, new_message=message
+        ):
+            pass
+        latencies.append((time.perf_counter() - start) / scale)
+    return latencies
+
+
+def _report(name: str, latencies: list[float]):
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<22} p50 {q[49]:>6.1f}s   p95 {q[94]:>6.1f}s   "
+        f"p99 {q[98]:>6.1f}s   max {max(latencies):>6.1f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rate-limit", type=float, default=0.1)
+    parser.add_argument("--scale", type=float, default=0.002)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    baseline = ParallelAgent(
+        name="CraftResearchTeam",
+        sub_agents=_researchers(["Art", "Science"], rng, args),
+    )
+    hedged = HedgedParallelAgent(
+        name="CraftResearchTeam",
+        sub_agents=_researchers(["Art", "Science", "Silly", "Random"], rng, args),
+        branch_timeout=20 * args.scale,
+        min_completed=2,
+    )
+    _report(
+        "parallel, 2 of 2", asyncio.run(_latencies(baseline, args.requests, args.scale))
+    )
+    _report(
+        "hedged, 2 of 4", asyncio.run(_latencies(hedged, args.requests, args.scale))
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Benchmark: framework overhead of the full agent graph, offline.
+
+Runs `root_agent` end to end with every model replaced by `FakeGemini`, so
+no API key is needed and, with the default zero latency, everything
+measured is framework time: runner and session bookkeeping, state
+templating, callbacks, the project database, memory ingest and compaction.
+
+Three measurements:
+- Stages: requests/sec and latency as the local app's services are added
+  one at a time (memory ingest, the SQLite session database, event
+  compaction), and the per-request cost of each. Each request is a new
+  single-turn session, so compaction (every few turns) is only checked.
+- Agents: wall time per agent from `MetricsPlugin`, in the full setup.
+- Memory: traced Python heap after every tenth of `--sessions` requests,
+  and the growth per session.
+
+The project cache is off unless `--cache` is given, so every request runs
+the whole pipeline. All databases live in a temporary directory.
+
+Usage:
+    uv run python benchmarks/bench_offline_pipeline.py --requests 200
+    uv run python benchmarks/bench_offline_pipeline.py --latency 0.5 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import tempfile
+import time
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+
+from google.adk.apps.app import App
+from google.adk.memory import InMemoryMemoryService
+from google.adk.runners import Runner
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService
+from google.genai import types
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.root_agent.agent import cached_pipeline, root_agent
+from toddle_ops.config.basic import events_compaction_config
+from toddle_ops.services.fake_llm import FakeGemini, fake_models
+from toddle_ops.services.metrics import MetricsPlugin
+from toddle_ops.services.research_cache import research_cache
+
+PROMPT = "Please provide a project."
+
+# each stage adds one piece of the local app's setup to the one before
+STAGES = ["in-memory", "+ memory ingest", "+ sqlite sessions", "+ compaction"]
+
+
+@contextmanager
+def _memory_ingest(enabled: bool):
+    callback = root_agent.after_agent_callback
+    if not enabled:
+        root_agent.after_agent_callback = None
+    try:
+        yield
+    finally:
+        root_agent.after_agent_callback = callback
+
+
+def _runner(stage: int, workdir: Path, plugins: list) -> Runner:
+    if stage >= 2:
+        db = workdir / f"sessions-{stage}.db"
+        sessions = DatabaseSessionService(db_url=f"sqlite+aiosqlite:///{db}")
+    else:
+        sessions = InMemorySessionService()
+    app = App(
+        name="bench",
+        root_agent=root_agent,
+        plugins=plugins,
+        events_compaction_config=events_compaction_config if stage >= 3 else None,
+    )
+    return Runner(
+        app=app, session_service=sessions, memory_service=InMemoryMemoryService()
+    )
+
+
+async def _request(runner: Runner) -> float:
+    sessions = runner.session_service
+    session = await sessions.create_session(app_name=runner.app_name, user_id="bench")
+    message = types.Content(role="user", parts=[types.Part(text=PROMPT)])
+    start = time.perf_counter()
+    async for _ in runner.run_async(
+        user_id="bench", session_id=session.id, new_message=message
+    ):
+        pass
+    return time.perf_counter() - start
+
+
+async def _throughput(
+    runner: Runner, requests: int, concurrency: int
+) -> tuple[float, list[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            return await _request(runner)
+
+    await _request(runner)  # warm up imports, schema and caches
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - start), latencies
+
+
+def _stages(args, workdir: Path) -> MetricsPlugin:
+    print(f"{'stage':<20} {'req/s':>8} {'p50':>9} {'p95':>9} {'added':>10}")
+    previous = None
+    for stage, name in enumerate(STAGES):
+        plugin = MetricsPlugin()
+        runner = _runner(stage, workdir, [plugin])
+        with _memory_ingest(stage >= 1):
+            rate, latencies = asyncio.run(
+                _throughput(runner, args.requests, args.concurrency)
+            )
+        q = statistics.quantiles(latencies, n=100)
+        per_request = statistics.mean(latencies) * 1000
+        added = "" if previous is None else f"{per_request - previous:+.2f}ms"
+        print(
+            f"{name:<20} {rate:>8.1f} {q[49] * 1000:>7.2f}ms "
+            f"{q[94] * 1000:>7.2f}ms {added:>10}"
+        )
+        previous = per_request
+    return plugin
+
+
+def _agents(plugin: MetricsPlugin):
+    snapshot = plugin.snapshot()
+    model_seconds = {}
+    for series, summary in snapshot["model_seconds"].items():
+        agent = series.split("/")[0]
+        model_seconds[agent] = model_seconds.get(agent, 0.0) + summary["sum"]
+    print(f"\n{'agent':<28} {'runs':>6} {'p50':>9} {'p95':>9} {'model share':>12}")
+    agents = sorted(snapshot["agent_seconds"].items(), key=lambda item: -item[1]["sum"])
+    for agent, summary in agents:
+        share = model_seconds.get(agent, 0.0) / summary["sum"] if summary["sum"] else 0
+        print(
+            f"{agent:<28} {summary['count']:>6} {summary['p50'] * 1000:>7.2f}ms "
+            f"{summary['p95'] * 1000:>7.2f}ms {share:>11.0%}"
+        )
+
+
+def _memory(args, workdir: Path):
+    runner = _runner(len(STAGES) - 1, workdir, [])
+    step = max(1, args.sessions // 10)
+
+    async def run():
+        samples = []
+        await _request(runner)
+        tracemalloc.start()
+        for done in range(1, args.sessions + 1):
+            await _request(runner)
+            if done % step == 0:
+                samples.append((done, tracemalloc.get_traced_memory()[0]))
+        tracemalloc.stop()
+        return samples
+
+    samples = asyncio.run(run())
+    print(f"\n{'sessions':>8} {'heap':>10}")
+    for done, size in samples:
+        print(f"{done:>8} {size / 2**20:>8.1f}MB")
+    (first, first_size), (last, last_size) = samples[0], samples[-1]
+    if last > first:
+        growth = (last_size - first_size) / (last - first) / 1024
+        print(f"growth: {growth:.1f}KB per session")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="fake model seconds per call"
+    )
+    parser.add_argument("--cache", action="store_true", help="keep the project cache")
+    args = parser.parse_args()
+
+    # every request saves the same few projects; skip the duplicate
+    # warnings and ADK's experimental-feature notices
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        tools.DATABASE_FILE = str(workdir / "projects.db")
+        research_cache.path = workdir / "research-cache.db"
+        cached_pipeline.policy.enabled = args.cache
+        llm = FakeGemini(latency=args.latency)
+        with fake_models(root_agent, llm):
+            plugin = _stages(args, workdir)
+            _agents(plugin)
+            if args.sessions:
+                _memory(args, workdir)
+        print(f"\n{llm.calls} fake model calls")
+
+
+if __name__ == "__main__":
+    main()
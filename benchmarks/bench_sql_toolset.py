@@ -0,0 +1,105 @@
+"""Benchmark: in-process SQL toolset vs. the `uvx mcp-server-sqlite` subprocess.
+
+Measures startup (toolset creation through the first `list_tables` result)
+and per-query latency of `read_query` point lookups for both transports.
+The MCP transport is skipped when `uvx` is not on PATH or the server
+fails to start.
+
+Usage:
+    uv run python benchmarks/bench_sql_toolset.py --queries 500
+"""
+
+import argparse
+import asyncio
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from toddle_ops.mcp.local_sqlite import LocalSqliteToolset
+
+
+def _seed(path: Path, rows: int):
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.executemany(
+            "INSERT INTO items (name) VALUES (?)", ((f"item {i}",) for i in range(rows))
+        )
+
+
+def _report(name: str, startup: float, latencies: list[float]):
+    print(
+        f"{name:<6} startup {startup * 1000:>8.1f} ms   query p50 "
+        f"{statistics.median(latencies) * 1000:>7.3f} ms   p99 "
+        f"{statistics.quantiles(latencies, n=100)[98] * 1000:>7.3f} ms"
+    )
+
+
+async def _bench_local(path: Path, queries: list[str]):
+    start = time.perf_counter()
+    toolset = LocalSqliteToolset(path)
+    tools = {tool.name: tool for tool in await toolset.get_tools()}
+    await tools["list_tables"].run_async(args={}, tool_context=None)
+    startup = time.perf_counter() - start
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        await tools["read_query"].run_async(args={"query": query}, tool_context=None)
+        latencies.append(time.perf_counter() - start)
+    await toolset.close()
+    _report("local", startup, latencies)
+
+
+async def _bench_mcp(path: Path, queries: list[str]):
+    params = StdioServerParameters(
+        command="uvx", args=["mcp-server-sqlite", "--db-path", str(path)]
+    )
+    start = time.perf_counter()
+    async with (
+        stdio_client(params) as (read, write),
+        ClientSession(read, write) as session,
+    ):
+        await session.initialize()
+        await session.call_tool("list_tables", {})
+        startup = time.perf_counter() - start
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            await session.call_tool("read_query", {"query": query})
+            latencies.append(time.perf_counter() - start)
+    _report("mcp", startup, latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    queries = [
+        f"SELECT * FROM items WHERE id = {i % args.rows + 1}"
+        for i in range(args.queries)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        _seed(path, args.rows)
+        asyncio.run(_bench_local(path, queries))
+        if not shutil.which("uvx"):
+            print("mcp    skipped: uvx not found on PATH")
+            return
+        try:
+            asyncio.run(_bench_mcp(path, queries))
+        except (OSError, ExceptionGroup) as exc:
+            # e.g. uvx can't download the server while offline
+            print(f"mcp    failed to start: {exc!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Benchmark: database size and read throughput per storage codec.
+
+Loads the same synthetic catalog once per codec ("json" is the historical
+encoding), vacuums, and reports the file size, the bytes held by the
+materials and instructions columns, and read throughput for full reads
+(`list_projects`), name-only scans (`iter_projects(lazy=True)`) and
+uncached `get_project` lookups.
+
+Usage:
+    uv run python benchmarks/bench_storage_codec.py --rows 20000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import toddle_ops.agents.project_database_team.codec as codec
+import toddle_ops.agents.project_database_team.dedupe as dedupe
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.connection import close_pools
+from toddle_ops.models.projects import Difficulty, Project
+
+MATERIALS = (
+    "paper plates, washable paint, paintbrushes, glue stick, googly eyes, "
+    "construction paper, scissors (adult use only), crayons, masking tape, "
+    "cotton balls, pipe cleaners, tissue paper, empty toilet paper rolls"
+).split(", ")
+STEPS = (
+    "Cover the table with newspaper or an old shower curtain so cleanup is quick.",
+    "Let your toddler choose the colors and squeeze out a little paint onto a plate.",
+    "Show them how to dab the brush up and down instead of scrubbing back and forth.",
+    "Cut the shapes ahead of time while they are busy exploring the materials.",
+    "Help them glue the pieces on, pressing down together for a count of five.",
+    "Name the colors and shapes out loud as you go and let them repeat after you.",
+    "Set the artwork somewhere safe and flat to dry for at least an hour.",
+    "Hang the finished piece at toddler eye level and talk about what they made.",
+    "Roll up sleeves or use a smock, because washable paint still stains some fabrics.",
+    "Keep small parts like googly eyes in a cup and hand them over one at a time.",
+    "If they lose interest, take a break and come back after snack time.",
+    "Tear the tissue paper into strips first; little hands find tearing easier than cutting.",
+    "Draw a simple outline with a marker so they have a shape to fill in.",
+    "Offer a damp cloth for sticky fingers so the glue does not end up everywhere.",
+    "Count the pieces together as they add them, up to ten and back down again.",
+    "Let them press their hand or thumb into the paint to make prints along the edge.",
+    "Sprinkle a little glitter on the wet glue, then tip the extra back into the jar.",
+    "Ask open questions like 'what color should go next?' rather than correcting them.",
+    "Wipe the brushes and put the lids back on the paint before the final step.",
+    "Take a photo of the finished project with your toddler holding it proudly.",
+)
+
+
+def _project(rng: random.Random, i: int) -> Project:
+    return Project(
+        name=f"Project {i}",
+        description="A synthetic benchmark project.",
+        difficulty=rng.choice(list(Difficulty)),
+        duration_minutes=rng.randint(5, 60),
+        materials=", ".join(rng.sample(MATERIALS, rng.randint(3, 7))),
+        instructions=" ".join(
+            f"{n}. {step}"
+            for n, step in enumerate(rng.sample(STEPS, rng.randint(8, 14)), 1)
+        ),
+    )
+
+
+def _rate(fn, rows: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return rows / (time.perf_counter() - start)
+
+
+def _bench(database: Path, storage_codec: str, rows: int, lookups: int) -> dict:
+    tools.DATABASE_FILE = database
+    codec.STORAGE_CODEC = storage_codec
+    tools.init_db()
+    tools.create_projects(_project(random.Random(7), i) for i in range(rows))
+    with tools._get_db_connection() as conn:
+        conn.commit()
+        conn.execute("VACUUM")
+        # under WAL the vacuumed pages sit in the -wal file until checkpointed
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        (column_bytes,) = conn.execute(
+            "SELECT SUM(length(materials) + length(instructions)) FROM projects"
+        ).fetchone()
+        ids = [row[0] for row in conn.execute("SELECT project_id FROM projects")]
+    tools.rebuild_search_index()
+
+    sample = random.Random(1).sample(ids, min(lookups, len(ids)))
+
+    def lookup():
+        for project_id in sample:
+            tools.project_cache.clear()
+            tools.get_project(project_id)
+
+    result = {
+        "file_mb": database.stat().st_size / 2**20,
+        "column_mb": column_bytes / 2**20,
+        "full_rows_s": _rate(tools.list_projects, rows),
+        "lazy_rows_s": _rate(
+            lambda: [p.name for p in tools.iter_projects(lazy=True, batch_size=500)],
+            rows,
+        ),
+        "get_s": _rate(lookup, len(sample)),
+    }
+    close_pools()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+
+    codecs = ["json", "zlib"] + (["zstd"] if codec.zstandard else [])
+    print(
+        f"{'codec':<6} {'file MB':>8} {'prose MB':>9} {'list rows/s':>12} "
+        f"{'lazy rows/s':>12} {'get/s':>8}"
+    )
+    # the templated catalog is all near-duplicates; only storage is measured
+    dedupe.DUPLICATE_POLICY = "allow"
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage_codec in codecs:
+            r = _bench(
+                Path(tmp) / f"{storage_codec}.db",
+                storage_codec,
+                args.rows,
+                args.lookups,
+            )
+            print(
+                f"{storage_codec:<6} {r['file_mb']:>8.2f} {r['column_mb']:>9.2f} "
+                f"{r['full_rows_s']:>12,.0f} {r['lazy_rows_s']:>12,.0f} "
+                f"{r['get_s']:>8,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
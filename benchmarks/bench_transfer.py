@@ -0,0 +1,118 @@
+"""Benchmark: NDJSON export/import throughput and peak memory.
+
+For each catalog size, seeds a fresh database, exports it (plain and
+gzip), and imports the gzip file into a second database. With --trace-memory the
+peak traced Python memory is reported too; it should stay flat as the row
+count grows (tracing slows every phase down several times).
+
+Usage:
+    uv run python benchmarks/bench_transfer.py --rows 10000 100000 1000000
+    uv run python benchmarks/bench_transfer.py --rows 10000 100000 --trace-memory
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import toddle_ops.agents.project_database_team.dedupe as dedupe
+import toddle_ops.agents.project_database_team.tools as tools
+import toddle_ops.agents.project_database_team.transfer as transfer
+from toddle_ops.agents.project_database_team.connection import close_pools
+from toddle_ops.models.projects import Difficulty, Project
+
+NOUNS = (
+    "paper plate cup straw leaf rock sponge bubble ribbon button sock box tube "
+    "feather pom-pom spoon bottle cork shell pinecone bean pasta rice tape"
+).split()
+VERBS = "paint glue stack sort roll stamp cut fold squish pour dip thread".split()
+
+
+def _project(rng: random.Random, i: int) -> Project:
+    nouns = rng.sample(NOUNS, 4)
+    return Project(
+        name=f"{nouns[0].title()} {rng.choice(VERBS).title()} {i}",
+        description="A synthetic benchmark project.",
+        difficulty=rng.choice(list(Difficulty)),
+        duration_minutes=rng.randint(5, 60),
+        materials=", ".join(nouns),
+        instructions=" ".join(
+            f"{rng.choice(VERBS).title()} the {rng.choice(nouns)} {rng.randint(1, 9)} times."
+            for _ in range(8)
+        ),
+    )
+
+
+def _measure(fn, trace_memory: bool) -> tuple[float, float]:
+    """Returns (seconds, peak traced MiB or NaN) for one call."""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = float("nan")
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--check-duplicates",
+        action="store_true",
+        help="Flag near-duplicates on import (the default policy) instead of allowing them.",
+    )
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    if not args.check_duplicates:
+        dedupe.DUPLICATE_POLICY = "allow"
+
+    print(f"{'rows':>9} {'phase':<14} {'rows/s':>10} {'peak MiB':>9} {'file MB':>8}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            tools.DATABASE_FILE = tmp / "source.db"
+            tools.init_db()
+            rng = random.Random(7)
+            tools.create_projects(
+                (_project(rng, i) for i in range(rows)), chunk_size=args.batch_size
+            )
+
+            for phase, path in (
+                ("export", tmp / "catalog.ndjson"),
+                ("export (gzip)", tmp / "catalog.ndjson.gz"),
+            ):
+                seconds, peak = _measure(
+                    lambda path=path: transfer.export_projects(
+                        path, batch_size=args.batch_size
+                    ),
+                    args.trace_memory,
+                )
+                size = path.stat().st_size / 1e6
+                print(
+                    f"{rows:>9,} {phase:<14} {rows / seconds:>10,.0f} {peak:>9.1f} {size:>8.1f}"
+                )
+
+            tools.DATABASE_FILE = tmp / "restored.db"
+            tools.init_db()
+            seconds, peak = _measure(
+                lambda tmp=tmp: transfer.import_projects(
+                    tmp / "catalog.ndjson.gz", batch_size=args.batch_size
+                ),
+                args.trace_memory,
+            )
+            print(
+                f"{rows:>9,} {'import (gzip)':<14} {rows / seconds:>10,.0f} {peak:>9.1f}"
+            )
+            close_pools()
+
+
+if __name__ == "__main__":
+    main()
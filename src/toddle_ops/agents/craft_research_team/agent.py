@@ -1,10 +1,18 @@
-from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.agents import LlmAgent, SequentialAgent
 from google.adk.models.google_llm import Gemini
 from google.adk.tools import google_search
 
-from toddle_ops.config.basic import retry_config
+from toddle_ops.config.basic import (
+    research_branch_timeout,
+    research_min_completed,
+    retry_config,
+)
 from toddle_ops.models.projects import Project
+from toddle_ops.services.hedged_parallel import HedgedParallelAgent
+from toddle_ops.services.research_cache import research_cache
 
+# researchers share a disk cache of their answers; google_search runs inside
+# the model call, so the cache hooks in as model callbacks
 art_craft_researcher = LlmAgent(
     name="ArtCraftResearcher",
     model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
@@ -19,6 +27,8 @@ art_craft_researcher = LlmAgent(
     and instructions.
     """,
     tools=[google_search],
+    before_model_callback=research_cache.before_model,
+    after_model_callback=research_cache.after_model,
     output_key="art_project",
 )
 
@@ -35,6 +45,8 @@ science_craft_researcher = LlmAgent(
     and instructions.
     """,
     tools=[google_search],
+    before_model_callback=research_cache.before_model,
+    after_model_callback=research_cache.after_model,
     output_key="science_project",
 )
 
@@ -51,6 +63,8 @@ silly_craft_researcher = LlmAgent(
     and instructions.
     """,
     tools=[google_search],
+    before_model_callback=research_cache.before_model,
+    after_model_callback=research_cache.after_model,
     output_key="silly_project",
 )
 
@@ -68,26 +82,26 @@ random_craft_researcher = LlmAgent(
     and instructions.
     """,
     tools=[google_search],
+    before_model_callback=research_cache.before_model,
+    after_model_callback=research_cache.after_model,
     output_key="random_project",
 )
 
-# probably less of a parallel team and more as agent tools...
-parallel_craft_team = ParallelAgent(
+# the synthesizer starts once the first `research_min_completed`
+# researchers finish; stragglers (slow searches, 429 backoff) are cancelled
+parallel_craft_team = HedgedParallelAgent(
     name="CraftResearchTeam",
     sub_agents=[
-        # silly_craft_researcher,
+        silly_craft_researcher,
         science_craft_researcher,
         art_craft_researcher,
-        # random_craft_researcher,
+        random_craft_researcher,
     ],
+    branch_timeout=research_branch_timeout,
+    min_completed=research_min_completed,
+    outcomes_key="research_outcomes",
 )
 
-# removing some parallel agents for billing purposes :D
-# also a bit redundant
-# removing:
-#    - {silly_project}
-#    - {random_project}
-
 project_synthesizer = LlmAgent(
     name="ProjectSynthesizer",
     model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
@@ -97,11 +111,14 @@ project_synthesizer = LlmAgent(
     Your task is to analyze the research outputs and create a single, 
     sensible project. You can either pick the best project from the 
     provided research, or combine elements from them to create a new project.
+    Researchers that ran out of time leave their entry empty; ignore those.
 
     Research Outputs:
 
-    - {art_project}
-    - {science_project}
+    - {art_project?}
+    - {science_project?}
+    - {silly_project?}
+    - {random_project?}
 
     Your output MUST be a single `Project` object.
     """,
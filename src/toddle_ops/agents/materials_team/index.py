@@ -0,0 +1,135 @@
+"""In-memory bitset index over the `project_materials` table.
+
+Every canonical material gets a bit, so a project's requirements are a
+single int and "what is missing" is `required & ~on_hand`. An inverted
+bitset per material (which projects use it) narrows the candidates before
+any per-project work happens.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.materials_team.normalize import normalize_materials
+
+
+def _iter_bits(bitset: int) -> Iterable[int]:
+    """Yields the positions of the set bits in `bitset`, lowest first."""
+    # scanning the binary string is linear, unlike repeatedly clearing the
+    # lowest bit of a large int
+    bits = bin(bitset)[:1:-1]
+    position = bits.find("1")
+    while position != -1:
+        yield position
+        position = bits.find("1", position + 1)
+
+
+@dataclass
+class _Snapshot:
+    """One consistent, immutable-by-convention load of the index."""
+
+    material_bits: dict[str, int] = field(default_factory=dict)
+    materials: list[str] = field(default_factory=list)
+    project_ids: list[str] = field(default_factory=list)
+    requirements: list[int] = field(default_factory=list)
+    used_by: dict[str, int] = field(default_factory=dict)
+    by_size: dict[int, int] = field(default_factory=dict)
+
+
+class MaterialsIndex:
+    """Answers "which projects can I make with these materials" from memory.
+
+    The index loads lazily from the project database and reloads whenever
+    the catalog has been written to since (`tools.catalog_generation`) or
+    the tools point at a different database file.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_for = None
+        self._snapshot = _Snapshot()
+
+    def _load(self) -> _Snapshot:
+        snapshot = _Snapshot()
+        requirements: dict[str, int] = {}
+        # the index can be the first thing to touch a fresh database
+        tools.init_db()
+        with tools._get_db_connection() as conn:
+            rows = conn.execute(
+                "SELECT project_id, material FROM project_materials"
+            ).fetchall()
+        for row in rows:
+            bit = snapshot.material_bits.setdefault(
+                row["material"], len(snapshot.material_bits)
+            )
+            project_id = row["project_id"]
+            requirements[project_id] = requirements.get(project_id, 0) | (1 << bit)
+
+        snapshot.materials = list(snapshot.material_bits)
+        snapshot.project_ids = list(requirements)
+        snapshot.requirements = list(requirements.values())
+        for position, required in enumerate(snapshot.requirements):
+            for bit in _iter_bits(required):
+                material = snapshot.materials[bit]
+                snapshot.used_by[material] = snapshot.used_by.get(material, 0) | (
+                    1 << position
+                )
+            size = required.bit_count()
+            snapshot.by_size[size] = snapshot.by_size.get(size, 0) | (1 << position)
+        return snapshot
+
+    def refresh(self, force: bool = False):
+        """Reloads the index if the catalog changed since the last load."""
+        key = (str(Path(tools.DATABASE_FILE).resolve()), tools.catalog_generation)
+        with self._lock:
+            if force or key != self._loaded_for:
+                self._snapshot = self._load()
+                self._loaded_for = key
+
+    def known_materials(self) -> frozenset[str]:
+        """Returns every canonical material used by a saved project."""
+        self.refresh()
+        return frozenset(self._snapshot.material_bits)
+
+    def find(
+        self, on_hand: str | list[str], max_missing: int = 0
+    ) -> list[tuple[str, list[str]]]:
+        """Finds projects needing at most `max_missing` materials not on hand.
+
+        Args:
+            on_hand: The materials available, as free text or a list.
+            max_missing: How many required materials may be missing.
+
+        Returns:
+            `(project_id, missing_materials)` pairs, fewest missing first.
+        """
+        self.refresh()
+        snapshot = self._snapshot
+        have = 0
+        candidates = 0
+        for material in normalize_materials(on_hand):
+            bit = snapshot.material_bits.get(material)
+            if bit is not None:
+                have |= 1 << bit
+                candidates |= snapshot.used_by[material]
+        # projects small enough to qualify without any material on hand
+        for size in range(max_missing + 1):
+            candidates |= snapshot.by_size.get(size, 0)
+
+        matches = []
+        for position in _iter_bits(candidates):
+            missing = snapshot.requirements[position] & ~have
+            if missing.bit_count() <= max_missing:
+                matches.append(
+                    (
+                        snapshot.project_ids[position],
+                        [snapshot.materials[bit] for bit in _iter_bits(missing)],
+                    )
+                )
+        matches.sort(key=lambda match: len(match[1]))
+        return matches
+
+
+materials_index = MaterialsIndex()
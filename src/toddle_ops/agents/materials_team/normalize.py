@@ -0,0 +1,130 @@
+"""Turns free-text material lists into canonical material tokens.
+
+`Project.materials` is an unstructured string such as
+"2 paper plates, yellow washable paint, glue stick (optional)". The
+functions here split it into items, strip quantities, units and
+descriptive words, singularize and map synonyms, so that "Glue sticks",
+"school glue" and "glue" all become the token "glue".
+"""
+
+import re
+
+_SPLIT = re.compile(r"[,;\n•]|\band\b|\bor\b|&")
+_PARENTHETICAL = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_QUANTITY = re.compile(r"^(?:[\d/.¼-¾⅐-⅞-]+\s*)+")
+_NON_WORD = re.compile(r"[^a-z' -]+")
+
+# words that only count a material; never materials themselves
+ARTICLES = {"a", "an", "few", "some"}
+
+# measures only name an amount ("2 cups flour"); containers are often the
+# material itself ("empty jars"), so they only go before "of"
+MEASURES = {
+    "cup", "drop", "gallon", "handful", "lb", "liter", "litre", "ml", "ounce",
+    "oz", "pinch", "pound", "spoon", "tablespoon", "tbsp", "teaspoon", "tsp",
+}  # fmt: skip
+CONTAINERS = {
+    "bag", "bottle", "box", "can", "jar", "pack", "package", "pair", "piece",
+    "roll", "sheet", "stick", "tube",
+}  # fmt: skip
+UNITS = MEASURES | CONTAINERS
+
+DESCRIPTORS = {
+    "any", "assorted", "big", "black", "blue", "child-safe", "clean", "colored",
+    "coloured", "colorful", "different", "dry", "empty", "extra", "fresh",
+    "green", "large", "little", "long", "medium", "mini", "multi-colored",
+    "new", "non-toxic", "nontoxic", "old", "optional", "orange", "pink",
+    "plain", "purple", "red", "safe", "short", "small", "thick", "thin",
+    "toddler-safe", "various", "warm", "washable", "white", "yellow",
+}  # fmt: skip
+
+SYNONYMS = {
+    "brush": "paint brush",
+    "cardstock": "paper",
+    "colouring": "coloring",
+    "construction paper": "paper",
+    "crayola": "crayon",
+    "dish detergent": "dish soap",
+    "dishwashing liquid": "dish soap",
+    "elmer's glue": "glue",
+    "felt tip": "marker",
+    "felt-tip pen": "marker",
+    "food colouring": "food coloring",
+    "glue stick": "glue",
+    "liquid watercolor": "watercolor",
+    "masking tape": "tape",
+    "painter's tape": "tape",
+    "paintbrush": "paint brush",
+    "pva glue": "glue",
+    "school glue": "glue",
+    "scotch tape": "tape",
+    "sellotape": "tape",
+    "sharpie": "marker",
+    "tempera paint": "paint",
+    "washing-up liquid": "dish soap",
+}
+
+_IRREGULAR = {"halves": "half", "knives": "knife", "leaves": "leaf", "loaves": "loaf"}
+
+# words whose trailing "s" is not a plural
+_KEEP_S = {"canvas", "glass", "grass", "moss", "scissors"}
+
+
+def singularize(word: str) -> str:
+    """Naive English singularization, good enough for craft supplies."""
+    if word in _IRREGULAR:
+        return _IRREGULAR[word]
+    if word in _KEEP_S or len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "sses", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("oes"):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def canonical_material(item: str) -> str | None:
+    """Returns the canonical token for a single material, or None if empty."""
+    text = _PARENTHETICAL.sub(" ", item.lower()).strip()
+    counted = bool(_QUANTITY.match(text))
+    text = _QUANTITY.sub("", text)
+    text = _NON_WORD.sub(" ", text)
+
+    words = [singularize(word.strip("'-")) for word in text.split()]
+    # drop descriptive words anywhere, then articles and the unit they leave
+    # leading ("a large sheet of paper", "2 small cups of flour"), but keep a
+    # unit word that is the material ("a clean jar", "2 small boxes")
+    words = [word for word in words if word and word not in DESCRIPTORS]
+    while words and words[0] in ARTICLES:
+        words.pop(0)
+    if len(words) > 2 and words[0] in UNITS and words[1] == "of":
+        words = words[2:]
+    elif counted and len(words) > 1 and words[0] in MEASURES:
+        words = words[1:]
+    if not words:
+        return None
+
+    phrase = " ".join(words)
+    return SYNONYMS.get(phrase, phrase)
+
+
+def normalize_materials(materials: str | list[str]) -> set[str]:
+    """Splits a materials list into a set of canonical material tokens.
+
+    Args:
+        materials: A free-text materials string, or a list of items.
+
+    Returns:
+        The distinct canonical tokens.
+    """
+    items = materials if isinstance(materials, list) else _SPLIT.split(materials)
+    tokens = set()
+    for item in items:
+        token = canonical_material(item)
+        if token:
+            tokens.add(token)
+    return tokens
@@ -0,0 +1,44 @@
+from typing import List
+
+import toddle_ops.agents.project_database_team.tools as project_tools
+from toddle_ops.agents.materials_team.index import materials_index
+from toddle_ops.agents.materials_team.normalize import normalize_materials
+
+
+def find_projects_by_materials(
+    materials_on_hand: List[str], max_missing: int = 0, limit: int = 10
+) -> dict:
+    """
+    Finds saved projects that can be made with the materials the user has.
+
+    Args:
+        materials_on_hand: The materials the user has, e.g. ["paper", "glue"].
+        max_missing: How many required materials may be missing (0 means the
+            user has everything needed).
+        limit: Maximum number of projects to return (1-50).
+
+    Returns:
+        A dict with the recognized `materials_on_hand` and a `projects` list.
+        Each project has project_id, name, difficulty, duration_minutes and
+        the `missing` materials the user would still need.
+    """
+    matches = materials_index.find(materials_on_hand, max(0, max_missing))
+    matches = matches[: max(1, min(limit, 50))]
+    missing_by_id = dict(matches)
+
+    projects = []
+    if matches:
+        placeholders = ", ".join("?" * len(matches))
+        sql = f"""
+            SELECT project_id, name, difficulty, duration_minutes
+            FROM projects WHERE project_id IN ({placeholders})
+        """
+        with project_tools._get_db_connection() as conn:
+            rows = conn.execute(sql, list(missing_by_id)).fetchall()
+        projects = [dict(row, missing=missing_by_id[row["project_id"]]) for row in rows]
+        projects.sort(key=lambda project: len(project["missing"]))
+
+    return {
+        "materials_on_hand": sorted(normalize_materials(materials_on_hand)),
+        "projects": projects,
+    }
@@ -3,52 +3,63 @@ from google.adk.models.google_llm import Gemini
 from google.adk.tools import FunctionTool
 
 from toddle_ops.config.basic import retry_config
+import toddle_ops.agents.project_database_team.async_tools as async_tools
 import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.persistence import (
+    ProjectPersistenceAgent,
+)
 from toddle_ops.mcp.sqlite import mcp_sqlite_server
 
-root_agent = LlmAgent(
+# Saves the project already structured in state without a model round trip.
+persistence_agent = ProjectPersistenceAgent(
+    name="ProjectPersistenceAgent",
+    description="Saves the finished project to the project database.",
+)
+
+# LLM-driven database work that needs free-form SQL; saving a finished
+# project goes through `persistence_agent` instead.
+sql_agent = LlmAgent(
     name="ProjectDatabaseAgent",
     model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
     instruction="""You are a database administrator for toddler projects.
         You receive a toddler project: {final_project}
 
-        Your goal is to save this project to the database.
+        Your goal is to save this project to the project database.
 
-        1. Formulate a plan to save the project.
-        2. Check to see if the database is initialized - if not - initialize
-        the database. The database MUST be called 'toddle-ops-data.db'
-        3. Projects will be saved to a table called 'toddle_ops_projects' - initialize
-        this table if it does not exist using this example:
-            - id: SQL integer identity
-            - project_name: varchar derived from Project.name
-            - description: string derived from Project.description
-            - difficulty: string derived from Project.difficulty
-            - materials: string derived from Project.materials
-            - duration_minutes: int derived from Project.duration_minutes
-            - instructions: string derived from Project.materials
-            - date_created: date derived from the date you perform this action
-            - date_modified: date derived from the date you modify this row
+        1. Call `init_db` to make sure the database and its tables exist.
+        2. Call `find_projects` or `search_projects` to check whether the
+           project is already saved. If it is, output the saved project and stop.
         3. You MUST call `ask_user_permission` with a summary of your intended actions.
-            Example summary: 
+            Example summary:
             1. Initialize database (if missing).
-            2. Creating the toddle_ops_projects table (if missing).
-            3. Save project 'Glue Art' to projects table.
-        3. IF the user says 'yes':
-            - Perform the actions (e.g. using the mcp server).
+            2. Save project 'Glue Art' to the projects table.
+        4. IF the user says 'yes':
+            - Call `create_project` with the project.
             - Output the saved project.
-        4. IF the user says 'no':
+        5. IF the user says 'no':
             - Do nothing.
             - Output "Action Cancelled by user."
+
+        Use `get_project`, `update_project`, `delete_project`, `list_projects`
+        and `list_projects_page` for other requests about saved projects. Only
+        use the SQL tools for read-only questions those tools cannot answer;
+        projects live in the `projects` table.
         """,
     tools=[
-        # FunctionTool(tools.create_project),
-        # FunctionTool(tools.get_project),
-        # FunctionTool(tools.update_project),
-        # FunctionTool(tools.delete_project),
-        # FunctionTool(tools.list_projects),
-        # FunctionTool(tools.init_db),
+        # async tools keep database I/O off the shared event loop
+        FunctionTool(async_tools.create_project),
+        FunctionTool(async_tools.get_project),
+        FunctionTool(async_tools.update_project),
+        FunctionTool(async_tools.delete_project),
+        FunctionTool(async_tools.list_projects),
+        FunctionTool(async_tools.init_db),
+        FunctionTool(async_tools.list_projects_page),
+        FunctionTool(async_tools.search_projects),
+        FunctionTool(async_tools.find_projects),
         FunctionTool(tools.ask_user_permission),
         mcp_sqlite_server,
     ],
     output_key="database_queue",
 )
+
+root_agent = persistence_agent
@@ -0,0 +1,265 @@
+"""Non-blocking versions of the project database tools.
+
+These mirror the functions in `tools.py` (same names, arguments and return
+values), so an agent awaiting them never blocks the event loop that also
+drives the other agents and sessions. Reads run on one long-lived
+`aiosqlite` connection per database; writes, which also maintain the
+materials, search and near-duplicate indexes, run the sync tools in a
+worker thread so that logic lives in one place.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Optional
+
+import aiosqlite
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.connection import (
+    DEFAULT_PRAGMAS,
+    SQL_FUNCTIONS,
+)
+from toddle_ops.models.projects import Project
+
+_connections: dict[str, aiosqlite.Connection] = {}
+
+
+async def _open(database: Path) -> aiosqlite.Connection:
+    conn = aiosqlite.connect(database)
+    # never keep the interpreter alive just for this worker thread
+    conn.daemon = True
+    await conn
+    conn.row_factory = aiosqlite.Row
+    for pragma, value in DEFAULT_PRAGMAS.items():
+        await conn.execute(f"PRAGMA {pragma} = {value}")
+    for name, (num_params, func) in SQL_FUNCTIONS.items():
+        await conn.create_function(name, num_params, func, deterministic=True)
+    return conn
+
+
+async def _get_db_connection() -> aiosqlite.Connection:
+    """Returns the shared connection to `tools.DATABASE_FILE`, opening it once."""
+    key = str(Path(tools.DATABASE_FILE).resolve())
+    conn = _connections.get(key)
+    if conn is None:
+        conn = await _open(tools.DATABASE_FILE)
+        # another task may have opened one while we awaited
+        if key in _connections:
+            await conn.close()
+        else:
+            _connections[key] = conn
+        conn = _connections[key]
+    return conn
+
+
+async def close_connections():
+    """Closes every shared connection (e.g. at shutdown or in tests)."""
+    connections = list(_connections.values())
+    _connections.clear()
+    for conn in connections:
+        await conn.close()
+
+
+async def init_db():
+    """Initializes the database and creates the projects table if it doesn't exist."""
+    # schema setup is rare and DDL-heavy; reuse the sync path off the loop
+    await asyncio.to_thread(tools.init_db)
+
+
+async def create_project(
+    project: Project, on_duplicate: Optional[str] = None
+) -> Project:
+    """
+    Creates a new project in the database.
+
+    Args:
+        project: The project object to create.
+        on_duplicate: What to do if a near-duplicate is already saved:
+            "allow", "flag" or "merge".
+
+    Returns:
+        The created project object, or the existing project it was merged into.
+    """
+    return await asyncio.to_thread(tools.create_project, project, on_duplicate)
+
+
+async def get_project(project_id: str) -> Optional[Project]:
+    """
+    Retrieves a project from the database by its ID.
+
+    Args:
+        project_id: The ID of the project to retrieve.
+
+    Returns:
+        The project object if found, otherwise None.
+    """
+    cached = tools._cached_project(project_id)
+    if cached is not None:
+        return cached
+
+    generation = tools.catalog_generation
+    conn = await _get_db_connection()
+    async with conn.execute(tools._GET_SQL, (project_id,)) as cursor:
+        row = await cursor.fetchone()
+
+    if row:
+        project = tools._row_to_project(row)
+        tools._cache_project(project, generation)
+        return project
+    return None
+
+
+async def update_project(project_id: str, updates: dict) -> Optional[Project]:
+    """
+    Updates a project in the database.
+
+    Args:
+        project_id: The ID of the project to update.
+        updates: A dictionary of fields to update.
+
+    Returns:
+        The updated project object if the project was found and updated, otherwise None.
+    """
+    return await asyncio.to_thread(tools.update_project, project_id, updates)
+
+
+async def delete_project(project_id: str) -> bool:
+    """
+    Deletes a project from the database.
+
+    Args:
+        project_id: The ID of the project to delete.
+
+    Returns:
+        True if the project was deleted, otherwise False.
+    """
+    return await asyncio.to_thread(tools.delete_project, project_id)
+
+
+async def iter_projects(
+    columns: Optional[Iterable[str]] = None,
+    batch_size: int = 100,
+    after: Optional[str] = None,
+    lazy: bool = False,
+) -> AsyncIterator[Project | dict]:
+    """
+    Streams projects ordered by `project_id` using keyset pagination.
+
+    See `tools.iter_projects`.
+    """
+    sql, build = tools._keyset_query(columns, lazy)
+    conn = await _get_db_connection()
+    last_id = after or ""
+    while True:
+        async with conn.execute(sql, (last_id, batch_size)) as cursor:
+            rows = await cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        for row in rows:
+            yield build(row)
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1]["project_id"]
+
+
+async def list_projects() -> List[Project]:
+    """
+    Lists all projects in the database.
+
+    Prefer `iter_projects` or `list_projects_page` for large catalogs.
+
+    Returns:
+        A list of all project objects.
+    """
+    return [project async for project in iter_projects()]
+
+
+async def list_projects_page(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+) -> dict:
+    """
+    Lists one page of saved projects.
+
+    Call again with the returned `next_cursor` to get the following page.
+    When `next_cursor` is null there are no more projects.
+
+    Args:
+        limit: Maximum number of projects to return (1-100).
+        cursor: The `next_cursor` value from a previous call, if any.
+        columns: Project fields to include. Defaults to name, difficulty and
+            duration_minutes. Valid fields are project_id, name, description,
+            difficulty, duration_minutes, materials and instructions.
+
+    Returns:
+        A dict with a `projects` list and a `next_cursor` token.
+    """
+    limit = max(1, min(limit, 100))
+    after = tools._decode_cursor(cursor) if cursor else None
+    rows = []
+    # read one extra row to learn whether another page exists
+    async for row in iter_projects(
+        columns or tools.SUMMARY_COLUMNS, batch_size=limit + 1, after=after
+    ):
+        rows.append(row)
+        if len(rows) > limit:
+            break
+    page = rows[:limit]
+    next_cursor = (
+        tools._encode_cursor(page[-1]["project_id"]) if len(rows) > limit else None
+    )
+    return {"projects": page, "next_cursor": next_cursor}
+
+
+async def find_projects(
+    difficulty: Optional[str] = None,
+    max_minutes: Optional[int] = None,
+    limit: int = 10,
+    order_by: str = "duration",
+) -> List[dict]:
+    """
+    Finds saved projects by difficulty and maximum duration.
+
+    Args:
+        difficulty: Only return projects of this difficulty: "easy",
+            "medium" or "hard".
+        max_minutes: Only return projects that take at most this many minutes.
+        limit: Maximum number of projects to return (1-100).
+        order_by: "duration" (shortest first), "newest" or "name".
+
+    Returns:
+        A list of projects with project_id, name, difficulty,
+        duration_minutes and date_created.
+    """
+    sql, params = tools._find_projects_query(difficulty, max_minutes, order_by)
+    conn = await _get_db_connection()
+    async with conn.execute(sql, (*params, max(1, min(limit, 100)))) as cursor:
+        rows = await cursor.fetchall()
+    return [dict(row) for row in rows]
+
+
+async def search_projects(query: str, limit: int = 10) -> List[dict]:
+    """
+    Searches saved projects by name, description, materials and instructions.
+
+    Results are ranked by relevance (BM25, with matches in the name weighted
+    highest) and include a short snippet around the matching text.
+
+    Args:
+        query: Free-text search, e.g. "salt dough handprints".
+        limit: Maximum number of results to return (1-50).
+
+    Returns:
+        A list of matching projects with project_id, name, difficulty,
+        duration_minutes, snippet and score (lower is more relevant).
+    """
+    match = tools._to_match_expression(query)
+    if not match:
+        return []
+
+    conn = await _get_db_connection()
+    params = (match, max(1, min(limit, 50)))
+    async with conn.execute(tools._SEARCH_SQL, params) as cursor:
+        rows = await cursor.fetchall()
+    return [dict(row) for row in rows]
@@ -0,0 +1,158 @@
+"""Storage encodings for the prose columns (`materials` and `instructions`).
+
+By default both columns hold JSON text (`json.dumps` of the string), as they
+always have. The compressed codecs store a BLOB instead: one format byte
+followed by the UTF-8 text, either as-is or compressed. Readers accept every
+encoding, so a database can hold a mix while `tools.recompress_projects`
+converts it, and SQL reaches the plain text through the `project_text`
+function (see `connection.SQL_FUNCTIONS`).
+"""
+
+import json
+import zlib
+from functools import cached_property
+from typing import Mapping, Optional
+
+from toddle_ops.models.projects import Difficulty, Project
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install "toddle-ops[zstd]"
+    zstandard = None
+
+# Encoding used for new writes: "json", "zlib" or "zstd".
+STORAGE_CODEC = "json"
+CODECS = ("json", "zlib", "zstd")
+
+# First byte of a stored BLOB. Never renumber these; add new formats instead.
+FORMAT_RAW = 0  # UTF-8 text that did not shrink when compressed
+FORMAT_ZLIB = 1  # raw deflate stream (no zlib header or checksum)
+FORMAT_ZSTD = 2
+
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 9
+
+
+def _deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(ZLIB_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise RuntimeError(
+            'The zstd storage codec needs the "zstandard" package '
+            '(pip install "toddle-ops[zstd]").'
+        )
+    return zstandard
+
+
+def encode(text: str, codec: Optional[str] = None) -> str | bytes:
+    """Encodes a prose field for storage.
+
+    Args:
+        text: The field value.
+        codec: "json", "zlib" or "zstd". Defaults to `STORAGE_CODEC`.
+
+    Returns:
+        JSON text for the "json" codec, otherwise a format-tagged BLOB.
+    """
+    codec = codec or STORAGE_CODEC
+    if codec == "json":
+        return json.dumps(text)
+    data = text.encode()
+    if codec == "zlib":
+        packed, fmt = _deflate(data), FORMAT_ZLIB
+    elif codec == "zstd":
+        compressor = _require_zstandard().ZstdCompressor(level=ZSTD_LEVEL)
+        packed, fmt = compressor.compress(data), FORMAT_ZSTD
+    else:
+        raise ValueError(f"Unknown storage codec {codec!r}; expected one of {CODECS}.")
+    # short fields often grow when compressed
+    if len(packed) >= len(data):
+        packed, fmt = data, FORMAT_RAW
+    return bytes((fmt,)) + packed
+
+
+def decode(value: str | bytes | None) -> str | None:
+    """Decodes a stored prose field, whatever codec wrote it."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return json.loads(value)
+    fmt, payload = value[0], memoryview(value)[1:]
+    if fmt == FORMAT_RAW:
+        data = bytes(payload)
+    elif fmt == FORMAT_ZLIB:
+        data = zlib.decompress(payload, -zlib.MAX_WBITS)
+    elif fmt == FORMAT_ZSTD:
+        data = _require_zstandard().ZstdDecompressor().decompress(payload)
+    else:
+        raise ValueError(f"Unknown storage format byte {fmt}.")
+    return data.decode()
+
+
+def codec_of(value: str | bytes | None) -> str | None:
+    """Returns the codec a stored value was written with (None for NULL).
+
+    Incompressible values written by "zlib" or "zstd" report "raw".
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return "json"
+    return {FORMAT_RAW: "raw", FORMAT_ZLIB: "zlib", FORMAT_ZSTD: "zstd"}.get(
+        value[0], "unknown"
+    )
+
+
+def _column(name: str) -> property:
+    return property(lambda self: self._row[name])
+
+
+class LazyProject:
+    """A stored project whose prose fields are decoded on first access.
+
+    Has the same attributes as `Project`, so code that only reads names or
+    durations never pays for decompressing materials and instructions. Call
+    `to_project` for a validated `Project`.
+    """
+
+    project_id = _column("project_id")
+    name = _column("name")
+    description = _column("description")
+    duration_minutes = _column("duration_minutes")
+
+    def __init__(self, row: Mapping):
+        """
+        Args:
+            row: A `projects` row with every `Project` field.
+        """
+        self._row = row
+
+    @property
+    def difficulty(self) -> Difficulty:
+        return Difficulty(self._row["difficulty"])
+
+    @cached_property
+    def materials(self) -> str:
+        return decode(self._row["materials"])
+
+    @cached_property
+    def instructions(self) -> str:
+        return decode(self._row["instructions"])
+
+    def to_project(self) -> Project:
+        """Decodes every field into a `Project`."""
+        return Project(
+            project_id=self.project_id,
+            name=self.name,
+            description=self.description,
+            difficulty=self.difficulty,
+            duration_minutes=self.duration_minutes,
+            materials=self.materials,
+            instructions=self.instructions,
+        )
+
+    def __repr__(self) -> str:
+        return f"LazyProject(project_id={self.project_id!r}, name={self.name!r})"
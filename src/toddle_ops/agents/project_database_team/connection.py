@@ -0,0 +1,155 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import toddle_ops.agents.project_database_team.codec as codec
+
+# Tuned for a small, read-heavy catalog shared by a handful of agent threads.
+# WAL lets readers and the single writer run concurrently and NORMAL
+# synchronous is durable across application crashes under WAL.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,  # 256 MiB
+    "cache_size": -16_000,  # negative values are KiB -> ~16 MiB
+    "temp_store": "MEMORY",
+    "busy_timeout": 5_000,  # ms
+    "foreign_keys": "ON",
+}
+
+# Application-defined SQL functions the schema relies on, registered on every
+# connection: name -> (number of arguments, implementation).
+SQL_FUNCTIONS = {
+    "project_text": (1, codec.decode),
+}
+
+
+class ConnectionPool:
+    """A thread-safe pool of long-lived SQLite connections.
+
+    Connections are opened lazily up to `size`, configured once with
+    `pragmas` and reused, so callers skip the file open and schema read
+    that `sqlite3.connect` costs on every call. Each connection keeps its
+    own prepared-statement cache (`cached_statements`).
+    """
+
+    def __init__(
+        self,
+        database: str | Path,
+        size: int = 8,
+        timeout: float = 30.0,
+        pragmas: dict | None = None,
+        cached_statements: int = 256,
+    ):
+        self.database = str(database)
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        self.cached_statements = cached_statements
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.database,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        for name, (num_params, func) in SQL_FUNCTIONS.items():
+            conn.create_function(name, num_params, func, deterministic=True)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed.")
+            if self._opened < self.size:
+                self._opened += 1
+                open_new = True
+            else:
+                open_new = False
+
+        if open_new:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No database connection available after {self.timeout}s."
+            ) from None
+
+    def _release(self, conn: sqlite3.Connection):
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrows a connection for the duration of a `with` block.
+
+        The transaction is committed when the block exits normally and
+        rolled back if it raises.
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    def close(self):
+        """Closes every idle connection and refuses new checkouts."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database: str | Path) -> ConnectionPool:
+    """Returns the shared pool for `database`, creating it on first use."""
+    key = str(Path(database).resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(database)
+        return pool
+
+
+def close_pools():
+    """Closes and forgets every shared pool (e.g. at shutdown or in tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,188 @@
+"""Near-duplicate detection for projects with MinHash and LSH banding.
+
+Each project is reduced to a set of shingles (word pairs from its name,
+materials and instructions, plus its canonical material tokens) and a
+fixed-size MinHash signature whose matching positions estimate the Jaccard
+similarity of two shingle sets. The signature is split into bands; projects
+sharing any band land in the same `project_lsh` bucket, so a lookup is a
+handful of indexed point queries no matter how large the catalog grows.
+"""
+
+import hashlib
+import re
+import sqlite3
+from array import array
+from itertools import pairwise
+from typing import Iterable, Optional
+
+from toddle_ops.agents.materials_team.normalize import normalize_materials
+from toddle_ops.models.projects import Project
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+
+# Estimated Jaccard similarity at or above which a new project counts as a
+# near-duplicate. With 16 bands of 4 rows, pairs around 0.5 similarity start
+# sharing a bucket, so candidates above this threshold are rarely missed.
+DUPLICATE_THRESHOLD = 0.7
+
+# What create_project does with a near-duplicate: "allow" stores it without
+# checking, "flag" stores it with `duplicate_of` pointing at the original and
+# "merge" stores nothing and returns the original instead.
+DUPLICATE_POLICY = "flag"
+DUPLICATE_POLICIES = ("allow", "flag", "merge")
+
+# Each 64-byte blake2b digest yields 8 independent 64-bit hash values, so
+# NUM_PERMUTATIONS / 8 differently personalized digests per shingle stand in
+# for NUM_PERMUTATIONS hash functions. Changing these changes every stored
+# signature.
+_DIGEST_SIZE = 64
+_PERSONS = [
+    f"toddleops{i}".encode() for i in range(NUM_PERMUTATIONS * 8 // _DIGEST_SIZE)
+]
+_EMPTY_SIGNATURE = (2**64 - 1,) * NUM_PERMUTATIONS
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {"a", "an", "and", "the", "of", "to", "in", "on", "with", "for", "it"}
+
+LSH_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS project_lsh (
+        band INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        project_id TEXT NOT NULL,
+        PRIMARY KEY (band, bucket, project_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_project_lsh_project
+    ON project_lsh (project_id)
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_lsh_delete AFTER DELETE ON projects BEGIN
+        DELETE FROM project_lsh WHERE project_id = old.project_id;
+    END
+    """,
+)
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def shingles(project: Project) -> set[str]:
+    """Returns the shingle set a project's signature is built from."""
+    words = [
+        word
+        for word in _WORD.findall(
+            f"{project.name} {project.materials} {project.instructions}".lower()
+        )
+        if word not in _STOPWORDS
+    ]
+    result = {f"{a} {b}" for a, b in pairwise(words)}
+    result.update(
+        f"material:{token}" for token in normalize_materials(project.materials)
+    )
+    return result
+
+
+def _shingle_hashes(shingle: str) -> array:
+    data = shingle.encode()
+    return array(
+        "Q",
+        b"".join(
+            hashlib.blake2b(data, digest_size=_DIGEST_SIZE, person=person).digest()
+            for person in _PERSONS
+        ),
+    )
+
+
+def signature(project: Project) -> tuple[int, ...]:
+    """Computes the MinHash signature of a project."""
+    hashes = [_shingle_hashes(shingle) for shingle in shingles(project)]
+    if not hashes:
+        return _EMPTY_SIGNATURE
+    # column-wise minimum: one value per hash function
+    return tuple(map(min, zip(*hashes)))
+
+
+def to_blob(sig: tuple[int, ...]) -> bytes:
+    return array("Q", sig).tobytes()
+
+
+def from_blob(blob: bytes) -> tuple[int, ...]:
+    return tuple(array("Q", blob))
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimates the Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERMUTATIONS
+
+
+def _buckets(sig: tuple[int, ...]) -> list[tuple[int, int]]:
+    """Returns the `(band, bucket)` pairs a signature is filed under."""
+    buckets = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        bucket = _hash64(array("Q", rows).tobytes())
+        # SQLite integers are signed 64-bit
+        buckets.append((band, bucket - (1 << 64) if bucket >= 1 << 63 else bucket))
+    return buckets
+
+
+def find_duplicate(
+    conn: sqlite3.Connection,
+    sig: tuple[int, ...],
+    threshold: float = DUPLICATE_THRESHOLD,
+    exclude_id: Optional[str] = None,
+) -> Optional[tuple[str, float]]:
+    """Finds the most similar indexed project at or above `threshold`.
+
+    Args:
+        conn: An open connection to the project database.
+        sig: The signature of the project being checked.
+        threshold: Minimum estimated Jaccard similarity.
+        exclude_id: A project ID to ignore (the project itself on updates).
+
+    Returns:
+        `(project_id, similarity)` of the best match, or None.
+    """
+    candidates = set()
+    for band, bucket in _buckets(sig):
+        candidates.update(
+            row[0]
+            for row in conn.execute(
+                "SELECT project_id FROM project_lsh WHERE band = ? AND bucket = ?",
+                (band, bucket),
+            )
+        )
+    candidates.discard(exclude_id)
+    if not candidates:
+        return None
+
+    placeholders = ", ".join("?" * len(candidates))
+    best = None
+    for project_id, blob in conn.execute(
+        f"SELECT project_id, minhash FROM projects WHERE project_id IN ({placeholders})",
+        list(candidates),
+    ):
+        if blob is None:
+            continue
+        score = similarity(sig, from_blob(blob))
+        if score >= threshold and (best is None or score > best[1]):
+            best = (project_id, score)
+    return best
+
+
+def index_signatures(
+    conn: sqlite3.Connection, signatures: Iterable[tuple[str, tuple[int, ...]]]
+):
+    """Replaces the LSH buckets of each `(project_id, signature)` pair."""
+    rows = []
+    for project_id, sig in signatures:
+        conn.execute("DELETE FROM project_lsh WHERE project_id = ?", (project_id,))
+        rows.extend((band, bucket, project_id) for band, bucket in _buckets(sig))
+    conn.executemany(
+        "INSERT OR IGNORE INTO project_lsh (band, bucket, project_id) VALUES (?, ?, ?)",
+        rows,
+    )
@@ -0,0 +1,96 @@
+"""A non-LLM agent that saves the finished project to the project database.
+
+The project is already structured in session state, so saving it needs no
+model call: the agent validates it, asks the user for permission and calls
+`create_project` directly. A project whose ID is already in the database
+is reported as saved rather than stored twice.
+"""
+
+import asyncio
+import logging
+import sqlite3
+from typing import AsyncGenerator, Callable
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+import toddle_ops.agents.project_database_team.async_tools as async_tools
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.models.projects import Project, parse_project
+
+logger = logging.getLogger(__name__)
+
+
+def _summary(project: Project) -> str:
+    return (
+        f"1. Initialize database (if missing).\n"
+        f"2. Save project '{project.name}' ({project.difficulty.value}, "
+        f"{project.duration_minutes} minutes) to the projects table."
+    )
+
+
+class ProjectPersistenceAgent(BaseAgent):
+    """Saves the project found in session state, after user confirmation.
+
+    Reads the first non-empty key of `state_keys`, validates it with
+    `parse_project`, passes a summary to `confirm` and, on "yes", stores
+    the project with `create_project`. The saved project (or the reason
+    nothing was saved) is written to `output_key`.
+    """
+
+    state_keys: tuple[str, ...] = ("final_project", "standard_project")
+    output_key: str = "database_queue"
+    confirm: Callable[[str], str] = tools.ask_user_permission
+
+    def _event(self, ctx: InvocationContext, text: str, output) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta={self.output_key: output}),
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        key = next((key for key in self.state_keys if state.get(key)), None)
+        if key is None:
+            yield self._event(ctx, "No project to save.", None)
+            return
+
+        try:
+            project = parse_project(state[key])
+        except ValueError as exc:
+            logger.warning("Not saving %s from state: %s", key, exc)
+            yield self._event(ctx, f"Could not save the project: {exc}", None)
+            return
+
+        # the default hook reads stdin; keep it off the event loop
+        answer = await asyncio.to_thread(self.confirm, _summary(project))
+        if answer != "yes":
+            yield self._event(ctx, "Action Cancelled by user.", None)
+            return
+
+        await async_tools.init_db()
+        try:
+            saved = await async_tools.create_project(project)
+        except sqlite3.IntegrityError:
+            # e.g. the same session saving twice
+            saved = await async_tools.get_project(project.project_id)
+            if saved is None:
+                raise
+            yield self._event(
+                ctx,
+                f"Project '{saved.name}' ({saved.project_id}) is already saved.",
+                saved.model_dump(mode="json"),
+            )
+            return
+        yield self._event(
+            ctx,
+            f"Saved project '{saved.name}' ({saved.project_id}).",
+            saved.model_dump(mode="json"),
+        )
@@ -0,0 +1,400 @@
+"""Versioned schema for the project database.
+
+`migrate` brings any database up to `SCHEMA_VERSION`, applying the
+functions in `MIGRATIONS` in order and recording progress in SQLite's
+`PRAGMA user_version`. Append new migrations; never edit applied ones.
+"""
+
+import json
+import sqlite3
+from typing import Iterable
+
+import toddle_ops.agents.project_database_team.dedupe as dedupe
+from toddle_ops.agents.materials_team.normalize import normalize_materials
+from toddle_ops.models.projects import Project
+
+PROJECTS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS projects (
+        project_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        difficulty TEXT,
+        duration_minutes INTEGER,
+        materials TEXT,
+        instructions TEXT
+    )
+"""
+
+# Full-text index over the prose columns. It is an external-content FTS5
+# table reading from a view that unwraps the JSON-encoded columns, so the
+# text is stored once and snippets come back without JSON quoting. The
+# triggers keep it in step with every write to `projects`.
+SEARCH_SCHEMA = (
+    """
+    CREATE VIEW IF NOT EXISTS projects_search_content AS
+    SELECT
+        rowid,
+        name,
+        description,
+        json_extract(materials, '$') AS materials,
+        json_extract(instructions, '$') AS instructions
+    FROM projects
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        name,
+        description,
+        materials,
+        instructions,
+        content='projects_search_content',
+        content_rowid='rowid',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts (rowid, name, description, materials, instructions)
+        VALUES (
+            new.rowid,
+            new.name,
+            new.description,
+            json_extract(new.materials, '$'),
+            json_extract(new.instructions, '$')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts (projects_fts, rowid, name, description, materials, instructions)
+        VALUES (
+            'delete',
+            old.rowid,
+            old.name,
+            old.description,
+            json_extract(old.materials, '$'),
+            json_extract(old.instructions, '$')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_update AFTER UPDATE ON projects BEGIN
+        INSERT INTO projects_fts (projects_fts, rowid, name, description, materials, instructions)
+        VALUES (
+            'delete',
+            old.rowid,
+            old.name,
+            old.description,
+            json_extract(old.materials, '$'),
+            json_extract(old.instructions, '$')
+        );
+        INSERT INTO projects_fts (rowid, name, description, materials, instructions)
+        VALUES (
+            new.rowid,
+            new.name,
+            new.description,
+            json_extract(new.materials, '$'),
+            json_extract(new.instructions, '$')
+        );
+    END
+    """,
+)
+
+
+# Canonical material tokens per project (see materials_team.normalize),
+# the child table behind "what can I make with what I have on hand".
+MATERIALS_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS project_materials (
+        project_id TEXT NOT NULL REFERENCES projects (project_id) ON DELETE CASCADE,
+        material TEXT NOT NULL,
+        PRIMARY KEY (project_id, material)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_project_materials_material
+    ON project_materials (material, project_id)
+    """,
+)
+
+MATERIALS_DELETE_SQL = "DELETE FROM project_materials WHERE project_id = ?"
+
+MATERIALS_INSERT_SQL = (
+    "INSERT OR IGNORE INTO project_materials (project_id, material) VALUES (?, ?)"
+)
+
+
+def material_rows(project_id: str, materials: str) -> list[tuple[str, str]]:
+    """Builds `project_materials` rows for one project."""
+    return [(project_id, token) for token in sorted(normalize_materials(materials))]
+
+
+def index_materials(conn, projects: Iterable[tuple[str, str]]):
+    """Replaces the material tokens of each `(project_id, materials)` pair."""
+    rows = []
+    for project_id, materials in projects:
+        conn.execute(MATERIALS_DELETE_SQL, (project_id,))
+        rows.extend(material_rows(project_id, materials))
+    conn.executemany(MATERIALS_INSERT_SQL, rows)
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return (
+        conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+        is not None
+    )
+
+
+def _v1_catalog(conn: sqlite3.Connection):
+    """Projects table, full-text search and the materials index.
+
+    Databases created before versioning may already have some of these, so
+    every statement is idempotent and missing indexes are backfilled.
+    """
+    conn.execute(PROJECTS_SCHEMA)
+
+    has_search_index = _table_exists(conn, "projects_fts")
+    for statement in SEARCH_SCHEMA:
+        conn.execute(statement)
+    if not has_search_index:
+        # index rows written before full-text search existed
+        conn.execute("INSERT INTO projects_fts (projects_fts) VALUES ('rebuild')")
+
+    has_materials_index = _table_exists(conn, "project_materials")
+    for statement in MATERIALS_SCHEMA:
+        conn.execute(statement)
+    if not has_materials_index:
+        index_materials(
+            conn,
+            (
+                (row["project_id"], json.loads(row["materials"]))
+                for row in conn.execute(
+                    "SELECT project_id, materials FROM projects"
+                ).fetchall()
+            ),
+        )
+
+
+def _v2_dates_and_filters(conn: sqlite3.Connection):
+    """Audit dates and a covering index for difficulty/duration filters."""
+    conn.execute("ALTER TABLE projects ADD COLUMN date_created TEXT")
+    conn.execute("ALTER TABLE projects ADD COLUMN date_modified TEXT")
+    conn.execute(
+        """
+        UPDATE projects
+        SET date_created = CURRENT_TIMESTAMP, date_modified = CURRENT_TIMESTAMP
+        """
+    )
+    # every column find_projects reads, so its queries never touch the table
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_projects_difficulty_duration
+        ON projects (difficulty, duration_minutes, date_created, name, project_id)
+        """
+    )
+
+
+def _v3_near_duplicates(conn: sqlite3.Connection):
+    """MinHash signatures, duplicate flags and the LSH bucket table."""
+    conn.execute("ALTER TABLE projects ADD COLUMN minhash BLOB")
+    conn.execute("ALTER TABLE projects ADD COLUMN duplicate_of TEXT")
+    for statement in dedupe.LSH_SCHEMA:
+        conn.execute(statement)
+
+    signatures = []
+    for row in conn.execute(
+        "SELECT project_id, name, materials, instructions FROM projects"
+    ).fetchall():
+        sig = dedupe.signature(
+            Project.model_construct(
+                name=row["name"],
+                materials=json.loads(row["materials"]),
+                instructions=json.loads(row["instructions"]),
+            )
+        )
+        signatures.append((row["project_id"], sig))
+    conn.executemany(
+        "UPDATE projects SET minhash = ? WHERE project_id = ?",
+        [(dedupe.to_blob(sig), project_id) for project_id, sig in signatures],
+    )
+    dedupe.index_signatures(conn, signatures)
+
+
+# Search from v4 on: the full-text table keeps its own copy of the text and
+# the triggers are plain SQL, so any SQLite client can write to `projects`
+# (mcp-server-sqlite, the sqlite3 shell). Triggers index JSON or plain
+# text; compressed BLOBs can't be decoded in SQL, so `index_search_text`
+# fills those in from Python.
+_SEARCH_TEXT = """
+    CASE
+        WHEN typeof({column}) != 'text' THEN NULL
+        WHEN json_valid({column}) THEN json_extract({column}, '$')
+        ELSE {column}
+    END
+"""
+
+_SEARCH_INSERT = f"""
+    INSERT INTO projects_fts (rowid, name, description, materials, instructions)
+    VALUES (
+        new.rowid,
+        new.name,
+        new.description,
+        {_SEARCH_TEXT.format(column="new.materials")},
+        {_SEARCH_TEXT.format(column="new.instructions")}
+    );
+"""
+
+PLAIN_SEARCH_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE projects_fts USING fts5(
+        name,
+        description,
+        materials,
+        instructions,
+        tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER projects_fts_insert AFTER INSERT ON projects BEGIN
+        {_SEARCH_INSERT}
+    END
+    """,
+    """
+    CREATE TRIGGER projects_fts_delete AFTER DELETE ON projects BEGIN
+        DELETE FROM projects_fts WHERE rowid = old.rowid;
+    END
+    """,
+    f"""
+    CREATE TRIGGER projects_fts_update
+    AFTER UPDATE OF name, description, materials, instructions ON projects BEGIN
+        DELETE FROM projects_fts WHERE rowid = old.rowid;
+        {_SEARCH_INSERT}
+    END
+    """,
+)
+
+# repopulates the index; needs `project_text`, so only our own connections
+# run it
+SEARCH_REBUILD_SQL = (
+    "DELETE FROM projects_fts",
+    """
+    INSERT INTO projects_fts (rowid, name, description, materials, instructions)
+    SELECT
+        rowid,
+        name,
+        description,
+        project_text(materials),
+        project_text(instructions)
+    FROM projects
+    """,
+)
+
+SEARCH_TEXT_SQL = """
+    UPDATE projects_fts SET materials = ?, instructions = ?
+    WHERE rowid = (SELECT rowid FROM projects WHERE project_id = ?)
+"""
+
+
+def index_search_text(conn, projects: Iterable[tuple[str, str, str]]):
+    """Sets the indexed text of `(project_id, materials, instructions)` rows.
+
+    Only needed for rows stored with a compressed codec; the triggers index
+    JSON text themselves.
+    """
+    conn.executemany(
+        SEARCH_TEXT_SQL,
+        [
+            (materials, instructions, project_id)
+            for project_id, materials, instructions in projects
+        ],
+    )
+
+
+def _v4_storage_codecs(conn: sqlite3.Connection):
+    """Search over prose columns stored in any codec, from any SQLite client.
+
+    Replaces v1's external-content index, which read through a view, with
+    one that stores its own text behind plain SQL triggers.
+    """
+    for trigger in (
+        "projects_fts_insert",
+        "projects_fts_delete",
+        "projects_fts_update",
+    ):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP VIEW IF EXISTS projects_search_content")
+    conn.execute("DROP TABLE IF EXISTS projects_fts")
+    for statement in PLAIN_SEARCH_SCHEMA:
+        conn.execute(statement)
+    for statement in SEARCH_REBUILD_SQL:
+        conn.execute(statement)
+
+
+def _v5_qa_approved(conn: sqlite3.Connection):
+    """QA approval flag and the index the pipeline cache looks projects up by."""
+    conn.execute(
+        "ALTER TABLE projects ADD COLUMN qa_approved INTEGER NOT NULL DEFAULT 0"
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_projects_qa_approved
+        ON projects (difficulty, duration_minutes, date_created)
+        WHERE qa_approved = 1 AND duplicate_of IS NULL
+        """
+    )
+
+
+def _v6_safety_verdicts(conn: sqlite3.Connection):
+    """Memoized safety reviews, by project content hash and critic rubric."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS safety_verdicts (
+            content_hash TEXT NOT NULL,
+            rubric TEXT NOT NULL,
+            report TEXT NOT NULL,
+            date_created TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (content_hash, rubric)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+MIGRATIONS = (
+    _v1_catalog,
+    _v2_dates_and_filters,
+    _v3_near_duplicates,
+    _v4_storage_codecs,
+    _v5_qa_approved,
+    _v6_safety_verdicts,
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Applies every pending migration in one transaction.
+
+    Args:
+        conn: An open connection with `sqlite3.Row` rows and the
+            `connection.SQL_FUNCTIONS` registered.
+
+    Returns:
+        The schema version the database ended at.
+    """
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    if version >= SCHEMA_VERSION:
+        return version
+
+    # BEGIN IMMEDIATE takes the write lock, so concurrent migrators queue up
+    # and re-read the version once they get their turn
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        (version,) = conn.execute("PRAGMA user_version").fetchone()
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return max(version, SCHEMA_VERSION)
@@ -1,143 +1,315 @@
-import sqlite3
-import json
-import uuid
-from pathlib import Path
-from typing import List, Optional
+import base64
+import logging
+import re
 from enum import Enum
+from itertools import batched, islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import toddle_ops.agents.project_database_team.codec as codec
+import toddle_ops.agents.project_database_team.dedupe as dedupe
+import toddle_ops.agents.project_database_team.schema as schema
+from toddle_ops.agents.project_database_team.cache import LRUCache
+from toddle_ops.agents.project_database_team.connection import get_pool
+from toddle_ops.models.databaseactions import BulkWriteResult
+from toddle_ops.models.projects import CatalogEntry, Project, Difficulty
 
-from toddle_ops.models.projects import Project, Difficulty
+logger = logging.getLogger(__name__)
 
 DATABASE_FILE = Path("toddle_ops_projects.db")
 
+# bumped on every write so in-memory indexes know when to reload
+catalog_generation = 0
+
+# read-through cache in front of get_project; see `project_cache.stats()`
+project_cache = LRUCache(maxsize=256)
+
+
+def _cache_key(project_id: str) -> tuple[str, str]:
+    return (str(DATABASE_FILE), str(project_id))
+
+
+def _catalog_changed(*project_ids: str):
+    """Invalidates caches after a write touching `project_ids`."""
+    global catalog_generation
+    catalog_generation += 1
+    for project_id in project_ids:
+        project_cache.invalidate(_cache_key(project_id))
+
+
+def _cached_project(project_id: str) -> Optional[Project]:
+    """Returns a copy of the cached project, so callers can't mutate the cache."""
+    cached = project_cache.get(_cache_key(project_id))
+    return cached.model_copy() if cached is not None else None
+
+
+def _cache_project(project: Project, generation: int):
+    """Caches `project` unless a write happened since it was read."""
+    if generation == catalog_generation:
+        project_cache.put(_cache_key(project.project_id), project.model_copy())
+
 
 def _get_db_connection():
-    """Establishes a connection to the SQLite database."""
-    conn = sqlite3.connect(DATABASE_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Borrows a pooled connection to the SQLite database.
+
+    Use as a context manager; the transaction commits on exit.
+    """
+    return get_pool(DATABASE_FILE).connection()
+
+
+PROJECT_COLUMNS = (
+    "project_id",
+    "name",
+    "description",
+    "difficulty",
+    "duration_minutes",
+    "materials",
+    "instructions",
+)
+
+# project columns plus the flags the catalog keeps about each project
+CATALOG_COLUMNS = PROJECT_COLUMNS + ("qa_approved", "duplicate_of")
+
+# what the paged agent tool returns unless asked for more - keeps LLM context small
+SUMMARY_COLUMNS = ("name", "difficulty", "duration_minutes")
+
+# stored with `codec.encode` (JSON text or a compressed BLOB)
+_ENCODED_COLUMNS = ("materials", "instructions")
+
+# columns the full-text index covers
+_SEARCH_COLUMNS = {"name", "description", *_ENCODED_COLUMNS}
+
+_INSERT_SQL = """
+    INSERT INTO projects (project_id, name, description, difficulty, duration_minutes, materials, instructions, minhash, duplicate_of, date_created, date_modified)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+"""
+
+_GET_SQL = "SELECT * FROM projects WHERE project_id = ?"
+
+_DELETE_SQL = "DELETE FROM projects WHERE project_id = ?"
+
+_UPSERT_SQL = (
+    _INSERT_SQL
+    + """
+    ON CONFLICT(project_id) DO UPDATE SET
+        name = excluded.name,
+        description = excluded.description,
+        difficulty = excluded.difficulty,
+        duration_minutes = excluded.duration_minutes,
+        materials = excluded.materials,
+        instructions = excluded.instructions,
+        minhash = excluded.minhash,
+        duplicate_of = excluded.duplicate_of,
+        date_modified = CURRENT_TIMESTAMP
+"""
+)
+
+
+def _project_to_row(project: Project) -> tuple:
+    """Flattens a `Project` into `_INSERT_SQL` parameters."""
+    return (
+        str(project.project_id),
+        project.name,
+        project.description,
+        project.difficulty.value,
+        project.duration_minutes,
+        codec.encode(project.materials),
+        codec.encode(project.instructions),
+    )
+
+
+def _row_to_project(row) -> Project:
+    """Builds a `Project` from a `projects` table row."""
+    return Project(
+        project_id=row["project_id"],
+        name=row["name"],
+        description=row["description"],
+        difficulty=Difficulty(row["difficulty"]),
+        duration_minutes=row["duration_minutes"],
+        materials=codec.decode(row["materials"]),
+        instructions=codec.decode(row["instructions"]),
+    )
 
 
 def init_db():
-    """Initializes the database and creates the projects table if it doesn't exist."""
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS projects (
-            project_id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            description TEXT,
-            difficulty TEXT,
-            duration_minutes INTEGER,
-            materials TEXT,
-            instructions TEXT
+    """Initializes the database, creating or migrating its tables as needed."""
+    with _get_db_connection() as conn:
+        schema.migrate(conn)
+
+
+def rebuild_search_index():
+    """Rebuilds the full-text index from the `projects` table.
+
+    Needed after a `VACUUM`, which may renumber the rowids the index keys on.
+    """
+    with _get_db_connection() as conn:
+        for statement in schema.SEARCH_REBUILD_SQL:
+            conn.execute(statement)
+
+
+def _index_compressed_text(conn, projects: Iterable[Project]):
+    """Indexes the prose of projects just written with a compressed codec.
+
+    The search triggers only read JSON text; see `schema.index_search_text`.
+    """
+    if codec.STORAGE_CODEC != "json":
+        schema.index_search_text(
+            conn,
+            ((str(p.project_id), p.materials, p.instructions) for p in projects),
         )
-    """)
-    conn.commit()
-    conn.close()
 
 
-def create_project(project: Project) -> Project:
+def create_project(project: Project, on_duplicate: Optional[str] = None) -> Project:
     """
     Creates a new project in the database.
 
     Args:
         project: The project object to create.
+        on_duplicate: What to do if a near-duplicate is already saved:
+            "allow", "flag" or "merge" (see `dedupe.DUPLICATE_POLICY`, the
+            default).
 
     Returns:
-        The created project object.
+        The created project object, or the existing project it was merged into.
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-    sql = """
-        INSERT INTO projects (project_id, name, description, difficulty, duration_minutes, materials, instructions)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """
-    materials_json = json.dumps([m.model_dump() for m in project.materials])
-    instructions_json = json.dumps(project.instructions)
+    policy = on_duplicate or dedupe.DUPLICATE_POLICY
+    if policy not in dedupe.DUPLICATE_POLICIES:
+        raise ValueError(
+            f"on_duplicate must be one of {dedupe.DUPLICATE_POLICIES}, got {policy!r}"
+        )
 
-    cursor.execute(
-        sql,
-        (
-            str(project.project_id),
+    sig = dedupe.signature(project)
+    with _get_db_connection() as conn:
+        match = dedupe.find_duplicate(conn, sig) if policy != "allow" else None
+        if match is None or policy == "flag":
+            duplicate_of = match[0] if match else None
+            conn.execute(
+                _INSERT_SQL,
+                _project_to_row(project) + (dedupe.to_blob(sig), duplicate_of),
+            )
+            schema.index_materials(conn, [(project.project_id, project.materials)])
+            _index_compressed_text(conn, [project])
+            dedupe.index_signatures(conn, [(project.project_id, sig)])
+
+    if match is not None:
+        logger.warning(
+            "Project %r is a near-duplicate (%.0f%% similar) of %s; %s.",
             project.name,
-            project.description,
-            project.difficulty.value,
-            project.duration_minutes,
-            materials_json,
-            instructions_json,
-        ),
-    )
-    conn.commit()
-    conn.close()
+            match[1] * 100,
+            match[0],
+            "merged into it" if policy == "merge" else "flagged",
+        )
+        if policy == "merge":
+            return get_project(match[0])
+
+    _catalog_changed(project.project_id)
     return project
 
 
-def get_project(project_id: str) -> Optional[Project]:
+def find_duplicate_project(
+    project: Project, threshold: float = dedupe.DUPLICATE_THRESHOLD
+) -> Optional[dict]:
     """
-    Retrieves a project from the database by its ID.
+    Checks whether a near-duplicate of a project is already saved.
 
     Args:
-        project_id: The ID of the project to retrieve.
+        project: The candidate project.
+        threshold: Minimum estimated Jaccard similarity (0-1) to report.
 
     Returns:
-        The project object if found, otherwise None.
+        The matching project's project_id, name and similarity, or None.
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-    sql = "SELECT * FROM projects WHERE project_id = ?"
-    cursor.execute(sql, (project_id,))
-    row = cursor.fetchone()
-    conn.close()
-
-    if row:
-        return Project(
-            project_id=uuid.UUID(row["project_id"]),
-            name=row["name"],
-            description=row["description"],
-            difficulty=Difficulty(row["difficulty"]),
-            duration_minutes=row["duration_minutes"],
-            materials=json.loads(row["materials"]),
-            instructions=json.loads(row["instructions"]),
+    with _get_db_connection() as conn:
+        match = dedupe.find_duplicate(
+            conn, dedupe.signature(project), threshold, exclude_id=project.project_id
         )
-    return None
+        if match is None:
+            return None
+        (name,) = conn.execute(
+            "SELECT name FROM projects WHERE project_id = ?", (match[0],)
+        ).fetchone()
+    return {"project_id": match[0], "name": name, "similarity": match[1]}
 
 
-def update_project(project_id: str, updates: dict) -> Optional[Project]:
+def get_project(project_id: str) -> Optional[Project]:
     """
-    Updates a project in the database.
+    Retrieves a project from the database by its ID.
 
     Args:
-        project_id: The ID of the project to update.
-        updates: A dictionary of fields to update.
+        project_id: The ID of the project to retrieve.
 
     Returns:
-        The updated project object if the project was found and updated, otherwise None.
+        The project object if found, otherwise None.
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
+    cached = _cached_project(project_id)
+    if cached is not None:
+        return cached
+
+    generation = catalog_generation
+    with _get_db_connection() as conn:
+        row = conn.execute(_GET_SQL, (project_id,)).fetchone()
+
+    if row:
+        project = _row_to_project(row)
+        _cache_project(project, generation)
+        return project
+    return None
+
 
+def _update_statement(project_id: str, updates: dict) -> tuple[str, tuple]:
+    """Builds the `UPDATE` statement and parameters for `update_project`."""
     fields = []
     values = []
     for key, value in updates.items():
-        if key in ["materials", "instructions"]:
-            values.append(json.dumps(value))
+        if key in _ENCODED_COLUMNS:
+            values.append(codec.encode(value))
         elif isinstance(value, Enum):
             values.append(value.value)
         else:
             values.append(value)
         fields.append(f"{key} = ?")
 
-    if not fields:
-        return get_project(project_id)
-
+    fields.append("date_modified = CURRENT_TIMESTAMP")
     sql = f"UPDATE projects SET {', '.join(fields)} WHERE project_id = ?"
     values.append(project_id)
+    return sql, tuple(values)
 
-    cursor.execute(sql, tuple(values))
-    conn.commit()
 
-    updated_rows = cursor.rowcount
-    conn.close()
+def update_project(project_id: str, updates: dict) -> Optional[Project]:
+    """
+    Updates a project in the database.
+
+    Args:
+        project_id: The ID of the project to update.
+        updates: A dictionary of fields to update.
+
+    Returns:
+        The updated project object if the project was found and updated, otherwise None.
+    """
+    if not updates:
+        return get_project(project_id)
+
+    sql, values = _update_statement(project_id, updates)
+    with _get_db_connection() as conn:
+        updated_rows = conn.execute(sql, values).rowcount
+        if updated_rows and "materials" in updates:
+            schema.index_materials(conn, [(project_id, updates["materials"])])
+        if updated_rows and updates.keys() & _SEARCH_COLUMNS:
+            row = conn.execute(_GET_SQL, (project_id,)).fetchone()
+            project = _row_to_project(row)
+            # the update trigger re-indexed the row without compressed text
+            if not all(isinstance(row[column], str) for column in _ENCODED_COLUMNS):
+                schema.index_search_text(
+                    conn, [(project_id, project.materials, project.instructions)]
+                )
+            if updates.keys() & {"name", "materials", "instructions"}:
+                sig = dedupe.signature(project)
+                conn.execute(
+                    "UPDATE projects SET minhash = ? WHERE project_id = ?",
+                    (dedupe.to_blob(sig), project_id),
+                )
+                dedupe.index_signatures(conn, [(project_id, sig)])
+    _catalog_changed(project_id)
 
     if updated_rows > 0:
         return get_project(project_id)
@@ -154,13 +326,10 @@ def delete_project(project_id: str) -> bool:
     Returns:
         True if the project was deleted, otherwise False.
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-    sql = "DELETE FROM projects WHERE project_id = ?"
-    cursor.execute(sql, (project_id,))
-    conn.commit()
-    deleted_rows = cursor.rowcount
-    conn.close()
+    with _get_db_connection() as conn:
+        # project_materials rows go with it via ON DELETE CASCADE
+        deleted_rows = conn.execute(_DELETE_SQL, (project_id,)).rowcount
+    _catalog_changed(project_id)
     return deleted_rows > 0
 
 
@@ -168,28 +337,454 @@ def list_projects() -> List[Project]:
     """
     Lists all projects in the database.
 
+    Prefer `iter_projects` or `list_projects_page` for large catalogs.
+
     Returns:
         A list of all project objects.
     """
-    conn = _get_db_connection()
-    cursor = conn.cursor()
-    sql = "SELECT * FROM projects"
-    cursor.execute(sql)
-    rows = cursor.fetchall()
-    conn.close()
-
-    return [
-        Project(
-            project_id=uuid.UUID(row["project_id"]),
-            name=row["name"],
-            description=row["description"],
-            difficulty=Difficulty(row["difficulty"]),
-            duration_minutes=row["duration_minutes"],
-            materials=json.loads(row["materials"]),
-            instructions=json.loads(row["instructions"]),
+    return list(iter_projects())
+
+
+def mark_qa_approved(project_id: str, approved: bool = True) -> bool:
+    """
+    Records whether a project passed the quality assurance pipeline.
+
+    Only approved projects are served by the pipeline cache.
+
+    Args:
+        project_id: The ID of the project.
+        approved: The QA verdict.
+
+    Returns:
+        True if the project exists, otherwise False.
+    """
+    with _get_db_connection() as conn:
+        updated_rows = conn.execute(
+            "UPDATE projects SET qa_approved = ? WHERE project_id = ?",
+            (int(approved), project_id),
+        ).rowcount
+    _catalog_changed(project_id)
+    return updated_rows > 0
+
+
+def _row_to_dict(row) -> dict:
+    """Builds a plain dict from a projected `projects` row."""
+    record = dict(row)
+    for column in _ENCODED_COLUMNS:
+        if column in record:
+            record[column] = codec.decode(record[column])
+    return record
+
+
+def _keyset_query(
+    columns: Optional[Iterable[str]], lazy: bool = False
+) -> tuple[str, Callable]:
+    """Builds the keyset page query and row builder for `iter_projects`."""
+    if columns is None:
+        selected = PROJECT_COLUMNS
+        build = codec.LazyProject if lazy else _row_to_project
+    else:
+        unknown = set(columns) - set(CATALOG_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown project columns: {sorted(unknown)}")
+        selected = ("project_id",) + tuple(c for c in columns if c != "project_id")
+        build = _row_to_dict
+
+    sql = f"""
+        SELECT {", ".join(selected)} FROM projects
+        WHERE project_id > ?
+        ORDER BY project_id
+        LIMIT ?
+    """
+    return sql, build
+
+
+def iter_projects(
+    columns: Optional[Iterable[str]] = None,
+    batch_size: int = 100,
+    after: Optional[str] = None,
+    lazy: bool = False,
+) -> Iterator[Project | dict]:
+    """
+    Streams projects ordered by `project_id` using keyset pagination.
+
+    Each batch is a separate `WHERE project_id > ?` query, so no connection
+    or read transaction is held open between batches and memory stays
+    bounded by `batch_size`.
+
+    Args:
+        columns: Optional subset of `CATALOG_COLUMNS` to read. When given,
+            plain dicts (always including `project_id`) are yielded instead
+            of `Project` objects.
+        batch_size: Number of rows fetched per query.
+        after: Only yield projects whose ID sorts after this one.
+        lazy: Yield `codec.LazyProject` objects, which decode materials and
+            instructions only when read. Ignored when `columns` is given.
+
+    Yields:
+        `Project` objects, or dicts when `columns` is given.
+    """
+    sql, build = _keyset_query(columns, lazy)
+    last_id = after or ""
+    while True:
+        with _get_db_connection() as conn:
+            rows = conn.execute(sql, (last_id, batch_size)).fetchmany(batch_size)
+        if not rows:
+            return
+        for row in rows:
+            yield build(row)
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1]["project_id"]
+
+
+def _encode_cursor(project_id: str) -> str:
+    return base64.urlsafe_b64encode(project_id.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor.encode()).decode()
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+
+
+def list_projects_page(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+) -> dict:
+    """
+    Lists one page of saved projects.
+
+    Call again with the returned `next_cursor` to get the following page.
+    When `next_cursor` is null there are no more projects.
+
+    Args:
+        limit: Maximum number of projects to return (1-100).
+        cursor: The `next_cursor` value from a previous call, if any.
+        columns: Project fields to include. Defaults to name, difficulty and
+            duration_minutes. Valid fields are project_id, name, description,
+            difficulty, duration_minutes, materials and instructions.
+
+    Returns:
+        A dict with a `projects` list and a `next_cursor` token.
+    """
+    limit = max(1, min(limit, 100))
+    after = _decode_cursor(cursor) if cursor else None
+    # read one extra row to learn whether another page exists
+    rows = list(
+        islice(
+            iter_projects(
+                columns or SUMMARY_COLUMNS, batch_size=limit + 1, after=after
+            ),
+            limit + 1,
+        )
+    )
+    page = rows[:limit]
+    next_cursor = _encode_cursor(page[-1]["project_id"]) if len(rows) > limit else None
+    return {"projects": page, "next_cursor": next_cursor}
+
+
+_SEARCH_SQL = """
+    SELECT
+        p.project_id,
+        p.name,
+        p.difficulty,
+        p.duration_minutes,
+        snippet(projects_fts, -1, '[', ']', '...', 12) AS snippet,
+        bm25(projects_fts, 10.0, 4.0, 2.0, 1.0) AS score
+    FROM projects_fts
+    JOIN projects AS p ON p.rowid = projects_fts.rowid
+    WHERE projects_fts MATCH ?
+    ORDER BY score
+    LIMIT ?
+"""
+
+
+def _to_match_expression(query: str) -> str:
+    """Turns free text into an FTS5 expression matching any of its words.
+
+    Every word is quoted, so user input can never inject FTS5 operators.
+    """
+    words = re.findall(r"\w+", query.lower())
+    return " OR ".join(f'"{word}"' for word in words)
+
+
+def search_projects(query: str, limit: int = 10) -> List[dict]:
+    """
+    Searches saved projects by name, description, materials and instructions.
+
+    Results are ranked by relevance (BM25, with matches in the name weighted
+    highest) and include a short snippet around the matching text.
+
+    Args:
+        query: Free-text search, e.g. "salt dough handprints".
+        limit: Maximum number of results to return (1-50).
+
+    Returns:
+        A list of matching projects with project_id, name, difficulty,
+        duration_minutes, snippet and score (lower is more relevant).
+    """
+    match = _to_match_expression(query)
+    if not match:
+        return []
+
+    with _get_db_connection() as conn:
+        rows = conn.execute(_SEARCH_SQL, (match, max(1, min(limit, 50)))).fetchall()
+    return [dict(row) for row in rows]
+
+
+# SQL ORDER BY clauses accepted by `find_projects`
+FIND_ORDERINGS = {
+    "duration": "duration_minutes, project_id",
+    "newest": "date_created DESC, project_id",
+    "name": "name, project_id",
+}
+
+
+def _find_projects_query(
+    difficulty: Optional[str], max_minutes: Optional[int], order_by: str
+) -> tuple[str, list]:
+    """Builds the covering-index query behind `find_projects`."""
+    if order_by not in FIND_ORDERINGS:
+        raise ValueError(
+            f"order_by must be one of {sorted(FIND_ORDERINGS)}, got {order_by!r}"
         )
-        for row in rows
-    ]
+
+    conditions, params = [], []
+    if difficulty is not None:
+        conditions.append("difficulty = ?")
+        params.append(Difficulty(difficulty).value)
+    if max_minutes is not None:
+        conditions.append("duration_minutes <= ?")
+        params.append(max_minutes)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    sql = f"""
+        SELECT project_id, name, difficulty, duration_minutes, date_created
+        FROM projects INDEXED BY idx_projects_difficulty_duration
+        {where}
+        ORDER BY {FIND_ORDERINGS[order_by]}
+        LIMIT ?
+    """
+    return sql, params
+
+
+def find_projects(
+    difficulty: Optional[str] = None,
+    max_minutes: Optional[int] = None,
+    limit: int = 10,
+    order_by: str = "duration",
+) -> List[dict]:
+    """
+    Finds saved projects by difficulty and maximum duration.
+
+    Args:
+        difficulty: Only return projects of this difficulty: "easy",
+            "medium" or "hard".
+        max_minutes: Only return projects that take at most this many minutes.
+        limit: Maximum number of projects to return (1-100).
+        order_by: "duration" (shortest first), "newest" or "name".
+
+    Returns:
+        A list of projects with project_id, name, difficulty,
+        duration_minutes and date_created.
+    """
+    sql, params = _find_projects_query(difficulty, max_minutes, order_by)
+    with _get_db_connection() as conn:
+        rows = conn.execute(sql, (*params, max(1, min(limit, 100)))).fetchall()
+    return [dict(row) for row in rows]
+
+
+def _bulk_write(
+    projects: Iterable[Project],
+    chunk_size: int,
+    upsert: bool,
+    qa_approved: bool = False,
+) -> BulkWriteResult:
+    """Writes `projects` with one `executemany` transaction per chunk."""
+    result = BulkWriteResult()
+    sql = _UPSERT_SQL if upsert else _INSERT_SQL
+
+    # batched() pulls one chunk at a time, so generators are never materialized
+    for chunk in batched(projects, chunk_size):
+        ids = [str(project.project_id) for project in chunk]
+        placeholders = ", ".join("?" * len(ids))
+
+        with _get_db_connection() as conn:
+            existing = {
+                row["project_id"]
+                for row in conn.execute(
+                    f"SELECT project_id FROM projects WHERE project_id IN ({placeholders})",
+                    ids,
+                )
+            }
+
+            # inserts keep the first copy of an ID, upserts end with the last
+            written = {}
+            for project_id, project in zip(ids, chunk):
+                if project_id in existing or project_id in written:
+                    result.conflicts.append(project_id)
+                    if not upsert:
+                        continue
+                    result.updated += 1
+                else:
+                    result.inserted += 1
+                written[project_id] = project
+
+            signatures = {pid: dedupe.signature(p) for pid, p in written.items()}
+            conn.executemany(
+                sql,
+                [
+                    _project_to_row(p) + (dedupe.to_blob(signatures[pid]), None)
+                    for pid, p in written.items()
+                ],
+            )
+            schema.index_materials(
+                conn, ((pid, p.materials) for pid, p in written.items())
+            )
+            _index_compressed_text(conn, written.values())
+            if qa_approved:
+                conn.executemany(
+                    "UPDATE projects SET qa_approved = 1 WHERE project_id = ?",
+                    [(pid,) for pid in written],
+                )
+
+            # bulk loads flag near-duplicates (never merge), including ones
+            # earlier in the same chunk, by indexing each row after its check
+            duplicates = []
+            for project_id, sig in signatures.items():
+                if dedupe.DUPLICATE_POLICY != "allow":
+                    match = dedupe.find_duplicate(conn, sig, exclude_id=project_id)
+                    if match is not None:
+                        duplicates.append((match[0], project_id))
+                dedupe.index_signatures(conn, [(project_id, sig)])
+            conn.executemany(
+                "UPDATE projects SET duplicate_of = ? WHERE project_id = ?", duplicates
+            )
+            # catalog entries (e.g. from an export) keep the flags they had
+            conn.executemany(
+                "UPDATE projects SET qa_approved = ?, duplicate_of = ? "
+                "WHERE project_id = ?",
+                [
+                    (int(p.qa_approved), p.duplicate_of, pid)
+                    for pid, p in written.items()
+                    if isinstance(p, CatalogEntry)
+                ],
+            )
+        _catalog_changed(*written)
+
+    return result
+
+
+def create_projects(
+    projects: Iterable[Project], chunk_size: int = 500, qa_approved: bool = False
+) -> BulkWriteResult:
+    """
+    Inserts many projects, committing once per chunk instead of once per row.
+
+    Projects whose ID already exists are left untouched and reported as
+    conflicts. `CatalogEntry` projects are written with their own
+    `qa_approved` and `duplicate_of` flags. `projects` may be a generator;
+    only one chunk is held in memory at a time.
+
+    Args:
+        projects: The projects to insert.
+        chunk_size: Number of rows written per transaction.
+        qa_approved: Mark the inserted projects as QA-approved in the same
+            transaction that writes them.
+
+    Returns:
+        Counts of inserted rows and the IDs that conflicted.
+    """
+    return _bulk_write(projects, chunk_size, upsert=False, qa_approved=qa_approved)
+
+
+def upsert_projects(
+    projects: Iterable[Project], chunk_size: int = 500
+) -> BulkWriteResult:
+    """
+    Inserts or overwrites many projects, committing once per chunk.
+
+    Projects whose ID already exists are overwritten and reported as
+    conflicts. `CatalogEntry` projects are written with their own
+    `qa_approved` and `duplicate_of` flags. `projects` may be a generator;
+    only one chunk is held in memory at a time.
+
+    Args:
+        projects: The projects to insert or update.
+        chunk_size: Number of rows written per transaction.
+
+    Returns:
+        Counts of inserted and updated rows and the IDs that conflicted.
+    """
+    return _bulk_write(projects, chunk_size, upsert=True)
+
+
+def recompress_projects(
+    storage_codec: Optional[str] = None, chunk_size: int = 500
+) -> int:
+    """
+    Re-encodes stored materials and instructions with a storage codec.
+
+    Rows already in the target encoding are skipped, so an interrupted run
+    can simply be repeated. Each chunk is its own transaction. The database
+    file only shrinks after a `VACUUM` (followed by `rebuild_search_index`).
+
+    Args:
+        storage_codec: "json", "zlib" or "zstd". Defaults to
+            `codec.STORAGE_CODEC`.
+        chunk_size: Number of rows read and rewritten per transaction.
+
+    Returns:
+        The number of projects re-encoded.
+    """
+    target = storage_codec or codec.STORAGE_CODEC
+    # compressed codecs leave incompressible values raw
+    accepted = {target} if target == "json" else {target, "raw"}
+    rewritten = 0
+    last_id = ""
+    while True:
+        with _get_db_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT project_id, materials, instructions FROM projects
+                WHERE project_id > ?
+                ORDER BY project_id
+                LIMIT ?
+                """,
+                (last_id, chunk_size),
+            ).fetchall()
+            texts = [
+                (
+                    row["project_id"],
+                    codec.decode(row["materials"]),
+                    codec.decode(row["instructions"]),
+                )
+                for row in rows
+                if codec.codec_of(row["materials"]) not in accepted
+                or codec.codec_of(row["instructions"]) not in accepted
+            ]
+            updates = [
+                (
+                    codec.encode(materials, target),
+                    codec.encode(instructions, target),
+                    project_id,
+                )
+                for project_id, materials, instructions in texts
+            ]
+            # a storage change only: date_modified and the caches stay as-is
+            conn.executemany(
+                "UPDATE projects SET materials = ?, instructions = ? WHERE project_id = ?",
+                updates,
+            )
+            if target != "json":
+                schema.index_search_text(conn, texts)
+        rewritten += len(updates)
+        if len(rows) < chunk_size:
+            return rewritten
+        last_id = rows[-1]["project_id"]
 
 
 # add this in eventually
@@ -0,0 +1,171 @@
+"""Streaming NDJSON export and import of the project catalog.
+
+Files hold one JSON project per line, with its `qa_approved` and
+`duplicate_of` flags, optionally gzip-compressed (chosen by a `.gz` suffix
+on export, detected from the file itself on import). Rows move in batches
+of `batch_size`, so memory stays flat however large the catalog or file is.
+"""
+
+import gzip
+import json
+import logging
+import os
+from itertools import batched
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+from pydantic import TypeAdapter, ValidationError
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.models.databaseactions import ImportResult
+from toddle_ops.models.projects import CatalogEntry
+
+logger = logging.getLogger(__name__)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ENTRY_LIST = TypeAdapter(list[CatalogEntry])
+
+
+def _open_for_read(path: Path) -> TextIO:
+    with open(path, "rb") as raw:
+        compressed = raw.read(2) == _GZIP_MAGIC
+    if compressed:
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def export_projects(
+    path: str | Path,
+    batch_size: int = 1000,
+    progress: Optional[Callable[[int], None]] = None,
+    compress: Optional[bool] = None,
+) -> int:
+    """
+    Writes every project to an NDJSON file, one project per line.
+
+    The file is written under a temporary name and moved into place when
+    complete, so an interrupted export never leaves a truncated file at
+    `path`.
+
+    Args:
+        path: Destination file.
+        batch_size: Number of rows read from the database per query.
+        progress: Called with the number of projects written so far after
+            every `batch_size` projects and once at the end.
+        compress: Gzip the output. Defaults to True when `path` ends in `.gz`.
+
+    Returns:
+        The number of projects exported.
+    """
+    path = Path(path)
+    if compress is None:
+        compress = path.suffix == ".gz"
+    partial = path.with_name(path.name + ".partial")
+
+    exported = 0
+    try:
+        with (
+            gzip.open(partial, "wt", encoding="utf-8", compresslevel=6)
+            if compress
+            else open(partial, "w", encoding="utf-8")
+        ) as out:
+            # plain dicts skip building a Project per row
+            for row in tools.iter_projects(
+                columns=tools.CATALOG_COLUMNS, batch_size=batch_size
+            ):
+                row["qa_approved"] = bool(row["qa_approved"])
+                out.write(json.dumps(row, ensure_ascii=False))
+                out.write("\n")
+                exported += 1
+                if progress and exported % batch_size == 0:
+                    progress(exported)
+        os.replace(partial, path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    if progress:
+        progress(exported)
+    return exported
+
+
+def _numbered_lines(source: Iterable[str]) -> Iterator[tuple[int, str]]:
+    """Yields `(line_number, line)` for every non-blank line."""
+    for number, line in enumerate(source, start=1):
+        if line.strip():
+            yield number, line
+
+
+def _validate(
+    path: Path, lines: tuple[tuple[int, str], ...]
+) -> tuple[list[CatalogEntry], list[int]]:
+    """Validates a batch of lines, returning the projects and invalid line numbers."""
+    # one parse for the whole batch; fall back to line by line to find
+    # which lines are bad (or if a malformed line split into several items)
+    try:
+        projects = _ENTRY_LIST.validate_json(
+            "[" + ",".join(line for _, line in lines) + "]"
+        )
+        if len(projects) == len(lines):
+            return projects, []
+    except ValidationError:
+        pass
+
+    projects, invalid = [], []
+    for number, line in lines:
+        try:
+            projects.append(CatalogEntry.model_validate_json(line))
+        except ValidationError as exc:
+            invalid.append(number)
+            logger.warning(
+                "Skipping invalid project on line %d of %s: %s",
+                number,
+                path,
+                exc.errors()[0]["msg"],
+            )
+    return projects, invalid
+
+
+def import_projects(
+    path: str | Path,
+    batch_size: int = 1000,
+    progress: Optional[Callable[[int], None]] = None,
+    overwrite: bool = False,
+) -> ImportResult:
+    """
+    Loads projects from an NDJSON file written by `export_projects`.
+
+    Each batch of lines is validated and then written in one transaction.
+    Invalid lines are skipped and reported rather than failing the import.
+
+    Args:
+        path: Source file, plain or gzip-compressed.
+        batch_size: Number of lines validated and written together.
+        progress: Called with the number of lines processed so far after
+            every batch.
+        overwrite: Overwrite projects whose ID already exists instead of
+            keeping the stored copy.
+
+    Returns:
+        Counts of inserted and updated projects, the IDs that already
+        existed and the line numbers that failed validation.
+    """
+    path = Path(path)
+    write = tools.upsert_projects if overwrite else tools.create_projects
+    result = ImportResult()
+    processed = 0
+
+    with _open_for_read(path) as source:
+        for lines in batched(_numbered_lines(source), batch_size):
+            projects, invalid = _validate(path, lines)
+            written = write(projects, chunk_size=batch_size)
+            result.inserted += written.inserted
+            result.updated += written.updated
+            result.conflicts.extend(written.conflicts)
+            result.invalid.extend(invalid)
+
+            processed += len(lines)
+            if progress:
+                progress(processed)
+
+    return result
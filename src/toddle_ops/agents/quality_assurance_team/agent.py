@@ -1,7 +1,20 @@
+import json
+
 from google.adk.agents import LlmAgent, LoopAgent, SequentialAgent
 from google.adk.models.google_llm import Gemini
 from google.adk.tools import FunctionTool
 
+from toddle_ops.agents.quality_assurance_team.prescreen import (
+    ApprovalGate,
+    finish_critic,
+    finish_refiner,
+    screen_before_critic,
+    start_refiner,
+)
+from toddle_ops.agents.quality_assurance_team.verdicts import (
+    rubric_version,
+    verdict_memo,
+)
 from toddle_ops.config.basic import retry_config
 from toddle_ops.models.projects import SafetyReport
 
@@ -39,6 +52,16 @@ safety_critic_agent = LlmAgent(
     """,
     output_schema=SafetyReport,
     output_key="safety_report",
+    # clear-cut projects are judged by the rule-based pre-screen instead
+    before_agent_callback=screen_before_critic,
+    after_agent_callback=finish_critic,
+)
+
+# memoized verdicts are only reused while the critic is unchanged
+verdict_memo.rubric = rubric_version(
+    safety_critic_agent.instruction,
+    safety_critic_agent.model.model,
+    json.dumps(SafetyReport.model_json_schema(), sort_keys=True),
 )
 
 safety_refiner_agent = LlmAgent(
@@ -56,11 +79,19 @@ safety_refiner_agent = LlmAgent(
     from the report.""",
     output_key="current_project",  # It overwrites the project with the new, safer version.
     tools=[FunctionTool(exit_loop)],
+    before_agent_callback=start_refiner,
+    after_agent_callback=finish_refiner,
+)
+
+# approved projects only need `exit_loop`; end the loop before the refiner
+safety_approval_gate = ApprovalGate(
+    name="SafetyApprovalGate",
+    description="Ends the safety loop once the project is approved.",
 )
 
 safety_refinement_loop = LoopAgent(
     name="ToddleOpsSafetyLoop",
-    sub_agents=[safety_critic_agent, safety_refiner_agent],
+    sub_agents=[safety_critic_agent, safety_approval_gate, safety_refiner_agent],
     max_iterations=2,
 )
 
@@ -0,0 +1,335 @@
+"""Deterministic safety pre-screen that runs before the LLM safety critic.
+
+Most projects are clear-cut: crayons and paper are safe, and a project that
+hands a toddler marbles or bleach is not. The pre-screen settles those
+cases from word lists and leaves only the ambiguous ones to the
+`SafetyCriticAgent`:
+
+- "pass": no hazard words anywhere, and every material is on the
+  known-safe list. The critic is skipped and the project is APPROVED.
+- "fail": a high-risk hazard is listed as a material. The critic is skipped
+  and the refiner gets a NEEDS_REVISION report.
+- "unsure": anything else. The critic runs as before.
+
+Hazard words found only in the instructions never fail a project on their
+own ("keep buttons out of reach" mentions buttons too), so they go to the
+critic.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Literal, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from toddle_ops.agents.materials_team.normalize import (
+    normalize_materials,
+    singularize,
+)
+from toddle_ops.agents.quality_assurance_team.verdicts import verdict_memo
+from toddle_ops.models.projects import (
+    Project,
+    SafetyReport,
+    SafetyStatus,
+    parse_project,
+)
+
+# terms are singular, lowercase word sequences; "high" hazards fail a
+# project outright when listed as a material, "caution" ones need judgement.
+# Everyday toddler materials that are only risky unsupervised or in the
+# mouth (cotton balls, balloons, marshmallows) are "caution", so the critic
+# weighs how the project uses them instead of the pre-screen rejecting them.
+HAZARDS = {
+    "choking": {
+        "high": {
+            "bead", "bottle cap", "coin", "dried bean", "googly eye", "grape",
+            "jelly bean", "marble", "nut", "pebble", "popcorn", "sequin",
+            "small rock", "water bead",
+        },
+        "caution": {
+            "balloon", "bean", "button", "cereal", "cotton ball", "marshmallow",
+            "pasta", "pom-pom", "rice",
+        },
+    },
+    "ingestion": {
+        "high": {"button battery", "battery", "magnet", "cell battery"},
+        "caution": set(),
+    },
+    "toxic": {
+        "high": {
+            "acetone", "ammonia", "bleach", "borax", "epoxy", "essential oil",
+            "laundry pod", "lye", "nail polish", "oil paint", "resin",
+            "spray paint", "super glue", "superglue", "turpentine",
+        },
+        "caution": {
+            "dish soap", "food coloring", "glitter", "permanent marker",
+            "shaving cream", "vinegar", "baking soda",
+        },
+    },
+    "heat": {
+        "high": {"candle", "lighter", "match", "boiling water"},
+        "caution": {
+            "bake", "boil", "hot glue", "hot water", "iron", "microwave",
+            "oven", "stove",
+        },
+    },
+    "sharp": {
+        "high": {
+            "blade", "craft knife", "glass", "knife", "needle", "pin", "razor",
+            "saw", "thumbtack", "x-acto",
+        },
+        "caution": {
+            "fork", "paper clip", "scissors", "skewer", "staple", "stapler",
+            "toothpick",
+        },
+    },
+}  # fmt: skip
+
+# canonical materials (see `normalize_materials`) a project may use and
+# still pass without the critic
+SAFE_MATERIALS = {
+    "cardboard", "cardboard box", "cardboard tube", "chalk", "coffee filter",
+    "coloring page", "crayon", "finger paint", "glue", "marker", "newspaper",
+    "paint", "paint brush", "paper", "paper bag", "paper plate", "paper towel",
+    "play dough", "playdough", "plastic cup", "rolling pin", "sponge",
+    "sticker", "tape",
+    "tissue paper", "towel", "water", "watercolor", "wax paper",
+}  # fmt: skip
+
+# everyday phrases that contain a hazard term without being that hazard
+HARMLESS_PHRASES = {"rolling pin"}
+
+_WORD = re.compile(r"[a-z][a-z'-]*")
+
+Verdict = Literal["pass", "fail", "unsure"]
+
+
+def _words(text: str) -> str:
+    """Singularized words of `text`, space-padded for phrase lookups.
+
+    `HARMLESS_PHRASES` are blanked out so their words match no hazard.
+    """
+    words = " " + " ".join(singularize(w) for w in _WORD.findall(text.lower())) + " "
+    for phrase in HARMLESS_PHRASES:
+        words = words.replace(f" {phrase} ", " ")
+    return words
+
+
+def _find(words: str, terms: set[str]) -> list[str]:
+    return sorted(term for term in terms if f" {term} " in words)
+
+
+@dataclass
+class PrescreenResult:
+    """The pre-screen's verdict and the hazards behind it."""
+
+    verdict: Verdict
+    findings: list[str] = field(default_factory=list)
+
+    def to_report(self) -> Optional[SafetyReport]:
+        """Returns a `SafetyReport` for confident verdicts, else None."""
+        if self.verdict == "pass":
+            return SafetyReport(
+                status=SafetyStatus.APPROVED,
+                summary="Rule-based pre-screen: only common toddler-safe "
+                "materials and no known hazards.",
+            )
+        if self.verdict == "fail":
+            return SafetyReport(
+                status=SafetyStatus.NEEDS_REVISION,
+                suggestions=[
+                    f"Replace or remove {finding}; it is not safe for toddlers."
+                    for finding in self.findings
+                ],
+                summary="Rule-based pre-screen found high-risk materials: "
+                + ", ".join(self.findings)
+                + ".",
+            )
+        return None
+
+
+def prescreen(project: Project) -> PrescreenResult:
+    """Classifies a project as a clear pass, a clear fail, or unsure.
+
+    Args:
+        project: The project to screen.
+
+    Returns:
+        The verdict, with findings formatted as "term (category)".
+    """
+    materials = _words(project.materials)
+    everything = materials + _words(project.name + " " + project.instructions)
+
+    high_in_materials = []
+    mentioned = []
+    for category, levels in HAZARDS.items():
+        for term in _find(materials, levels["high"]):
+            high_in_materials.append(f"{term} ({category})")
+        for term in _find(everything, levels["high"] | levels["caution"]):
+            mentioned.append(f"{term} ({category})")
+
+    if high_in_materials:
+        return PrescreenResult("fail", high_in_materials)
+    if mentioned:
+        return PrescreenResult("unsure", mentioned)
+    unknown = sorted(normalize_materials(project.materials) - SAFE_MATERIALS)
+    if unknown:
+        return PrescreenResult("unsure", [f"{m} (unlisted)" for m in unknown])
+    return PrescreenResult("pass")
+
+
+class PrescreenStats:
+    """Counts pre-screen verdicts and estimates the LLM time they saved.
+
+    Skipped critic calls include memoized verdicts (`memo_hits`). The
+    estimate multiplies the skipped critic and refiner calls by the
+    average duration of the ones that did run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: dict[tuple[str, str], float] = {}
+        self.verdicts = {"pass": 0, "fail": 0, "unsure": 0}
+        self.skipped = {"critic": 0, "refiner": 0}
+        self.llm_runs = {"critic": 0, "refiner": 0}
+        self.llm_seconds = {"critic": 0.0, "refiner": 0.0}
+        self.memo_hits = 0
+
+    def record_verdict(self, verdict: Verdict):
+        with self._lock:
+            self.verdicts[verdict] += 1
+
+    def record_memo_hit(self):
+        with self._lock:
+            self.memo_hits += 1
+
+    def record_skip(self, agent: str):
+        with self._lock:
+            self.skipped[agent] += 1
+
+    def start_llm(self, agent: str, invocation_id: str):
+        self._started[(agent, invocation_id)] = time.perf_counter()
+
+    def finish_llm(self, agent: str, invocation_id: str):
+        start = self._started.pop((agent, invocation_id), None)
+        if start is None:
+            return
+        with self._lock:
+            self.llm_runs[agent] += 1
+            self.llm_seconds[agent] += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        """Returns verdict counts, the hit rate and the estimated time saved."""
+        with self._lock:
+            screened = sum(self.verdicts.values())
+            confident = self.verdicts["pass"] + self.verdicts["fail"]
+            saved = sum(
+                self.skipped[agent] * self.llm_seconds[agent] / self.llm_runs[agent]
+                for agent in self.skipped
+                if self.llm_runs[agent]
+            )
+            return {
+                "screened": screened,
+                **self.verdicts,
+                "hit_rate": confident / screened if screened else 0.0,
+                "memo_hits": self.memo_hits,
+                "skipped_llm_calls": dict(self.skipped),
+                "est_llm_seconds_saved": saved,
+            }
+
+
+prescreen_stats = PrescreenStats()
+
+
+async def screen_before_critic(
+    callback_context: CallbackContext,
+) -> Optional[types.Content]:
+    """`before_agent_callback` for the critic: answers clear-cut projects.
+
+    A confident pre-screen verdict, or a memoized verdict for the same
+    project content, is written to `safety_report` and returned as the
+    critic's response, so the LLM critic does not run.
+    """
+    try:
+        project = parse_project(callback_context.state.get("standard_project"))
+    except ValueError:
+        # not structured yet; the critic can read prose
+        project = None
+        result = PrescreenResult("unsure")
+    else:
+        result = prescreen(project)
+    prescreen_stats.record_verdict(result.verdict)
+
+    report = result.to_report()
+    if report is None and project is not None:
+        report = await asyncio.to_thread(verdict_memo.get, project)
+        if report is not None:
+            prescreen_stats.record_memo_hit()
+    if report is None:
+        prescreen_stats.start_llm("critic", callback_context.invocation_id)
+        return None
+    prescreen_stats.record_skip("critic")
+    callback_context.state["safety_report"] = report.model_dump(mode="json")
+    return types.Content(
+        role="model", parts=[types.Part(text=report.model_dump_json())]
+    )
+
+
+async def finish_critic(callback_context: CallbackContext) -> None:
+    """`after_agent_callback` for the critic: times and memoizes its verdict."""
+    prescreen_stats.finish_llm("critic", callback_context.invocation_id)
+    state = callback_context.state
+    try:
+        project = parse_project(state.get("standard_project"))
+        report = SafetyReport.model_validate(state.get("safety_report"))
+    except ValueError:
+        return None
+    await asyncio.to_thread(verdict_memo.put, project, report)
+    return None
+
+
+class ApprovalGate(BaseAgent):
+    """Ends the safety loop once the project is approved.
+
+    Placed between the critic and the refiner: an APPROVED report means the
+    refiner's only job would be to call `exit_loop`, so the gate escalates
+    instead and the refiner's LLM call is skipped. Otherwise it does nothing.
+    """
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        report = ctx.session.state.get("safety_report")
+        if isinstance(report, dict) and report.get("status") == SafetyStatus.APPROVED:
+            prescreen_stats.record_skip("refiner")
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                content=types.Content(
+                    role="model",
+                    parts=[
+                        types.Part(
+                            text="Project approved. Exiting Quality Assurance loop."
+                        )
+                    ],
+                ),
+                actions=EventActions(escalate=True),
+            )
+
+
+def start_refiner(callback_context: CallbackContext) -> None:
+    """`before_agent_callback` for the refiner: times LLM refiner runs."""
+    prescreen_stats.start_llm("refiner", callback_context.invocation_id)
+
+
+def finish_refiner(callback_context: CallbackContext) -> None:
+    """`after_agent_callback` for the refiner: times LLM refiner runs."""
+    prescreen_stats.finish_llm("refiner", callback_context.invocation_id)
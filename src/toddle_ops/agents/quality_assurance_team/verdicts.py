@@ -0,0 +1,110 @@
+"""Memoized safety reviews, keyed by project content.
+
+A `SafetyReport` depends only on what a toddler would handle and do, so
+the memo keys reports on a hash of the project's materials and
+instructions, plus a `rubric` fingerprint of the critic (its prompt, model
+and report schema). Changing the critic changes the rubric, and every
+earlier verdict stops matching.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.models.projects import Project, SafetyReport
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def content_hash(project: Project) -> str:
+    """Hashes the lowercased, whitespace-normalized materials and instructions.
+
+    The raw materials list is hashed rather than its canonical items, which
+    drop sizes and quantities that matter for safety ("small pom-poms").
+    """
+    canonical = {
+        "materials": _normalize_text(project.materials),
+        "instructions": _normalize_text(project.instructions),
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+
+def rubric_version(*parts: str) -> str:
+    """Fingerprints whatever a verdict depends on besides the project."""
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:16]
+
+
+class VerdictMemo:
+    """Persists critic verdicts in the project database.
+
+    `rubric` must be set (see `rubric_version`) before the memo is used;
+    with an empty rubric the memo stores and finds nothing.
+    """
+
+    def __init__(self, rubric: str = ""):
+        self.rubric = rubric
+        self._lock = threading.Lock()
+        self._ready_for = None
+        self.hits = 0
+        self.misses = 0
+
+    def _ensure_schema(self):
+        # the memo can be consulted before anything else touched the database
+        path = str(Path(tools.DATABASE_FILE).resolve())
+        if self._ready_for != path:
+            tools.init_db()
+            with tools._get_db_connection() as conn:
+                purged = conn.execute(
+                    "DELETE FROM safety_verdicts WHERE rubric != ?", (self.rubric,)
+                ).rowcount
+            if purged:
+                logger.info("Dropped %d safety verdicts from older rubrics", purged)
+            self._ready_for = path
+
+    def get(self, project: Project) -> Optional[SafetyReport]:
+        """Returns the memoized report for `project`, or None."""
+        if not self.rubric:
+            return None
+        with self._lock:
+            self._ensure_schema()
+            with tools._get_db_connection() as conn:
+                row = conn.execute(
+                    "SELECT report FROM safety_verdicts "
+                    "WHERE content_hash = ? AND rubric = ?",
+                    (content_hash(project), self.rubric),
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return SafetyReport.model_validate_json(row["report"])
+
+    def put(self, project: Project, report: SafetyReport | dict):
+        """Memoizes the critic's report for `project`."""
+        if not self.rubric:
+            return
+        report = SafetyReport.model_validate(report)
+        with self._lock:
+            self._ensure_schema()
+            try:
+                with tools._get_db_connection() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO safety_verdicts "
+                        "(content_hash, rubric, report) VALUES (?, ?, ?)",
+                        (content_hash(project), self.rubric, report.model_dump_json()),
+                    )
+            except sqlite3.Error:
+                # a lost memo entry only costs a repeat review
+                logger.exception("Could not memoize a safety verdict")
+
+
+verdict_memo = VerdictMemo()
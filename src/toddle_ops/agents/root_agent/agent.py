@@ -1,21 +1,49 @@
 from google.adk.agents import LlmAgent, SequentialAgent
 from google.adk.models.google_llm import Gemini
-from google.adk.tools import AgentTool
+from google.adk.tools import AgentTool, FunctionTool
 from google.adk.tools import preload_memory
 
 import toddle_ops.agents.craft_research_team.agent as craft
+import toddle_ops.agents.materials_team.tools as materials
 import toddle_ops.agents.quality_assurance_team.agent as qa
-from toddle_ops.config.basic import retry_config
+from toddle_ops.config.basic import (
+    project_pool_concurrency,
+    project_pool_depth,
+    project_pool_max_age,
+    retry_config,
+)
 from toddle_ops.services.callbacks import auto_save_to_memory
+from toddle_ops.services.project_cache import CachedPipelineAgent
+from toddle_ops.services.project_pool import ProjectPool
 
 project_pipeline = SequentialAgent(
-    name="ToddleOpsSequence",
+    name="ToddleOpsPipeline",
     sub_agents=[
         craft.root_agent,
         qa.root_agent,
     ],
 )
 
+project_pool = (
+    ProjectPool(
+        agent=project_pipeline,
+        depth=project_pool_depth,
+        concurrency=project_pool_concurrency,
+        max_age_seconds=project_pool_max_age,
+    )
+    if project_pool_depth > 0
+    else None
+)
+
+# serves pre-generated or QA-approved catalog projects that fit the
+# request; the full research + QA pipeline only runs on a miss
+cached_pipeline = CachedPipelineAgent(
+    name="ToddleOpsSequence",
+    description="Generates a safe, QA-approved toddler project for a request.",
+    sub_agents=[project_pipeline],
+    pool=project_pool,
+)
+
 root_agent = LlmAgent(
     name="ToddleOpsRoot",
     model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
@@ -37,10 +65,16 @@ root_agent = LlmAgent(
 
     - Output the project when the tool is finished.
 
+    - If the user tells you which materials they have on hand and asks what
+    they can make, use the `find_projects_by_materials` tool first. If it
+    finds nothing suitable, fall back to the `ToddleOpsSequence` tool and
+    pass the materials along.
+
 
     """,
     tools=[
-        AgentTool(project_pipeline),
+        AgentTool(cached_pipeline),
+        FunctionTool(materials.find_projects_by_materials),
         preload_memory,
     ],
     output_key="project_request",
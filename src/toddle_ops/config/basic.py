@@ -1,3 +1,5 @@
+import os
+
 from google.genai import types
 from google.adk.apps.app import EventsCompactionConfig
 
@@ -23,3 +25,36 @@ eval_config = {
         "response_match_score": 0.2,
     }
 }
+
+# parallel eval runner (helpers/evals.py): cases in flight at once, and the
+# file of last passing results it uses to skip unchanged cases
+eval_workers = int(os.environ.get("TODDLE_OPS_EVAL_WORKERS", "4"))
+eval_cache_path = os.environ.get("TODDLE_OPS_EVAL_CACHE", ".adk/eval_cache.json")
+
+# SQL tools for the database agent: "local" runs them in-process,
+# "mcp" spawns `uvx mcp-server-sqlite` over stdio
+sql_toolset = os.environ.get("TODDLE_OPS_SQL_TOOLSET", "local")
+sqlite_db_path = os.environ.get("TODDLE_OPS_SQLITE_DB", "projects-data.db")
+
+# CraftResearchTeam: seconds each researcher may take, and how many
+# researchers must finish before the rest are cancelled
+research_branch_timeout = float(os.environ.get("TODDLE_OPS_RESEARCH_TIMEOUT", "20"))
+research_min_completed = int(os.environ.get("TODDLE_OPS_RESEARCH_MIN_COMPLETED", "2"))
+
+# research results cached on disk and shared across sessions and processes
+research_cache_path = os.environ.get("TODDLE_OPS_RESEARCH_CACHE", "research-cache.db")
+research_cache_ttl = float(os.environ.get("TODDLE_OPS_RESEARCH_CACHE_TTL", "86400"))
+
+# background pool of pre-generated projects per difficulty; depth 0 turns
+# it off (every pooled project costs a full pipeline run)
+project_pool_depth = int(os.environ.get("TODDLE_OPS_POOL_DEPTH", "0"))
+project_pool_concurrency = int(os.environ.get("TODDLE_OPS_POOL_CONCURRENCY", "2"))
+project_pool_max_age = float(os.environ.get("TODDLE_OPS_POOL_MAX_AGE", "21600"))
+
+# MetricsPlugin: also emit OpenTelemetry spans per agent, model and tool call
+metrics_otel_spans = os.environ.get("TODDLE_OPS_OTEL_SPANS", "0") == "1"
+
+# record/replay of model and tool calls for evals and notebooks: "record",
+# "replay" or "auto" (see services/cassette.py); unset runs everything live
+cassette_mode = os.environ.get("TODDLE_OPS_CASSETTE_MODE", "")
+cassette_path = os.environ.get("TODDLE_OPS_CASSETTE", "cassettes/toddle_ops.jsonl.gz")
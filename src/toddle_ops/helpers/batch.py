@@ -0,0 +1,219 @@
+"""Batch project generation for filling the catalog.
+
+Runs the generation pipeline over many prompts, `concurrency` at a time,
+each in its own session. QA-approved projects are written with the bulk
+`create_projects` path every `flush_size` results, and each prompt is then
+recorded in a JSONL checkpoint, so a crashed or interrupted batch picks up
+where it left off when run again with the same checkpoint.
+
+Usage:
+    uv run python -m toddle_ops.helpers.batch prompts.txt --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Callable, Optional
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from pydantic import BaseModel, Field
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.root_agent.agent import project_pipeline
+from toddle_ops.helpers.run import generate_project
+from toddle_ops.models.projects import Project
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "batch-checkpoint.jsonl"
+
+
+class BatchResult(BaseModel):
+    """The outcome of a batch run."""
+
+    saved: list[str] = Field(
+        default_factory=list, description="IDs of projects written to the catalog."
+    )
+    rejected: list[int] = Field(
+        default_factory=list,
+        description="Prompts that produced no QA-approved project.",
+    )
+    failed: list[int] = Field(
+        default_factory=list,
+        description="Prompts whose run raised; they are retried on resume.",
+    )
+    skipped: int = Field(0, description="Prompts already done in an earlier run.")
+
+
+def read_prompts(source: list[str] | str | Path) -> list[str]:
+    """Returns prompts from a list or a file with one prompt per line.
+
+    Blank lines and lines starting with `#` are ignored.
+    """
+    if not isinstance(source, (str, Path)):
+        return list(source)
+    lines = Path(source).read_text().splitlines()
+    stripped = (line.strip() for line in lines)
+    return [line for line in stripped if line and not line.startswith("#")]
+
+
+def _load_checkpoint(path: Path, prompts: list[str]) -> set[int]:
+    """Returns the indexes of prompts recorded as done in `path`."""
+    done = set()
+    if not path.exists():
+        return done
+    text = path.read_text()
+    if text and not text.endswith("\n"):
+        # a torn final line from a crash mid-write; end it so the next entry
+        # starts on a line of its own
+        with path.open("a") as f:
+            f.write("\n")
+    for line in text.splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        index = entry.get("index")
+        if (
+            isinstance(index, int)
+            and index < len(prompts)
+            and prompts[index] == entry.get("prompt")
+        ):
+            done.add(index)
+    return done
+
+
+def _append_checkpoint(path: Path, entries: list[dict]):
+    """Appends `entries` to the checkpoint, one JSON object per line."""
+    with path.open("a") as f:
+        f.writelines(json.dumps(entry) + "\n" for entry in entries)
+
+
+async def run_batch(
+    runner: Runner,
+    prompts: list[str] | str | Path,
+    checkpoint: str | Path = CHECKPOINT_FILE,
+    concurrency: int = 4,
+    flush_size: int = 25,
+    user_id: str = "batch",
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> BatchResult:
+    """Generates a project for every prompt and saves the approved ones.
+
+    Args:
+        runner: Runs the generation pipeline; its session service holds the
+            per-prompt sessions, which are deleted once read.
+        prompts: The prompts, or a file with one prompt per line.
+        checkpoint: JSONL file recording finished prompts. Prompts found in
+            it are skipped.
+        concurrency: How many pipeline runs may be in flight at once.
+        flush_size: How many finished prompts to buffer per bulk write.
+        user_id: The user the batch sessions belong to.
+        progress: Called with (prompts finished, total) after each flush.
+
+    Returns:
+        The saved project IDs and the rejected, failed and skipped prompts.
+    """
+    # file and database setup stays off the event loop too
+    prompts = await asyncio.to_thread(read_prompts, prompts)
+    checkpoint = Path(checkpoint)
+    done = await asyncio.to_thread(_load_checkpoint, checkpoint, prompts)
+    result = BatchResult(skipped=len(done))
+    await asyncio.to_thread(tools.init_db)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    flush_lock = asyncio.Lock()
+    buffer: list[tuple[int, Optional[Project]]] = []
+    finished = len(done)
+
+    async def flush():
+        nonlocal finished
+        async with flush_lock:
+            if not buffer:
+                return
+            batch = buffer[:]
+            buffer.clear()
+            projects = [project for _, project in batch if project is not None]
+            # the approval flag goes in with the rows, so a crash never leaves
+            # a batch project saved but unapproved
+            written = await asyncio.to_thread(
+                tools.create_projects, projects, qa_approved=True
+            )
+            conflicts = set(written.conflicts)
+            result.saved.extend(
+                project.project_id
+                for project in projects
+                if project.project_id not in conflicts
+            )
+            # only record prompts once their projects are safely written
+            entries = [
+                {
+                    "index": index,
+                    "prompt": prompts[index],
+                    "project_id": project.project_id if project else None,
+                }
+                for index, project in batch
+            ]
+            await asyncio.to_thread(_append_checkpoint, checkpoint, entries)
+            finished += len(batch)
+            if progress:
+                progress(finished, len(prompts))
+
+    async def run_one(index: int):
+        async with semaphore:
+            try:
+                project = await generate_project(runner, prompts[index], user_id)
+            except Exception:
+                logger.exception("Batch prompt %d failed", index)
+                result.failed.append(index)
+                return
+        if project is None:
+            result.rejected.append(index)
+        buffer.append((index, project))
+        if len(buffer) >= flush_size:
+            await flush()
+
+    try:
+        await asyncio.gather(
+            *(run_one(index) for index in range(len(prompts)) if index not in done)
+        )
+    finally:
+        await flush()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("prompts", type=Path, help="File with one prompt per line.")
+    parser.add_argument("--checkpoint", type=Path, default=Path(CHECKPOINT_FILE))
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--flush-size", type=int, default=25)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    runner = Runner(
+        agent=project_pipeline,
+        app_name="toddle_ops_batch",
+        session_service=InMemorySessionService(),
+    )
+    result = asyncio.run(
+        run_batch(
+            runner,
+            args.prompts,
+            checkpoint=args.checkpoint,
+            concurrency=args.concurrency,
+            flush_size=args.flush_size,
+            progress=lambda done, total: print(f"{done}/{total} prompts done"),
+        )
+    )
+    print(
+        f"saved {len(result.saved)}, rejected {len(result.rejected)}, "
+        f"failed {len(result.failed)}, skipped {result.skipped}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""Parallel eval runner with a cache of passing results.
+
+Runs the cases of one or more `.evalset.json` files against an agent,
+`workers` cases at a time, each in its own in-memory session, and scores
+them against `eval_config`'s criteria with ADK's metric evaluators. A case
+that passed before is skipped while both the agent graph and the case hash
+the same as they did then. The graph hash covers each agent's name,
+model, instructions, tools and output schema; the case hash covers the
+conversation, the initial state and the criteria. Failed cases always run
+again. A JSON report gives each case's status, scores and time, the time
+each agent took, and the sweep's totals.
+
+Code the hash can't see, such as a tool's body or a callback, needs
+`--rerun`. Cases running at once share what the agents share outside the
+session: the project database and the research cache. Set
+TODDLE_OPS_CASSETTE_MODE to replay recorded model calls
+(see services/cassette.py).
+
+Usage:
+    uv run python -m toddle_ops.helpers.evals \\
+        toddle_ops.agents.craft_research_team.agent \\
+        src/toddle_ops/agents/craft_research_team/project_creation_test.evalset.json \\
+        --workers 8
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Literal, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.apps.app import App
+from google.adk.evaluation.eval_case import EvalCase, Invocation
+from google.adk.evaluation.eval_config import (
+    EvalConfig,
+    get_eval_metrics_from_config,
+)
+from google.adk.evaluation.eval_metrics import EvalMetric
+from google.adk.evaluation.eval_set import EvalSet
+from google.adk.evaluation.evaluation_generator import EvaluationGenerator
+from google.adk.evaluation.evaluator import EvalStatus
+from google.adk.evaluation.metric_evaluator_registry import (
+    DEFAULT_METRIC_EVALUATOR_REGISTRY,
+)
+from google.adk.evaluation.user_simulator import Status as UserSimulatorStatus
+from google.adk.evaluation.user_simulator_provider import UserSimulatorProvider
+from google.adk.events import Event
+from google.adk.memory import InMemoryMemoryService
+from google.adk.models.base_llm import BaseLlm
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools.agent_tool import AgentTool
+from pydantic import BaseModel, Field
+
+from toddle_ops.config.basic import (
+    cassette_mode,
+    cassette_path,
+    eval_cache_path,
+    eval_config,
+    eval_workers,
+)
+from toddle_ops.services.cassette import CassettePlugin
+from toddle_ops.services.metrics import MetricsPlugin
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILE = ".adk/eval_report.json"
+
+Status = Literal["passed", "failed", "error", "skipped"]
+
+
+class CaseResult(BaseModel):
+    """How one eval case went."""
+
+    eval_set_id: str
+    eval_id: str
+    status: Status
+    seconds: float = Field(0.0, description="Time spent on the case this sweep.")
+    scores: dict[str, Optional[float]] = Field(
+        default_factory=dict,
+        description="Overall score per metric; None if it couldn't be scored.",
+    )
+    error: Optional[str] = None
+
+
+class EvalReport(BaseModel):
+    """Results and timings of an eval sweep."""
+
+    graph_hash: str
+    workers: int
+    seconds: float = Field(0.0, description="Wall time of the whole sweep.")
+    saved_seconds: float = Field(
+        0.0, description="What the skipped cases took when they last ran."
+    )
+    cases: list[CaseResult] = Field(default_factory=list)
+    agents: dict[str, dict[str, float]] = Field(
+        default_factory=dict, description="Agent run time summaries, by agent."
+    )
+
+    def count(self, status: Status) -> int:
+        """Returns how many cases ended with `status`."""
+        return sum(case.status == status for case in self.cases)
+
+
+def _digest(payload: Any) -> str:
+    canonical = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(canonical).hexdigest()[:32]
+
+
+def _source(value: Any) -> Any:
+    """Names callables (instruction providers, tool functions) by location."""
+    if callable(value):
+        return f"{value.__module__}.{value.__qualname__}"
+    return value
+
+
+def _model(model: str | BaseLlm) -> str:
+    if isinstance(model, BaseLlm):
+        return f"{type(model).__name__}:{model.model}"
+    return model
+
+
+def _tool(tool: Any) -> Any:
+    if isinstance(tool, AgentTool):
+        return {"agent_tool": _describe(tool.agent)}
+    if callable(tool) and not hasattr(tool, "name"):
+        return {"function": _source(tool), "doc": tool.__doc__}
+    return {
+        "tool": getattr(tool, "name", type(tool).__name__),
+        "description": getattr(tool, "description", None),
+    }
+
+
+def _describe(agent: BaseAgent) -> dict:
+    data = {
+        "name": agent.name,
+        "type": type(agent).__name__,
+        "description": agent.description,
+    }
+    if isinstance(agent, LlmAgent):
+        schema = agent.output_schema
+        config = agent.generate_content_config
+        data.update(
+            model=_model(agent.model),
+            instruction=_source(agent.instruction),
+            global_instruction=_source(agent.global_instruction),
+            tools=[_tool(tool) for tool in agent.tools],
+            output_key=agent.output_key,
+            output_schema=schema.model_json_schema() if schema else None,
+            config=config.model_dump(
+                mode="json", exclude_none=True, exclude={"http_options"}
+            )
+            if config
+            else None,
+        )
+    data["sub_agents"] = [_describe(sub_agent) for sub_agent in agent.sub_agents]
+    return data
+
+
+def graph_hash(agent: BaseAgent) -> str:
+    """Hashes what the agents under `agent` are told and can call."""
+    return _digest(_describe(agent))
+
+
+def case_key(graph: str, eval_set_id: str, case: EvalCase, config: EvalConfig) -> str:
+    """Hashes everything a case's result depends on, given the graph hash."""
+    return _digest(
+        {
+            "graph": graph,
+            "eval_set": eval_set_id,
+            "case": case.model_dump(mode="json", exclude_none=True),
+            "config": config.model_dump(mode="json", exclude_none=True),
+        }
+    )
+
+
+def load_eval_set(path: str | Path) -> EvalSet:
+    """Reads an `.evalset.json` file."""
+    return EvalSet.model_validate_json(Path(path).read_text())
+
+
+def _load_cache(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except json.JSONDecodeError:
+        logger.warning("Ignoring unreadable eval cache %s", path)
+        return {}
+
+
+def _save_cache(path: Path, cache: dict[str, dict]):
+    # write then rename, so an interrupted sweep can't leave half a file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(path.suffix + ".tmp")
+    partial.write_text(json.dumps(cache, indent=2, sort_keys=True))
+    partial.replace(path)
+
+
+async def _infer(
+    agent: BaseAgent,
+    case: EvalCase,
+    plugins: list[BasePlugin],
+    user_simulators: UserSimulatorProvider,
+) -> list[Invocation]:
+    """Runs a case's conversation in a session of its own."""
+    session_input = case.session_input
+    app_name = session_input.app_name if session_input else "toddle_ops_eval"
+    user_id = session_input.user_id if session_input else "eval"
+    sessions = InMemorySessionService()
+    session = await sessions.create_session(
+        app_name=app_name,
+        user_id=user_id,
+        state=copy.deepcopy(session_input.state) if session_input else {},
+    )
+    simulator = user_simulators.provide(case)
+    events: list[Event] = []
+    app = App(name=app_name, root_agent=agent, plugins=plugins)
+    async with Runner(
+        app=app, session_service=sessions, memory_service=InMemoryMemoryService()
+    ) as runner:
+        while True:
+            message = await simulator.get_next_user_message(copy.deepcopy(events))
+            if message.status != UserSimulatorStatus.SUCCESS:
+                break
+            turn: list[Event] = []
+            async for event in runner.run_async(
+                user_id=user_id,
+                session_id=session.id,
+                new_message=message.user_message,
+            ):
+                if not turn:
+                    # the evaluators find each turn's question by its author
+                    turn.append(
+                        Event(
+                            author="user",
+                            content=message.user_message,
+                            invocation_id=event.invocation_id,
+                        )
+                    )
+                turn.append(event)
+            events.extend(turn)
+    return EvaluationGenerator.convert_events_to_eval_invocations(events)
+
+
+async def _score(
+    metrics: list[EvalMetric],
+    actual: list[Invocation],
+    expected: Optional[list[Invocation]],
+) -> tuple[bool, dict[str, Optional[float]]]:
+    """Scores a run; it passes if a metric passed and none failed."""
+    scores: dict[str, Optional[float]] = {}
+    statuses = []
+    for metric in metrics:
+        evaluator = DEFAULT_METRIC_EVALUATOR_REGISTRY.get_evaluator(metric)
+        try:
+            result = evaluator.evaluate_invocations(
+                actual_invocations=actual, expected_invocations=expected
+            )
+            if inspect.isawaitable(result):
+                # judge-model metrics are async
+                result = await result
+        except Exception:
+            logger.exception("Could not score %s", metric.metric_name)
+            scores[metric.metric_name] = None
+            continue
+        scores[metric.metric_name] = result.overall_score
+        statuses.append(result.overall_eval_status)
+    passed = EvalStatus.PASSED in statuses and EvalStatus.FAILED not in statuses
+    return passed, scores
+
+
+async def run_evals(
+    agent: BaseAgent,
+    eval_sets: list[EvalSet | str | Path],
+    workers: int = eval_workers,
+    config: EvalConfig | dict = eval_config,
+    cache: str | Path | None = eval_cache_path,
+    rerun: bool = False,
+    plugins: Optional[list[BasePlugin]] = None,
+) -> EvalReport:
+    """Runs every case of `eval_sets`, skipping those that passed unchanged.
+
+    Args:
+        agent: The agent under evaluation.
+        eval_sets: Eval sets, or paths to `.evalset.json` files.
+        workers: How many cases may run at once.
+        config: The criteria to score against, as in a `test_config.json`.
+        cache: JSON file of passing results, keyed by eval set and case.
+            None turns caching off.
+        rerun: Run every case, even those the cache says passed unchanged.
+        plugins: Extra plugins for every run, such as a `CassettePlugin`.
+
+    Returns:
+        Each case's status, scores and time, and per-agent timings.
+    """
+    eval_sets = [
+        load_eval_set(eval_set) if isinstance(eval_set, (str, Path)) else eval_set
+        for eval_set in eval_sets
+    ]
+    config = EvalConfig.model_validate(config)
+    metrics = get_eval_metrics_from_config(config)
+    user_simulators = UserSimulatorProvider(config.user_simulator_config)
+    metrics_plugin = MetricsPlugin(name="toddle_ops_eval_metrics")
+    plugins = [metrics_plugin, *(plugins or [])]
+
+    graph = graph_hash(agent)
+    cache_path = Path(cache) if cache else None
+    passing = _load_cache(cache_path) if cache_path else {}
+    report = EvalReport(graph_hash=graph, workers=workers)
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run_one(eval_set_id: str, case: EvalCase) -> CaseResult:
+        entry_id = f"{eval_set_id}/{case.eval_id}"
+        key = case_key(graph, eval_set_id, case, config)
+        cached = passing.get(entry_id)
+        if not rerun and cached and cached["key"] == key:
+            report.saved_seconds += cached["seconds"]
+            return CaseResult(
+                eval_set_id=eval_set_id,
+                eval_id=case.eval_id,
+                status="skipped",
+                scores=cached["scores"],
+            )
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                actual = await _infer(agent, case, plugins, user_simulators)
+                passed, scores = await _score(metrics, actual, case.conversation)
+            except Exception as error:
+                logger.exception("Eval case %s failed to run", entry_id)
+                passing.pop(entry_id, None)
+                return CaseResult(
+                    eval_set_id=eval_set_id,
+                    eval_id=case.eval_id,
+                    status="error",
+                    seconds=time.perf_counter() - start,
+                    error=str(error),
+                )
+            seconds = time.perf_counter() - start
+        if passed:
+            passing[entry_id] = {"key": key, "seconds": seconds, "scores": scores}
+        else:
+            passing.pop(entry_id, None)
+        return CaseResult(
+            eval_set_id=eval_set_id,
+            eval_id=case.eval_id,
+            status="passed" if passed else "failed",
+            seconds=seconds,
+            scores=scores,
+        )
+
+    start = time.perf_counter()
+    try:
+        report.cases = await asyncio.gather(
+            *(
+                run_one(eval_set.eval_set_id, case)
+                for eval_set in eval_sets
+                for case in eval_set.eval_cases
+            )
+        )
+    finally:
+        if cache_path:
+            _save_cache(cache_path, passing)
+    report.seconds = time.perf_counter() - start
+    report.agents = metrics_plugin.snapshot()["agent_seconds"]
+    return report
+
+
+def print_report(report: EvalReport):
+    """Prints a table of cases and agents, then the sweep's totals."""
+    print(f"{'case':<48} {'status':<8} {'seconds':>8}  scores")
+    for case in report.cases:
+        scores = ", ".join(
+            f"{name}={'-' if score is None else f'{score:.2f}'}"
+            for name, score in case.scores.items()
+        )
+        name = f"{case.eval_set_id}/{case.eval_id}"
+        print(f"{name:<48} {case.status:<8} {case.seconds:>8.2f}  {scores}")
+    if report.agents:
+        print(f"\n{'agent':<28} {'runs':>6} {'p50':>8} {'p95':>8} {'total':>9}")
+        agents = sorted(report.agents.items(), key=lambda item: -item[1]["sum"])
+        for agent, summary in agents:
+            print(
+                f"{agent:<28} {summary['count']:>6.0f} {summary['p50']:>7.2f}s "
+                f"{summary['p95']:>7.2f}s {summary['sum']:>8.2f}s"
+            )
+    print(
+        f"\n{report.count('passed')} passed, {report.count('failed')} failed, "
+        f"{report.count('error')} errors, {report.count('skipped')} skipped "
+        f"in {report.seconds:.1f}s with {report.workers} workers "
+        f"({report.saved_seconds:.1f}s saved by the cache)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("agent", help="Module with a `root_agent`.")
+    parser.add_argument("eval_sets", nargs="+", type=Path)
+    parser.add_argument("--workers", type=int, default=eval_workers)
+    parser.add_argument(
+        "--config", type=Path, help="A test_config.json; default: eval_config."
+    )
+    parser.add_argument("--cache", type=Path, default=Path(eval_cache_path))
+    parser.add_argument("--report", type=Path, default=Path(REPORT_FILE))
+    parser.add_argument(
+        "--rerun", action="store_true", help="Run cases the cache would skip."
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    agent = importlib.import_module(args.agent).root_agent
+    config = (
+        EvalConfig.model_validate_json(args.config.read_text())
+        if args.config
+        else eval_config
+    )
+    plugins = (
+        [CassettePlugin(cassette_path, mode=cassette_mode)] if cassette_mode else []
+    )
+    report = asyncio.run(
+        run_evals(
+            agent,
+            args.eval_sets,
+            workers=args.workers,
+            config=config,
+            cache=args.cache,
+            rerun=args.rerun,
+            plugins=plugins,
+        )
+    )
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(report.model_dump_json(indent=2))
+    print_report(report)
+    print(f"report written to {args.report}")
+    if report.count("failed") or report.count("error"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
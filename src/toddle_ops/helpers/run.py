@@ -1,7 +1,15 @@
+import logging
+from typing import Optional
+
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+from toddle_ops.helpers.stream import ProjectRenderer, stream_text
+from toddle_ops.models.projects import Project, parse_project
+
+logger = logging.getLogger(__name__)
+
 
 async def run_session(
     runner_instance: Runner,
@@ -11,6 +19,7 @@ async def run_session(
     app_name: str = "default",
     user_id: str = "default",
     model_name: str = "gemini-2.5-flash-lite",
+    stream: bool = False,
 ):
     print(f"\n ### Session: {session_name}")
 
@@ -40,6 +49,17 @@ async def run_session(
             # Convert the query string to the ADK Content format
             query = types.Content(role="user", parts=[types.Part(text=query)])
 
+            # Render the final agent's output as it is generated
+            if stream:
+                renderer = ProjectRenderer()
+                print(f"{model_name} > ", end="", flush=True)
+                async for chunk in stream_text(
+                    runner_instance, user_id, session.id, query
+                ):
+                    print(renderer.feed(chunk), end="", flush=True)
+                print()
+                continue
+
             # Stream the agent's response asynchronously
             async for event in runner_instance.run_async(
                 user_id=user_id, session_id=session.id, new_message=query
@@ -54,3 +74,55 @@ async def run_session(
                         print(f"{model_name} > ", event.content.parts[0].text)
     else:
         print("No queries!")
+
+
+def approved_project(state: dict) -> Optional[Project]:
+    """Returns the pipeline's project from `state` if QA approved it."""
+    report = state.get("safety_report")
+    if not isinstance(report, dict) or report.get("status") != "APPROVED":
+        return None
+    try:
+        return parse_project(state.get("standard_project"))
+    except ValueError as exc:
+        logger.info("Pipeline produced no usable project: %s", exc)
+        return None
+
+
+async def generate_project(
+    runner: Runner,
+    prompt: str,
+    user_id: str = "default",
+    state: Optional[dict] = None,
+) -> Optional[Project]:
+    """Runs the generation pipeline for one prompt in a fresh session.
+
+    The session is deleted once its state has been read.
+
+    Args:
+        runner: Runs the research + QA pipeline.
+        prompt: The project request.
+        user_id: The user the session belongs to.
+        state: Initial session state.
+
+    Returns:
+        The QA-approved project, or None if QA rejected it or the pipeline
+        produced no usable project.
+    """
+    sessions = runner.session_service
+    session = await sessions.create_session(
+        app_name=runner.app_name, user_id=user_id, state=state
+    )
+    try:
+        message = types.Content(role="user", parts=[types.Part(text=prompt)])
+        async for _ in runner.run_async(
+            user_id=user_id, session_id=session.id, new_message=message
+        ):
+            pass
+        session = await sessions.get_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session.id
+        )
+        return approved_project(session.state)
+    finally:
+        await sessions.delete_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session.id
+        )
@@ -0,0 +1,221 @@
+"""Token-level streaming of the finished project.
+
+`run_session` prints whole events, so nothing appears until the
+`EditorialAgent` has written the entire project. `stream_text` runs with
+ADK's SSE streaming mode instead and yields the final agent's text as the
+model produces it. `ProjectRenderer` turns that partial JSON into readable
+project fields as they arrive, and `stream_project` prints them.
+
+Streaming has to run the pipeline agent itself: an `AgentTool` (as used by
+the root agent) only returns the tool's final result to its caller.
+"""
+
+import json
+import re
+import sys
+from typing import AsyncIterator, Iterable, Optional, TextIO
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.runners import Runner
+from google.genai import types
+
+# the agents whose text is the user-facing project: the editor, and the
+# cached pipeline when it serves a stored project
+STREAM_AUTHORS = frozenset({"EditorialAgent", "ToddleOpsSequence"})
+
+# rendered fields in display order, with their labels
+PROJECT_FIELDS = {
+    "name": "",
+    "description": "",
+    "difficulty": "Difficulty",
+    "duration_minutes": "Duration (minutes)",
+    "materials": "Materials",
+    "instructions": "Instructions",
+}
+
+_KEY = re.compile(r'"(\w+)"\s*:\s*')
+_BARE_VALUE = re.compile(r"[^,}\s]*")
+_OPEN_FENCE = re.compile(r"^\s*```(?:json)?\s*")
+
+
+def _text(event) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text for part in event.content.parts if part.text)
+
+
+async def stream_text(
+    runner: Runner,
+    user_id: str,
+    session_id: str,
+    message: str | types.Content,
+    authors: Iterable[str] = STREAM_AUTHORS,
+) -> AsyncIterator[str]:
+    """Runs one turn with SSE streaming and yields the final agent's text.
+
+    Partial events from `authors` are yielded as they arrive. The complete
+    event that closes a streamed response is skipped, since its text was
+    already yielded; an author that did not stream (a cache hit, or a
+    model that ignores SSE) is yielded whole.
+
+    Args:
+        runner: Runs the pipeline agent.
+        user_id: The user the session belongs to.
+        session_id: An existing session.
+        message: The user's request.
+        authors: Names of the agents whose text to yield.
+
+    Yields:
+        Chunks of text, in order.
+    """
+    if isinstance(message, str):
+        message = types.Content(role="user", parts=[types.Part(text=message)])
+    authors = set(authors)
+    streaming = set()
+    async for event in runner.run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=message,
+        run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+    ):
+        if event.author not in authors:
+            continue
+        text = _text(event)
+        if event.partial:
+            streaming.add(event.author)
+            if text:
+                yield text
+        elif event.author in streaming:
+            streaming.discard(event.author)
+        elif text:
+            yield text
+
+
+def _unescape(raw: str) -> str:
+    """Decodes a possibly truncated JSON string body."""
+    # drop an escape sequence cut off by the end of the chunk
+    if (len(raw) - len(raw.rstrip("\\"))) % 2:
+        raw = raw[:-1]
+    raw = re.sub(r"(?<!\\)((?:\\\\)*)\\u[0-9a-fA-F]{0,3}$", r"\1", raw)
+    try:
+        return json.loads(f'"{raw}"')
+    except json.JSONDecodeError:
+        return raw
+
+
+def _string_end(text: str, start: int) -> Optional[int]:
+    """Index of the quote closing the string that starts at `start`."""
+    escaped = False
+    for position in range(start, len(text)):
+        char = text[position]
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"':
+            return position
+    return None
+
+
+def partial_fields(text: str) -> dict[str, tuple[str, bool]]:
+    """Reads the top-level fields of a JSON object that may be incomplete.
+
+    Args:
+        text: The start of a JSON object.
+
+    Returns:
+        The value of each field seen so far, and whether it is complete.
+        Strings are included as they grow; other values once complete.
+    """
+    fields = {}
+    position = 0
+    while match := _KEY.search(text, position):
+        key, start = match.group(1), match.end()
+        if start >= len(text):
+            break
+        if text[start] == '"':
+            end = _string_end(text, start + 1)
+            raw = text[start + 1 : len(text) if end is None else end]
+            fields[key] = (_unescape(raw), end is not None)
+            if end is None:
+                break
+            position = end + 1
+        else:
+            value = _BARE_VALUE.match(text, start)
+            if value.end() == len(text):
+                # a number may still be growing
+                break
+            fields[key] = (value.group(), True)
+            position = value.end()
+    return fields
+
+
+class ProjectRenderer:
+    """Turns streamed project JSON into readable text, field by field.
+
+    Each `feed` returns only the text not rendered before, so its results
+    can be written straight to a terminal. Output that is not a JSON
+    object (say, a model that answered in prose) is passed through.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._json: Optional[bool] = None
+        self._shown: dict[str, int] = {}
+        self._passed = 0
+
+    def feed(self, chunk: str) -> str:
+        """Adds a chunk of model output and returns what to print."""
+        self.buffer += chunk
+        body = _OPEN_FENCE.sub("", self.buffer, count=1)
+        if self._json is None:
+            if not body.strip() or "```json".startswith(self.buffer.lstrip()):
+                # could still be the start of a fence
+                return ""
+            self._json = body.lstrip().startswith("{")
+        if not self._json:
+            out = self.buffer[self._passed :]
+            self._passed = len(self.buffer)
+            return out
+
+        out = []
+        for key, (value, _) in partial_fields(body).items():
+            if key not in PROJECT_FIELDS:
+                continue
+            shown = self._shown.get(key)
+            if shown is None:
+                label = PROJECT_FIELDS[key]
+                out.append(
+                    ("\n\n" if self._shown else "") + (f"{label}: " if label else "")
+                )
+                shown = 0
+            out.append(value[shown:])
+            self._shown[key] = len(value)
+        return "".join(out)
+
+
+async def stream_project(
+    runner: Runner,
+    user_id: str,
+    session_id: str,
+    message: str | types.Content,
+    out: TextIO = sys.stdout,
+) -> str:
+    """Streams the project for one request to `out` as it is written.
+
+    Args:
+        runner: Runs the pipeline agent.
+        user_id: The user the session belongs to.
+        session_id: An existing session.
+        message: The user's request.
+        out: Where to render the project.
+
+    Returns:
+        The final agent's complete text.
+    """
+    renderer = ProjectRenderer()
+    async for chunk in stream_text(runner, user_id, session_id, message):
+        out.write(renderer.feed(chunk))
+        out.flush()
+    out.write("\n")
+    return renderer.buffer
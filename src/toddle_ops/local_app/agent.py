@@ -4,7 +4,14 @@ from dotenv import load_dotenv
 from google.adk.apps.app import App
 
 from toddle_ops.agents.root_agent.agent import root_agent
-from toddle_ops.config.basic import events_compaction_config
+from toddle_ops.config.basic import (
+    cassette_mode,
+    cassette_path,
+    events_compaction_config,
+    metrics_otel_spans,
+)
+from toddle_ops.services.cassette import CassettePlugin
+from toddle_ops.services.metrics import MetricsPlugin
 from google.adk.plugins.logging_plugin import LoggingPlugin
 
 # Load environment variables from .env
@@ -20,9 +27,19 @@ SESSION = "default"  # Session
 
 MODEL_NAME = "gemini-2.5-flash-lite"
 
+# per-agent latency, token and cost metrics; export with
+# `metrics_plugin.to_json()` or `metrics_plugin.to_prometheus()`
+metrics_plugin = MetricsPlugin(spans=metrics_otel_spans)
+
+# record or replay model and tool calls when TODDLE_OPS_CASSETTE_MODE is set;
+# last, so the plugins before it still see replayed requests
+cassette_plugins = (
+    [CassettePlugin(cassette_path, mode=cassette_mode)] if cassette_mode else []
+)
+
 adk_app = App(
     name=APP_NAME,
     root_agent=root_agent,
     events_compaction_config=events_compaction_config,
-    plugins=[LoggingPlugin()],
+    plugins=[LoggingPlugin(), metrics_plugin, *cassette_plugins],
 )
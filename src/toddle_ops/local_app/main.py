@@ -1,11 +1,14 @@
 from dotenv import load_dotenv
 import asyncio
 import logging
+import sys
 from google.adk.runners import Runner
 
 from toddle_ops.services.sessions import session_service
 from toddle_ops.services.memory import memory_service
-from toddle_ops.local_app.agent import adk_app
+from toddle_ops.local_app.agent import adk_app, cassette_plugins, metrics_plugin
+from toddle_ops.agents.root_agent.agent import cached_pipeline, project_pool
+from toddle_ops.helpers.stream import stream_project
 
 load_dotenv()
 
@@ -33,5 +36,40 @@ async def main():
         print(f"An error occurred during toddle ops execution: {e}")
 
 
+# `--stream` runs the pipeline directly so the project is printed as the
+# editor writes it; through the root agent's tool it only arrives whole
+stream_runner = Runner(
+    app_name=APP_NAME,
+    agent=cached_pipeline,
+    session_service=session_service,
+    memory_service=memory_service,
+    plugins=[metrics_plugin, *cassette_plugins],
+)
+
+
+async def stream_main():
+    try:
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id="default"
+        )
+        await stream_project(
+            stream_runner, "default", session.id, "Please provide a project."
+        )
+    except Exception as e:
+        print(f"An error occurred during toddle ops execution: {e}")
+
+
+async def serve(app_main):
+    """Runs `app_main` with the project pool filling in the background."""
+    # start pre-generating now rather than on the first request's take
+    if project_pool is not None:
+        project_pool.start()
+    try:
+        await app_main
+    finally:
+        if project_pool is not None:
+            await project_pool.stop()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(serve(stream_main() if "--stream" in sys.argv else main()))
@@ -0,0 +1,205 @@
+"""In-process replacement for the `mcp-server-sqlite` toolset.
+
+Exposes the same tools as the MCP server (read_query, write_query,
+create_table, list_tables and describe_table) as plain function tools over
+one `aiosqlite` connection, running one statement's transaction at a time,
+so agents skip the `uvx` launch, the extra interpreter and JSON-RPC
+framing on every query.
+"""
+
+import asyncio
+import sqlite3
+import weakref
+from pathlib import Path
+from typing import Optional
+
+import aiosqlite
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools import FunctionTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+
+from toddle_ops.agents.project_database_team.connection import DEFAULT_PRAGMAS
+
+
+class _LoopState:
+    """A toolset's connection and locks for one event loop."""
+
+    def __init__(self):
+        self.conn: Optional[aiosqlite.Connection] = None
+        self.lock = asyncio.Lock()
+        # one transaction at a time on the shared connection, so a failing
+        # query's rollback can't discard another call's uncommitted write
+        self.transaction = asyncio.Lock()
+
+
+class LocalSqliteToolset(BaseToolset):
+    """SQL tools for agents, run directly against a local SQLite file.
+
+    Errors are returned to the model as `{"error": ...}` rather than raised,
+    as the MCP server does, so it can correct its query and retry.
+
+    The connection and locks are made per event loop, since both are bound
+    to the loop they were first used on; a module-level toolset can then
+    serve several `asyncio.run` calls.
+    """
+
+    def __init__(self, db_path: str | Path, **kwargs):
+        """
+        Args:
+            db_path: The SQLite database file; created on first use.
+            **kwargs: `tool_filter` / `tool_name_prefix`, see `BaseToolset`.
+        """
+        super().__init__(**kwargs)
+        self.db_path = Path(db_path)
+        self._loops: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, _LoopState
+        ] = weakref.WeakKeyDictionary()
+        self._tools = [
+            FunctionTool(self.read_query),
+            FunctionTool(self.write_query),
+            FunctionTool(self.create_table),
+            FunctionTool(self.list_tables),
+            FunctionTool(self.describe_table),
+        ]
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = self._loops[loop] = _LoopState()
+        return state
+
+    async def _connection(self) -> aiosqlite.Connection:
+        state = self._loop_state()
+        async with state.lock:
+            if state.conn is None:
+                conn = aiosqlite.connect(self.db_path)
+                # never keep the interpreter alive just for this worker thread
+                conn.daemon = True
+                await conn
+                conn.row_factory = aiosqlite.Row
+                for pragma, value in DEFAULT_PRAGMAS.items():
+                    await conn.execute(f"PRAGMA {pragma} = {value}")
+                state.conn = conn
+            return state.conn
+
+    async def _execute(self, query: str, params: tuple = ()) -> tuple[list[dict], int]:
+        """Runs one statement and commits, returning the rows and row count."""
+        conn = await self._connection()
+        async with self._loop_state().transaction:
+            try:
+                async with conn.execute(query, params) as cursor:
+                    rows = await cursor.fetchall()
+                    affected = cursor.rowcount
+                await conn.commit()
+            except sqlite3.Error:
+                await conn.rollback()
+                raise
+        return [dict(row) for row in rows], affected
+
+    async def read_query(self, query: str) -> list[dict] | dict:
+        """
+        Execute a SELECT query on the SQLite database.
+
+        Args:
+            query: SELECT SQL query to execute.
+
+        Returns:
+            The result rows.
+        """
+        if not query.strip().upper().startswith("SELECT"):
+            return {"error": "Only SELECT queries are allowed for read_query"}
+        try:
+            rows, _ = await self._execute(query)
+        except sqlite3.Error as exc:
+            return {"error": f"Database error: {exc}"}
+        return rows
+
+    async def write_query(self, query: str) -> list[dict] | dict:
+        """
+        Execute an INSERT, UPDATE, or DELETE query on the SQLite database.
+
+        Args:
+            query: SQL query to execute.
+
+        Returns:
+            The number of affected rows.
+        """
+        if query.strip().upper().startswith("SELECT"):
+            return {"error": "SELECT queries are not allowed for write_query"}
+        try:
+            _, affected = await self._execute(query)
+        except sqlite3.Error as exc:
+            return {"error": f"Database error: {exc}"}
+        return [{"affected_rows": affected}]
+
+    async def create_table(self, query: str) -> str | dict:
+        """
+        Create a new table in the SQLite database.
+
+        Args:
+            query: CREATE TABLE SQL statement.
+
+        Returns:
+            A confirmation message.
+        """
+        if not query.strip().upper().startswith("CREATE TABLE"):
+            return {"error": "Only CREATE TABLE statements are allowed"}
+        try:
+            await self._execute(query)
+        except sqlite3.Error as exc:
+            return {"error": f"Database error: {exc}"}
+        return "Table created successfully"
+
+    async def list_tables(self) -> list[dict] | dict:
+        """
+        List all tables in the SQLite database.
+
+        Returns:
+            One row per table, with its name.
+        """
+        try:
+            rows, _ = await self._execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"
+            )
+        except sqlite3.Error as exc:
+            return {"error": f"Database error: {exc}"}
+        return rows
+
+    async def describe_table(self, table_name: str) -> list[dict] | dict:
+        """
+        Get the schema information for a specific table.
+
+        Args:
+            table_name: Name of the table to describe.
+
+        Returns:
+            One row per column: cid, name, type, notnull, dflt_value and pk.
+        """
+        try:
+            rows, _ = await self._execute(
+                "SELECT * FROM pragma_table_info(?)", (table_name,)
+            )
+        except sqlite3.Error as exc:
+            return {"error": f"Database error: {exc}"}
+        if not rows:
+            return {"error": f"Table {table_name!r} does not exist"}
+        return rows
+
+    async def get_tools(
+        self, readonly_context: Optional[ReadonlyContext] = None
+    ) -> list[BaseTool]:
+        return [
+            tool
+            for tool in self._tools
+            if self._is_tool_selected(tool, readonly_context)
+        ]
+
+    async def close(self) -> None:
+        """Closes this event loop's connection; it reopens on the next query."""
+        state = self._loop_state()
+        async with state.lock:
+            if state.conn is not None:
+                await state.conn.close()
+                state.conn = None
@@ -1,13 +1,38 @@
-from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+from google.adk.tools.base_toolset import BaseToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
+from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
 from mcp import StdioServerParameters
 
-mcp_sqlite_server = McpToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command="uvx",  # Run MCP server via npx
-            args=["mcp-server-sqlite", "--db-path", "projects-data.db"],
-        ),
-        timeout=30,
-    )
-)
+from toddle_ops.config.basic import sql_toolset, sqlite_db_path
+from toddle_ops.mcp.local_sqlite import LocalSqliteToolset
+
+
+def make_sqlite_toolset(
+    transport: str = sql_toolset, db_path: str = sqlite_db_path
+) -> BaseToolset:
+    """Builds the SQL toolset for the database agent.
+
+    Args:
+        transport: "local" for the in-process toolset or "mcp" for the
+            `mcp-server-sqlite` subprocess. Both expose the same tools.
+        db_path: The SQLite database file.
+
+    Returns:
+        The toolset.
+    """
+    if transport == "local":
+        return LocalSqliteToolset(db_path)
+    if transport == "mcp":
+        return McpToolset(
+            connection_params=StdioConnectionParams(
+                server_params=StdioServerParameters(
+                    command="uvx",  # Run MCP server via npx
+                    args=["mcp-server-sqlite", "--db-path", db_path],
+                ),
+                timeout=30,
+            )
+        )
+    raise ValueError(f"Unknown SQL toolset {transport!r}; expected 'local' or 'mcp'.")
+
+
+mcp_sqlite_server = make_sqlite_toolset()
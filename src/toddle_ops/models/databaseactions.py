@@ -1,10 +1,32 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from google.adk.tools.tool_context import ToolContext
 
 from toddle_ops.models.enums import Status
 
 
 class DatabaseAction(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     status: Status
     summary: str
     tool_context: ToolContext
+
+
+class BulkWriteResult(BaseModel):
+    """The outcome of a bulk insert or upsert of projects."""
+
+    inserted: int = Field(0, description="Number of new projects written.")
+    updated: int = Field(0, description="Number of existing projects overwritten.")
+    conflicts: list[str] = Field(
+        default_factory=list,
+        description="IDs of projects that already existed in the database.",
+    )
+
+
+class ImportResult(BulkWriteResult):
+    """The outcome of importing projects from an NDJSON file."""
+
+    invalid: list[int] = Field(
+        default_factory=list,
+        description="Line numbers that failed validation and were skipped.",
+    )
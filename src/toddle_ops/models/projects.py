@@ -1,3 +1,5 @@
+import json
+import re
 from enum import Enum
 from typing import List
 
@@ -45,6 +47,48 @@ class Project(BaseModel):
     )
 
 
+class CatalogEntry(Project):
+    """A project with the catalog flags stored alongside it, as exported."""
+
+    qa_approved: bool = Field(
+        False, description="Whether the project passed quality assurance."
+    )
+    duplicate_of: str | None = Field(
+        None, description="The project this one is a near-duplicate of."
+    )
+
+
+_CODE_FENCE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+
+
+def parse_project(value: Project | dict | str) -> Project:
+    """Builds a `Project` from an agent's output as stored in session state.
+
+    Agents with `output_schema=Project` store a dict; free-text agents store
+    a string, which must be the project as JSON (a ```json fence is fine).
+
+    Args:
+        value: A `Project`, a dict of its fields or a JSON string.
+
+    Returns:
+        The validated project.
+
+    Raises:
+        ValueError: If `value` is not a valid project (pydantic's
+            `ValidationError` is a `ValueError`).
+    """
+    if isinstance(value, Project):
+        return value
+    if isinstance(value, str):
+        fenced = _CODE_FENCE.match(value)
+        try:
+            value = json.loads(fenced.group(1) if fenced else value)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Project is not valid JSON: {exc}") from None
+    # anything but a dict (None, a list, a number) fails validation too
+    return Project.model_validate(value)
+
+
 class SafetyStatus(str, Enum):
     """The safety status of a project."""
 
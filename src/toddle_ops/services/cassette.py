@@ -0,0 +1,394 @@
+"""Record and replay model and tool calls through a cassette file.
+
+`CassettePlugin` keys every model request and tool call on a hash of its
+content. In "record" mode the real calls run and their responses are
+written to the cassette; in "replay" mode responses come from the
+cassette and nothing is sent to the model or run as a tool, so evals and
+notebooks replay in seconds and give the same answers every time. "auto"
+replays what the cassette has and records the rest.
+
+The cassette is JSON lines, one interaction per line, gzip-compressed
+when the file name ends in ".gz". Requests that repeat within a run are
+replayed in the order they were recorded.
+
+A model request's key covers the agent, the model, the whole prompt
+(contents, system instruction, tools and response schema), but not the
+random ids ADK gives function calls, and UUIDs generated during the run
+(a new project's `project_id`) are pinned to placeholders. Other agents'
+messages are keyed in author order, since parallel branches deliver them
+in whatever order they finish. Anything else
+that changes the prompt, such as an edited instruction or recalled
+memories, needs a new recording. Responses an agent's own
+`before_model_callback` serves (the research cache) never reach the
+model, so record with an empty research cache.
+
+A call is only recorded once its event reaches the runner, so
+researchers the hedged research team cancels leave nothing behind, even
+if their model call had already returned. In "replay" mode they find no
+recording and fail straight away, and the team carries on with the ones
+that finished, as it did while recording.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Literal, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from pydantic import BaseModel
+from pydantic_core import PydanticSerializationError, to_jsonable_python
+
+logger = logging.getLogger(__name__)
+
+Mode = Literal["record", "replay", "auto"]
+MODES = ("record", "replay", "auto")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode for a call the cassette has no recording of."""
+
+
+# UUIDs generated afresh on every run, such as the project_id a new Project
+# gets before `{standard_project}` puts it in the editor's instruction
+_GENERATED_ID = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+# ADK prefixes other agents' messages with "[AgentName] said: ..."
+_CONTEXT_AUTHOR = re.compile(r"\[([^\]]+)\]")
+
+
+def _digest(payload: Any) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    # pin each distinct ID to its order of appearance, so requests that differ
+    # only in generated IDs share a key but two different IDs stay distinct
+    pinned: dict[str, str] = {}
+    canonical = _GENERATED_ID.sub(
+        lambda match: pinned.setdefault(match.group(), f"<id-{len(pinned)}>"),
+        canonical,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def _content(content) -> dict:
+    """A content's JSON, without the per-run ids ADK gives function calls."""
+    data = content.model_dump(mode="json", exclude_none=True)
+    for part in data.get("parts", []):
+        for field in ("function_call", "function_response"):
+            if field in part:
+                part[field].pop("id", None)
+    return data
+
+
+def _context_author(content: dict) -> Optional[str]:
+    """The agent behind ADK's "For context:" message, or None for others."""
+    texts = [part.get("text", "") for part in content.get("parts", [])]
+    if content.get("role") != "user" or texts[:1] != ["For context:"]:
+        return None
+    match = _CONTEXT_AUTHOR.match(texts[1] if len(texts) > 1 else "")
+    return match.group(1) if match else ""
+
+
+def _contents(contents) -> list[dict]:
+    """Contents' JSON, with parallel branches' context in a fixed order.
+
+    Other agents' messages reach a model as "For context:" contents in the
+    order their events arrived, which for parallel branches (the research
+    team) is whichever finished first. Each run of them is keyed in author
+    order, keeping each author's own messages in sequence.
+    """
+    keyed, run = [], []
+    for content in map(_content, contents):
+        if _context_author(content) is not None:
+            run.append(content)
+            continue
+        keyed += sorted(run, key=_context_author)
+        run = []
+        keyed.append(content)
+    return keyed + sorted(run, key=_context_author)
+
+
+def _schema(value: Any) -> Any:
+    if isinstance(value, type) and issubclass(value, BaseModel):
+        return value.model_json_schema()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True)
+    return value
+
+
+def model_key(agent_name: str, llm_request: LlmRequest) -> str:
+    """Hashes everything a model response depends on."""
+    config = llm_request.config
+    payload = {
+        "agent": agent_name,
+        "model": llm_request.model,
+        "contents": _contents(llm_request.contents),
+    }
+    if config is not None:
+        # transport settings (retries, headers) don't change the answer
+        payload["config"] = config.model_dump(
+            mode="json",
+            exclude_none=True,
+            exclude={"http_options", "response_schema", "response_json_schema"},
+        )
+        payload["schema"] = _schema(
+            config.response_schema or config.response_json_schema
+        )
+    return _digest(payload)
+
+
+def tool_key(tool_name: str, args: dict[str, Any]) -> str:
+    """Hashes a tool call on the tool's name and arguments."""
+    return _digest({"tool": tool_name, "args": to_jsonable_python(args)})
+
+
+class Cassette:
+    """Recorded interactions, kept in memory and appended to `path`."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[dict]] = {}
+        self._played: dict[str, int] = {}
+        if self.path.exists():
+            with self._open("rt") as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["key"], []).append(entry)
+
+    def _open(self, mode: str):
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def play(self, key: str) -> Optional[dict]:
+        """Returns the next recording for `key`; the last one repeats."""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            position = self._played.get(key, 0)
+            self._played[key] = position + 1
+            return entries[min(position, len(entries) - 1)]
+
+    def record(self, key: str, kind: str, name: str, response: Any, seconds: float):
+        """Stores a response and appends it to the cassette file."""
+        entry = {
+            "key": key,
+            "kind": kind,
+            "name": name,
+            "seconds": round(seconds, 3),
+            "response": response,
+        }
+        with self._lock:
+            self._entries.setdefault(key, []).append(entry)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._open("at") as file:
+                file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+class CassettePlugin(BasePlugin):
+    """Records model and tool calls to a cassette, or replays them from it.
+
+    Install it on the `App` (or `Runner`) last, so logging and metrics
+    plugins still see each request. Calls through an `AgentTool` are not
+    recorded themselves; the model and tool calls inside them are.
+
+    Args:
+        path: The cassette file.
+        mode: "record" starts a fresh cassette, "replay" only replays and
+            raises `CassetteMiss` for anything unrecorded (ADK re-raises
+            it as a RuntimeError), and "auto" replays what it can and
+            records the rest.
+        latency_scale: Replayed calls wait their recorded duration times
+            this; 0 replays instantly.
+        exclude_tools: Names of tools that always run for real, such as
+            tools that change session state through their `ToolContext`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: Mode = "replay",
+        latency_scale: float = 0.0,
+        exclude_tools: Iterable[str] = (),
+        name: str = "toddle_ops_cassette",
+    ):
+        super().__init__(name=name)
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; use one of {MODES}")
+        path = Path(path)
+        if mode == "record":
+            path.unlink(missing_ok=True)
+        self.cassette = Cassette(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.exclude_tools = set(exclude_tools)
+        self._pending: dict[tuple, tuple[str, float]] = {}
+        self._staged: dict[tuple, tuple[str, str, str, Any, float]] = {}
+        self.replayed = 0
+        self.recorded = 0
+
+    async def _replay(self, key: str, what: str) -> Optional[dict]:
+        if self.mode == "record":
+            return None
+        entry = self.cassette.play(key)
+        if entry is None:
+            if self.mode == "replay":
+                raise CassetteMiss(
+                    f"{self.cassette.path} has no recording of {what} (key {key})"
+                )
+            return None
+        self.replayed += 1
+        if self.latency_scale:
+            await asyncio.sleep(entry["seconds"] * self.latency_scale)
+        return entry
+
+    def _stage(self, pending_key: tuple, kind: str, name: str, response: Any):
+        # held until the call's event reaches the runner; a branch the hedged
+        # research team cancels produced responses nothing consumed
+        pending = self._pending.pop(pending_key, None)
+        if pending is None:
+            return
+        key, start = pending
+        self._staged[pending_key] = (
+            key,
+            kind,
+            name,
+            response,
+            time.perf_counter() - start,
+        )
+
+    def _record(self, pending_key: tuple):
+        staged = self._staged.pop(pending_key, None)
+        if staged is not None:
+            self.cassette.record(*staged)
+            self.recorded += 1
+
+    async def on_event_callback(
+        self, *, invocation_context: InvocationContext, event: Event
+    ) -> None:
+        if event.partial:
+            return
+        self._record(("model", event.invocation_id, event.author))
+        for response in event.get_function_responses():
+            self._record(("tool", response.id or response.name))
+
+    async def after_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        # drop whatever cancelled branches left behind
+        invocation_id = invocation_context.invocation_id
+        for calls in (self._pending, self._staged):
+            for pending_key in [key for key in calls if invocation_id in key]:
+                del calls[pending_key]
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        agent = callback_context.agent_name
+        key = model_key(agent, llm_request)
+        entry = await self._replay(key, f"a model call from {agent}")
+        if entry is not None:
+            return LlmResponse.model_validate(entry["response"])
+        pending_key = ("model", callback_context.invocation_id, agent)
+        self._pending[pending_key] = (key, time.perf_counter())
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        if llm_response.partial:
+            # streamed chunks; the aggregated response follows
+            return None
+        pending_key = (
+            "model",
+            callback_context.invocation_id,
+            callback_context.agent_name,
+        )
+        if llm_response.error_code:
+            # a failed call is worth retrying, not replaying
+            self._pending.pop(pending_key, None)
+            return None
+        self._stage(
+            pending_key,
+            "model",
+            callback_context.agent_name,
+            llm_response.model_dump(mode="json", exclude_none=True),
+        )
+        return None
+
+    def _records(self, tool: BaseTool) -> bool:
+        return not isinstance(tool, AgentTool) and tool.name not in self.exclude_tools
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+    ) -> Optional[dict]:
+        if not self._records(tool):
+            return None
+        key = tool_key(tool.name, tool_args)
+        entry = await self._replay(key, f"a call to {tool.name}")
+        if entry is not None:
+            return entry["response"]
+        pending_key = ("tool", tool_context.function_call_id or tool.name)
+        self._pending[pending_key] = (key, time.perf_counter())
+        return None
+
+    async def after_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        result: dict,
+    ) -> None:
+        if not self._records(tool):
+            return None
+        pending_key = ("tool", tool_context.function_call_id or tool.name)
+        try:
+            response = to_jsonable_python(result)
+        except PydanticSerializationError:
+            logger.warning("Not recording %s: its result is not JSON", tool.name)
+            self._pending.pop(pending_key, None)
+            return None
+        self._stage(pending_key, "tool", tool.name, response)
+        return None
+
+    async def on_tool_error_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        error: Exception,
+    ) -> None:
+        self._pending.pop(("tool", tool_context.function_call_id or tool.name), None)
+
+    async def on_model_error_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception,
+    ) -> None:
+        self._pending.pop(
+            ("model", callback_context.invocation_id, callback_context.agent_name),
+            None,
+        )
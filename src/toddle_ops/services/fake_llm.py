@@ -0,0 +1,259 @@
+"""A deterministic stand-in for Gemini, for offline tests and benchmarks.
+
+`FakeGemini` answers each agent in the ToddleOps graph with a scripted,
+schema-valid response: researchers describe a project, the synthesizer
+and editor return `Project` JSON, the critic returns an APPROVED
+`SafetyReport`, and the root agent calls the `ToddleOpsSequence` tool and
+then reports its result. Every call can wait an artificial `latency`, so
+benchmarks can model a real API or measure the framework alone.
+
+`fake_models` swaps the fake into every `LlmAgent` under an agent,
+including agents behind an `AgentTool`, and restores the real models
+afterwards.
+"""
+
+import asyncio
+import json
+import random
+import re
+from contextlib import contextmanager
+from typing import AsyncGenerator, Callable, Iterator
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+from pydantic import Field, PrivateAttr, ValidationError
+
+from toddle_ops.models.projects import (
+    Difficulty,
+    Project,
+    SafetyReport,
+    SafetyStatus,
+)
+
+# ADK's identity instruction names the agent a request comes from
+_AGENT_NAME = re.compile(r'Your internal name is "([^"]+)"')
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+# a mix of projects the pre-screen passes outright and ones it leaves to
+# the critic, so benchmarks exercise both paths
+FAKE_PROJECTS = [
+    ("Crayon Rubbings", "crayons, paper", Difficulty.EASY, 15),
+    ("Sponge Stamps", "sponges, washable paint, paper", Difficulty.EASY, 20),
+    ("Pinecone Rolling", "pinecones, paint, paper plates", Difficulty.MEDIUM, 25),
+    ("Cardboard Tube Binoculars", "cardboard tubes, tape, stickers", Difficulty.MEDIUM, 30),
+    ("Leaf Collage", "leaves, glue stick, paper", Difficulty.HARD, 40),
+]  # fmt: skip
+
+Handler = Callable[[LlmRequest, int], list[types.Part]]
+
+
+def fake_project(call: int) -> Project:
+    """Returns one of `FAKE_PROJECTS`, chosen by `call`."""
+    name, materials, difficulty, minutes = FAKE_PROJECTS[call % len(FAKE_PROJECTS)]
+    return Project(
+        project_id=f"fake-{call}",
+        name=name,
+        description=f"A simple {difficulty.value} project for toddlers.",
+        difficulty=difficulty,
+        duration_minutes=minutes,
+        materials=materials,
+        instructions="Set out the materials. Show your toddler how. Let them play.",
+    )
+
+
+def _texts(llm_request: LlmRequest) -> list[str]:
+    return [
+        part.text
+        for content in llm_request.contents
+        for part in content.parts or []
+        if part.text
+    ]
+
+
+def _function_response(llm_request: LlmRequest):
+    if not llm_request.contents:
+        return None
+    for part in llm_request.contents[-1].parts or []:
+        if part.function_response:
+            return part.function_response
+    return None
+
+
+def _research(llm_request: LlmRequest, call: int) -> list[types.Part]:
+    project = fake_project(call)
+    return [
+        types.Part(
+            text=f"{project.name}: {project.description} Takes about "
+            f"{project.duration_minutes} minutes. Materials: "
+            f"{project.materials}. {project.instructions}"
+        )
+    ]
+
+
+def _synthesize(llm_request: LlmRequest, call: int) -> list[types.Part]:
+    return [types.Part(text=fake_project(call).model_dump_json())]
+
+
+def _edit(llm_request: LlmRequest, call: int) -> list[types.Part]:
+    # hand back the latest project in the conversation, as a careful editor
+    # with nothing to fix would
+    for text in reversed(_texts(llm_request)):
+        match = _JSON_OBJECT.search(text)
+        if match:
+            try:
+                project = Project.model_validate_json(match.group())
+            except ValidationError:
+                continue
+            return [types.Part(text=project.model_dump_json())]
+    return _synthesize(llm_request, call)
+
+
+def _critique(llm_request: LlmRequest, call: int) -> list[types.Part]:
+    report = SafetyReport(
+        status=SafetyStatus.APPROVED,
+        summary="Uses common household materials with adult supervision.",
+    )
+    return [types.Part(text=report.model_dump_json())]
+
+
+def _refine(llm_request: LlmRequest, call: int) -> list[types.Part]:
+    if _function_response(llm_request):
+        return [types.Part(text="Project approved.")]
+    return [types.Part(function_call=types.FunctionCall(name="exit_loop", args={}))]
+
+
+def _root(llm_request: LlmRequest, call: int) -> list[types.Part]:
+    response = _function_response(llm_request)
+    if response:
+        return [types.Part(text=json.dumps(response.response))]
+    request = next(
+        (
+            part.text
+            for content in reversed(llm_request.contents)
+            if content.role == "user"
+            for part in content.parts or []
+            if part.text
+        ),
+        "Please provide a project.",
+    )
+    return [
+        types.Part(
+            function_call=types.FunctionCall(
+                name="ToddleOpsSequence", args={"request": request}
+            )
+        )
+    ]
+
+
+def _default(llm_request: LlmRequest, call: int) -> list[types.Part]:
+    return [types.Part(text="OK.")]
+
+
+DEFAULT_SCRIPT: dict[str, Handler] = {
+    "ArtCraftResearcher": _research,
+    "ScienceCraftResearcher": _research,
+    "SillyCraftResearcher": _research,
+    "RandomCraftResearcher": _research,
+    "ProjectSynthesizer": _synthesize,
+    "SafetyCriticAgent": _critique,
+    "SafetyRefinerAgent": _refine,
+    "EditorialAgent": _edit,
+    "ToddleOpsRoot": _root,
+}
+
+
+class FakeGemini(BaseLlm):
+    """Answers from a script of per-agent handlers, after a fake latency.
+
+    The model name defaults to a Gemini one because ADK's built-in tools
+    (`google_search`) refuse other models; no request leaves the process.
+    Agents missing from `script` get a plain "OK.".
+    """
+
+    model: str = "gemini-2.5-flash-lite"
+    latency: float = Field(default=0.0, description="Seconds to wait per call.")
+    jitter: float = Field(default=0.0, description="Extra seconds, up to this.")
+    seed: int = 0
+    chunk_size: int = Field(default=24, description="Characters per SSE chunk.")
+    script: dict[str, Handler] = Field(default_factory=lambda: dict(DEFAULT_SCRIPT))
+    calls: int = 0
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, context):
+        self._rng = random.Random(self.seed)
+
+    @staticmethod
+    def agent_name(llm_request: LlmRequest) -> str:
+        """The name of the agent that sent `llm_request`, or ""."""
+        instruction = (
+            llm_request.config.system_instruction if llm_request.config else ""
+        )
+        match = _AGENT_NAME.search(instruction if isinstance(instruction, str) else "")
+        return match.group(1) if match else ""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        call = self.calls
+        self.calls += 1
+        handler = self.script.get(self.agent_name(llm_request), _default)
+        parts = handler(llm_request, call)
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        prompt = sum(len(text) for text in _texts(llm_request))
+        text = "".join(part.text for part in parts if part.text)
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt // 4 + 1,
+            candidates_token_count=len(text) // 4 + 1,
+        )
+        if stream and text:
+            for start in range(0, len(text), self.chunk_size):
+                chunk = text[start : start + self.chunk_size]
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                    partial=True,
+                )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=parts),
+            usage_metadata=usage,
+        )
+
+
+def _llm_agents(agent: BaseAgent, seen: set[int]) -> Iterator[LlmAgent]:
+    if id(agent) in seen:
+        return
+    seen.add(id(agent))
+    if isinstance(agent, LlmAgent):
+        yield agent
+        for tool in agent.tools:
+            if isinstance(tool, AgentTool):
+                yield from _llm_agents(tool.agent, seen)
+    for sub_agent in agent.sub_agents:
+        yield from _llm_agents(sub_agent, seen)
+
+
+@contextmanager
+def fake_models(agent: BaseAgent, llm: BaseLlm) -> Iterator[BaseLlm]:
+    """Points every `LlmAgent` under `agent` at `llm` while in the block.
+
+    Args:
+        agent: The root of the agent graph.
+        llm: The model to use, typically a `FakeGemini`.
+
+    Yields:
+        `llm`.
+    """
+    originals = [(sub, sub.model) for sub in _llm_agents(agent, set())]
+    for sub, _ in originals:
+        sub.model = llm
+    try:
+        yield llm
+    finally:
+        for sub, model in originals:
+            sub.model = model
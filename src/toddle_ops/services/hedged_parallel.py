@@ -0,0 +1,142 @@
+"""A parallel agent that stops waiting for slow branches.
+
+`ParallelAgent` only finishes when every sub-agent has, so one slow search
+or a 429 retry backing off for tens of seconds holds up the whole request.
+`HedgedParallelAgent` gives each branch a deadline and finishes as soon as
+`min_completed` branches have, cancelling the rest.
+"""
+
+import asyncio
+import logging
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from pydantic import Field
+
+logger = logging.getLogger(__name__)
+
+
+class HedgedParallelAgent(ParallelAgent):
+    """Runs sub-agents in parallel until the first `min_completed` finish.
+
+    A branch that raises or runs past `branch_timeout` just doesn't count
+    as completed; it never fails the whole agent. Each sub-agent's `output_key` is
+    cleared before the run, so a later agent never reads a cancelled
+    branch's result from a previous request; reference those keys as
+    optional (`{art_project?}`) in instructions.
+
+    The outcome of every branch ("completed", "timed_out", "failed" or
+    "cancelled") is written to the `outcomes_key` state key. If fewer than
+    `min_completed` branches complete, the final event carries an
+    `error_code` of "BRANCHES_INCOMPLETE".
+    """
+
+    branch_timeout: Optional[float] = Field(
+        None, description="Seconds each branch may run; None waits forever."
+    )
+    min_completed: Optional[int] = Field(
+        None, description="Finish once this many branches have; None means all."
+    )
+    outcomes_key: Optional[str] = None
+
+    async def _run_branch(
+        self,
+        name: str,
+        events: AsyncGenerator[Event, None],
+        queue: asyncio.Queue,
+    ):
+        outcome = "failed"
+        try:
+            async with asyncio.timeout(self.branch_timeout):
+                async for event in events:
+                    # like ParallelAgent, wait until the runner has processed
+                    # the event before producing the next one
+                    processed = asyncio.Event()
+                    await queue.put((name, event, processed))
+                    await processed.wait()
+            outcome = "completed"
+        except TimeoutError:
+            outcome = "timed_out"
+            logger.warning(
+                "%s: %s missed its %ss deadline", self.name, name, self.branch_timeout
+            )
+        except Exception:
+            logger.exception("%s: %s failed", self.name, name)
+        await queue.put((name, outcome, None))
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        if not self.sub_agents:
+            return
+
+        stale = {
+            agent.output_key: None
+            for agent in self.sub_agents
+            if getattr(agent, "output_key", None)
+        }
+        if stale:
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(state_delta=stale),
+            )
+
+        # an isolated branch per sub-agent, as ParallelAgent does
+        prefix = f"{ctx.branch}." if ctx.branch else ""
+        runs = {
+            agent.name: agent.run_async(
+                ctx.model_copy(update={"branch": f"{prefix}{self.name}.{agent.name}"})
+            )
+            for agent in self.sub_agents
+        }
+        needed = min(self.min_completed or len(runs), len(runs))
+        queue = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._run_branch(name, events, queue))
+            for name, events in runs.items()
+        ]
+        outcomes = {name: "cancelled" for name in runs}
+        completed = 0
+        try:
+            running = len(tasks)
+            while running and completed < needed:
+                name, item, processed = await queue.get()
+                if processed is None:
+                    running -= 1
+                    outcomes[name] = item
+                    completed += item == "completed"
+                else:
+                    yield item
+                    processed.set()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for events in runs.values():
+                await events.aclose()
+
+        logger.info("%s finished: %s", self.name, outcomes)
+        state_delta = {self.outcomes_key: outcomes} if self.outcomes_key else {}
+        if completed < needed:
+            logger.warning(
+                "%s: only %d of %d branches completed", self.name, completed, needed
+            )
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                error_code="BRANCHES_INCOMPLETE",
+                error_message=f"Only {completed} of {needed} branches completed.",
+                actions=EventActions(state_delta=state_delta),
+            )
+        elif state_delta:
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(state_delta=state_delta),
+            )
@@ -0,0 +1,391 @@
+"""Per-agent latency, token and cost metrics, collected by an ADK plugin.
+
+`MetricsPlugin` times every agent run, model call and tool call, counts
+prompt and completion tokens (and their cost) per agent and model, and
+records how many iterations each loop ran. Durations go into in-process
+histograms; `snapshot` returns p50/p95/p99 per agent as a dict, and
+`to_prometheus` renders everything in the Prometheus text format.
+
+With `spans=True` the plugin also emits an OpenTelemetry span per agent,
+model and tool call, carrying the same numbers as attributes. The spans
+nest under ADK's own tracing spans.
+
+HTTP retries made by the google-genai client (see `retry_config`) happen
+below the model callbacks and cannot be seen here; the
+`opentelemetry-instrumentation-google-genai` package traces those.
+`model_retries` counts calls that repeat a failed call from the same agent.
+"""
+
+import json
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Optional
+
+from google.adk.agents import BaseAgent, LoopAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+# USD per million (prompt, completion) tokens; models not listed are not costed
+MODEL_PRICES = {
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+}
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# label names of each metric, in order
+HISTOGRAMS = {
+    "agent_seconds": ("agent",),
+    "model_seconds": ("agent", "model"),
+    "tool_seconds": ("tool",),
+    "loop_iterations": ("loop",),
+}
+COUNTERS = {
+    "model_calls": ("agent", "model"),
+    "model_errors": ("agent", "model"),
+    "model_retries": ("agent", "model"),
+    "prompt_tokens": ("agent", "model"),
+    "completion_tokens": ("agent", "model"),
+    "cost_usd": ("agent", "model"),
+    "tool_errors": ("tool",),
+}
+
+
+class Histogram:
+    """Count, sum and quantiles of observed values.
+
+    Quantiles are computed from the most recent `max_samples` values, so
+    they follow current behaviour; count and sum cover every value.
+    """
+
+    def __init__(self, max_samples: int = 2048):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: deque[float] = deque(maxlen=max_samples)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self._samples.append(value)
+
+    def quantile(self, q: float) -> float:
+        """Nearest-rank quantile of the recent samples, 0.0 if empty."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            **{f"p{round(q * 100)}": self.quantile(q) for q in QUANTILES},
+            "max": self.max,
+        }
+
+
+def _prom_labels(names: tuple[str, ...], values: tuple[str, ...], **extra) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    escaped = (
+        (
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class MetricsPlugin(BasePlugin):
+    """Records agent, model and tool timings, token counts and cost.
+
+    Install it on the `App` (or `Runner`); `AgentTool` passes a runner's
+    plugins on to the agent it wraps, so the pipeline behind the root
+    agent's tool is measured too.
+    """
+
+    def __init__(
+        self,
+        name: str = "toddle_ops_metrics",
+        spans: bool = False,
+        prices: Optional[dict[str, tuple[float, float]]] = None,
+        clock=time.perf_counter,
+    ):
+        super().__init__(name=name)
+        self.prices = MODEL_PRICES if prices is None else prices
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, tuple], Histogram] = {}
+        self._counters: dict[tuple[str, tuple], float] = defaultdict(float)
+        # in-flight timers, keyed by invocation id first so a finished run
+        # can drop whatever its skipped or cancelled agents left behind
+        self._started: dict[str, dict[tuple, tuple[float, Any]]] = defaultdict(dict)
+        self._models: dict[str, dict[str, str]] = defaultdict(dict)
+        self._iterations: dict[str, dict[str, int]] = defaultdict(dict)
+        self._failed: set[tuple[str, str]] = set()
+        self._tracer = None
+        if spans:
+            from opentelemetry import trace
+
+            self._tracer = trace.get_tracer(__name__)
+
+    # recording
+
+    def observe(self, metric: str, labels: tuple[str, ...], value: float):
+        with self._lock:
+            key = (metric, labels)
+            if key not in self._histograms:
+                self._histograms[key] = Histogram()
+            self._histograms[key].observe(value)
+
+    def increment(self, metric: str, labels: tuple[str, ...], value: float = 1):
+        with self._lock:
+            self._counters[(metric, labels)] += value
+
+    def _start(self, invocation_id: str, key: tuple, span_name: str):
+        span = self._tracer.start_span(span_name) if self._tracer else None
+        self._started[invocation_id][key] = (self.clock(), span)
+
+    def _finish(self, invocation_id: str, key: tuple, **attributes) -> Optional[float]:
+        started = self._started.get(invocation_id, {}).pop(key, None)
+        if started is None:
+            return None
+        start, span = started
+        if span is not None:
+            span.set_attributes(
+                {f"toddle_ops.{name}": value for name, value in attributes.items()}
+            )
+            span.end()
+        return self.clock() - start
+
+    # runs
+
+    async def after_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        invocation_id = invocation_context.invocation_id
+        for _, span in self._started.pop(invocation_id, {}).values():
+            if span is not None:
+                span.end()
+        self._models.pop(invocation_id, None)
+        self._iterations.pop(invocation_id, None)
+        self._failed = {key for key in self._failed if key[0] != invocation_id}
+
+    # agents
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        invocation_id = callback_context.invocation_id
+        parent = agent.parent_agent
+        if isinstance(parent, LoopAgent) and parent.sub_agents[0] is agent:
+            iterations = self._iterations[invocation_id]
+            iterations[parent.name] = iterations.get(parent.name, 0) + 1
+        self._start(invocation_id, ("agent", agent.name), f"agent {agent.name}")
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        invocation_id = callback_context.invocation_id
+        attributes = {}
+        if isinstance(agent, LoopAgent):
+            iterations = self._iterations[invocation_id].pop(agent.name, 0)
+            self.observe("loop_iterations", (agent.name,), iterations)
+            attributes["loop_iterations"] = iterations
+        elapsed = self._finish(invocation_id, ("agent", agent.name), **attributes)
+        if elapsed is not None:
+            self.observe("agent_seconds", (agent.name,), elapsed)
+
+    # models
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        invocation_id = callback_context.invocation_id
+        agent = callback_context.agent_name
+        model = llm_request.model or ""
+        if (invocation_id, agent) in self._failed:
+            self._failed.discard((invocation_id, agent))
+            self.increment("model_retries", (agent, model))
+        # a model callback that answers from a cache (see research_cache)
+        # skips after_model; the timer is dropped with the run
+        self._start(invocation_id, ("model", agent), f"call_llm {agent}")
+        self._models[invocation_id][agent] = model
+
+    def _model_name(self, invocation_id: str, agent: str) -> str:
+        return self._models.get(invocation_id, {}).pop(agent, "")
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        if llm_response.partial:
+            # streamed chunks; the aggregated response carries the usage
+            return None
+        invocation_id = callback_context.invocation_id
+        agent = callback_context.agent_name
+        model = self._model_name(invocation_id, agent)
+        labels = (agent, model)
+
+        usage = llm_response.usage_metadata
+        prompt = (usage.prompt_token_count or 0) if usage else 0
+        completion = (
+            (usage.candidates_token_count or 0) + (usage.thoughts_token_count or 0)
+            if usage
+            else 0
+        )
+        cost = None
+        if model in self.prices:
+            prompt_price, completion_price = self.prices[model]
+            cost = (prompt * prompt_price + completion * completion_price) / 1e6
+
+        elapsed = self._finish(
+            invocation_id,
+            ("model", agent),
+            model=model,
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            **({"cost_usd": cost} if cost is not None else {}),
+        )
+        if elapsed is not None:
+            self.observe("model_seconds", labels, elapsed)
+        self.increment("model_calls", labels)
+        self.increment("prompt_tokens", labels, prompt)
+        self.increment("completion_tokens", labels, completion)
+        if cost is not None:
+            self.increment("cost_usd", labels, cost)
+        if llm_response.error_code:
+            self.increment("model_errors", labels)
+            self._failed.add((invocation_id, agent))
+        return None
+
+    async def on_model_error_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception,
+    ) -> None:
+        invocation_id = callback_context.invocation_id
+        agent = callback_context.agent_name
+        model = self._model_name(invocation_id, agent) or llm_request.model or ""
+        elapsed = self._finish(invocation_id, ("model", agent), error=repr(error))
+        if elapsed is not None:
+            self.observe("model_seconds", (agent, model), elapsed)
+        self.increment("model_errors", (agent, model))
+        self._failed.add((invocation_id, agent))
+
+    # tools
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+    ) -> None:
+        self._start(
+            tool_context.invocation_id,
+            ("tool", tool_context.function_call_id or tool.name),
+            f"tool {tool.name}",
+        )
+
+    async def after_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        result: dict,
+    ) -> None:
+        elapsed = self._finish(
+            tool_context.invocation_id,
+            ("tool", tool_context.function_call_id or tool.name),
+        )
+        if elapsed is not None:
+            self.observe("tool_seconds", (tool.name,), elapsed)
+
+    async def on_tool_error_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        error: Exception,
+    ) -> None:
+        elapsed = self._finish(
+            tool_context.invocation_id,
+            ("tool", tool_context.function_call_id or tool.name),
+            error=repr(error),
+        )
+        if elapsed is not None:
+            self.observe("tool_seconds", (tool.name,), elapsed)
+        self.increment("tool_errors", (tool.name,))
+
+    # export
+
+    def snapshot(self) -> dict:
+        """Returns histogram summaries and counter totals.
+
+        Series are keyed by their label values joined with "/", e.g.
+        `snapshot()["model_seconds"]["EditorialAgent/gemini-2.5-flash-lite"]`.
+        """
+        with self._lock:
+            result = {metric: {} for metric in [*HISTOGRAMS, *COUNTERS]}
+            for (metric, labels), histogram in self._histograms.items():
+                result[metric]["/".join(labels)] = histogram.summary()
+            for (metric, labels), value in self._counters.items():
+                result[metric]["/".join(labels)] = value
+            return result
+
+    def to_json(self) -> str:
+        """Returns `snapshot` as JSON."""
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "toddle_ops_") -> str:
+        """Renders histograms as summaries and counters in Prometheus text."""
+        with self._lock:
+            lines = []
+            for metric, names in HISTOGRAMS.items():
+                series = [
+                    (labels, histogram)
+                    for (name, labels), histogram in sorted(self._histograms.items())
+                    if name == metric
+                ]
+                if not series:
+                    continue
+                lines.append(f"# TYPE {prefix}{metric} summary")
+                for labels, histogram in series:
+                    for q in QUANTILES:
+                        lines.append(
+                            f"{prefix}{metric}"
+                            f"{_prom_labels(names, labels, quantile=q)} "
+                            f"{histogram.quantile(q)}"
+                        )
+                    lines.append(
+                        f"{prefix}{metric}_sum{_prom_labels(names, labels)} "
+                        f"{histogram.total}"
+                    )
+                    lines.append(
+                        f"{prefix}{metric}_count{_prom_labels(names, labels)} "
+                        f"{histogram.count}"
+                    )
+            for metric, names in COUNTERS.items():
+                series = [
+                    (labels, value)
+                    for (name, labels), value in sorted(self._counters.items())
+                    if name == metric
+                ]
+                if not series:
+                    continue
+                lines.append(f"# TYPE {prefix}{metric}_total counter")
+                for labels, value in series:
+                    lines.append(
+                        f"{prefix}{metric}_total{_prom_labels(names, labels)} {value}"
+                    )
+            return "\n".join(lines) + "\n"
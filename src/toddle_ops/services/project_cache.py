@@ -0,0 +1,347 @@
+"""Request-keyed project cache in front of the generation pipeline.
+
+Requests like "an easy project, 15 minutes, we have paper" are reduced to
+features (difficulty, duration, materials on hand and any remaining topic
+words). When a QA-approved project in the catalog fits them, it is served
+straight away; otherwise the research and QA pipeline runs as usual and,
+if QA approves its project, that project is added to the catalog for
+later requests.
+"""
+
+import asyncio
+import logging
+import random
+import re
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from pydantic import BaseModel, Field
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.materials_team.index import materials_index
+from toddle_ops.agents.materials_team.normalize import SYNONYMS, singularize
+from toddle_ops.helpers.run import approved_project
+from toddle_ops.models.projects import Difficulty, Project
+from toddle_ops.services.project_pool import ProjectPool
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z][a-z'-]*|\d+")
+_MINUTES = re.compile(r"(\d+)\s*(?:-|to)?\s*(\d+)?\s*(?:min|mins|minutes?)\b")
+_HOURS = re.compile(r"(\d+(?:\.\d+)?)\s*(?:hr|hrs|hours?)\b")
+_DIFFICULTY_WORDS = {
+    "easy": Difficulty.EASY,
+    "simple": Difficulty.EASY,
+    "medium": Difficulty.MEDIUM,
+    "moderate": Difficulty.MEDIUM,
+    "hard": Difficulty.HARD,
+    "challenging": Difficulty.HARD,
+    "difficult": Difficulty.HARD,
+}
+# upper bounds (minutes) used to group requests in cache keys
+DURATION_BUCKETS = (10, 20, 30, 45, 60, 90, 120)
+
+# words that carry no topic; anything else left in a request must match
+# the project's text for a cached project to be served
+_FILLER = {
+    "a", "about", "activity", "an", "and", "any", "around", "at", "can",
+    "child", "craft", "do", "for", "fun", "get", "give", "got", "half", "has",
+    "have", "home", "hour", "i", "idea", "in", "is", "it", "just", "kid",
+    "less", "long", "make", "me", "min", "minute", "my", "need", "new", "of",
+    "old", "on", "only", "or", "our", "please", "project", "provide", "quick",
+    "some", "something", "suggest", "take", "than", "that", "the", "thing",
+    "time", "to", "toddler", "under", "up", "us", "want", "we", "what",
+    "with", "year", "you",
+}  # fmt: skip
+
+
+@dataclass(frozen=True)
+class RequestFeatures:
+    """The parts of a project request the cache matches on."""
+
+    difficulty: Optional[Difficulty] = None
+    max_minutes: Optional[int] = None
+    materials: frozenset[str] = frozenset()
+    topics: tuple[str, ...] = ()
+
+    @property
+    def key(self) -> tuple:
+        """Normalized cache key: difficulty, duration bucket, materials, topics."""
+        bucket = None
+        if self.max_minutes is not None:
+            bucket = next(
+                (b for b in DURATION_BUCKETS if self.max_minutes <= b), "long"
+            )
+        return (
+            self.difficulty.value if self.difficulty else None,
+            bucket,
+            tuple(sorted(self.materials)),
+            self.topics,
+        )
+
+
+def _max_minutes(text: str) -> Optional[int]:
+    if match := _MINUTES.search(text):
+        return int(match.group(2) or match.group(1))
+    if match := _HOURS.search(text):
+        return round(float(match.group(1)) * 60)
+    if "half an hour" in text or "half hour" in text:
+        return 30
+    if re.search(r"\ban hour\b", text):
+        return 60
+    return None
+
+
+def parse_request(text: str, known_materials: frozenset[str]) -> RequestFeatures:
+    """Extracts cache features from a free-text project request.
+
+    Args:
+        text: The request passed to the pipeline.
+        known_materials: Canonical materials used by catalog projects; only
+            these are recognized as materials on hand.
+
+    Returns:
+        The request's features.
+    """
+    text = text.lower()
+    words = [singularize(word) for word in _WORD.findall(text)]
+
+    difficulty = next(
+        (_DIFFICULTY_WORDS[w] for w in words if w in _DIFFICULTY_WORDS), None
+    )
+
+    materials = set()
+    consumed = set()
+    for i, word in enumerate(words):
+        if i in consumed:
+            continue
+        for size, phrase in ((2, " ".join(words[i : i + 2])), (1, word)):
+            canonical = SYNONYMS.get(phrase, phrase)
+            if canonical in known_materials:
+                materials.add(canonical)
+                consumed.update(range(i, i + size))
+                break
+
+    topics = tuple(
+        sorted(
+            {
+                word
+                for i, word in enumerate(words)
+                if i not in consumed
+                and not word.isdigit()
+                and len(word) > 2
+                and word not in _FILLER
+                and word not in _DIFFICULTY_WORDS
+            }
+        )
+    )
+    return RequestFeatures(difficulty, _max_minutes(text), frozenset(materials), topics)
+
+
+class CachePolicy(BaseModel):
+    """Freshness and diversity rules for serving cached projects."""
+
+    enabled: bool = True
+    max_age_days: Optional[int] = Field(
+        180, description="Only serve projects created within this many days."
+    )
+    max_missing_materials: int = Field(
+        1,
+        description="How many required materials the user may not have on "
+        "hand (only applies when the request names materials).",
+    )
+    explore_rate: float = Field(
+        0.1,
+        description="Share of requests that run the pipeline even when a "
+        "cached project fits, so the catalog keeps growing.",
+    )
+    exclude_served: bool = Field(
+        True, description="Never serve a project twice in one session."
+    )
+    store_misses: bool = Field(
+        True, description="Add QA-approved pipeline results to the catalog."
+    )
+
+
+@dataclass
+class CacheMetrics:
+    """Hit/miss counters, by miss reason; `hits` includes `pool_hits`."""
+
+    requests: int = 0
+    hits: int = 0
+    pool_hits: int = 0
+    misses: dict[str, int] = field(default_factory=dict)
+    stored: int = 0
+
+    def miss(self, reason: str):
+        self.misses[reason] = self.misses.get(reason, 0) + 1
+
+    def stats(self) -> dict:
+        """Returns the counters and the hit rate."""
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "pool_hits": self.pool_hits,
+            "misses": dict(self.misses),
+            "stored": self.stored,
+            "hit_rate": self.hits / self.requests if self.requests else 0.0,
+        }
+
+
+def find_cached_project(
+    features: RequestFeatures, policy: CachePolicy, exclude_ids: list[str] = ()
+) -> Optional[Project]:
+    """Picks a random QA-approved catalog project that fits `features`."""
+    clauses = ["p.qa_approved = 1", "p.duplicate_of IS NULL"]
+    params: list = []
+    if features.difficulty is not None:
+        clauses.append("p.difficulty = ?")
+        params.append(features.difficulty.value)
+    if features.max_minutes is not None:
+        clauses.append("p.duration_minutes <= ?")
+        params.append(features.max_minutes)
+    if policy.max_age_days is not None:
+        clauses.append("p.date_created >= datetime('now', ?)")
+        params.append(f"-{policy.max_age_days} days")
+    if features.materials:
+        placeholders = ", ".join("?" * len(features.materials))
+        clauses.append(
+            f"""
+            (SELECT COUNT(*) FROM project_materials AS m
+             WHERE m.project_id = p.project_id
+             AND m.material NOT IN ({placeholders})) <= ?
+            """
+        )
+        params.extend([*sorted(features.materials), policy.max_missing_materials])
+    if features.topics:
+        clauses.append(
+            "p.rowid IN (SELECT rowid FROM projects_fts WHERE projects_fts MATCH ?)"
+        )
+        params.append(" AND ".join(f'"{topic}"' for topic in features.topics))
+    if exclude_ids:
+        clauses.append(f"p.project_id NOT IN ({', '.join('?' * len(exclude_ids))})")
+        params.extend(exclude_ids)
+
+    sql = f"""
+        SELECT p.project_id FROM projects AS p
+        WHERE {" AND ".join(clauses)}
+        ORDER BY random()
+        LIMIT 1
+    """
+    with tools._get_db_connection() as conn:
+        row = conn.execute(sql, params).fetchone()
+    return tools.get_project(row["project_id"]) if row else None
+
+
+def _request_features(text: str) -> RequestFeatures:
+    return parse_request(text, materials_index.known_materials())
+
+
+def store_approved_project(state: dict) -> Optional[Project]:
+    """Adds the pipeline's project to the catalog if QA approved it."""
+    project = approved_project(state)
+    return _save_approved(project) if project is not None else None
+
+
+def _save_approved(project: Project) -> Optional[Project]:
+    # with the cache disabled, this can be the first write to a fresh database
+    tools.init_db()
+    if tools.get_project(project.project_id) is not None:
+        # already in the catalog, e.g. a project served earlier
+        return None
+    saved = tools.create_project(project)
+    tools.mark_qa_approved(saved.project_id)
+    return saved
+
+
+class CachedPipelineAgent(BaseAgent):
+    """Runs its single sub-agent (the pipeline) only when the cache misses.
+
+    The request is read from the user message, as `AgentTool` passes it.
+    Projects served or stored are recorded in the `served_project_ids`
+    state key, which the diversity rules exclude.
+
+    With a `pool`, requests that name no materials or topics take a
+    pre-generated project from it before looking in the catalog.
+    """
+
+    policy: CachePolicy = Field(default_factory=CachePolicy)
+    metrics: CacheMetrics = Field(default_factory=CacheMetrics)
+    pool: Optional[ProjectPool] = None
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        pipeline = self.sub_agents[0]
+        served = list(ctx.session.state.get("served_project_ids") or [])
+        text = " ".join(
+            part.text
+            for part in (ctx.user_content.parts if ctx.user_content else [])
+            if part.text
+        )
+        self.metrics.requests += 1
+
+        if not self.policy.enabled:
+            reason = "disabled"
+        elif random.random() < self.policy.explore_rate:
+            reason = "explore"
+        else:
+            features = await asyncio.to_thread(_request_features, text)
+            project = None
+            if self.pool is not None and not (features.materials or features.topics):
+                project = self.pool.take(features.difficulty, features.max_minutes)
+                if project is not None:
+                    self.metrics.pool_hits += 1
+                    if self.policy.store_misses:
+                        await asyncio.to_thread(_save_approved, project)
+            if project is None:
+                project = await asyncio.to_thread(
+                    find_cached_project,
+                    features,
+                    self.policy,
+                    served if self.policy.exclude_served else [],
+                )
+            if project is not None:
+                self.metrics.hits += 1
+                logger.info("Project cache hit %s -> %s", features.key, project.name)
+                yield Event(
+                    invocation_id=ctx.invocation_id,
+                    author=self.name,
+                    branch=ctx.branch,
+                    content=types.Content(
+                        role="model",
+                        parts=[types.Part(text=project.model_dump_json(indent=2))],
+                    ),
+                    actions=EventActions(
+                        state_delta={
+                            "standard_project": project.model_dump(mode="json"),
+                            "served_project_ids": served + [project.project_id],
+                        }
+                    ),
+                )
+                return
+            reason = "no_match"
+            logger.info("Project cache miss %s", features.key)
+
+        self.metrics.miss(reason)
+        async for event in pipeline.run_async(ctx):
+            yield event
+
+        if self.policy.store_misses:
+            saved = await asyncio.to_thread(
+                store_approved_project, dict(ctx.session.state)
+            )
+            if saved is not None:
+                self.metrics.stored += 1
+                yield Event(
+                    invocation_id=ctx.invocation_id,
+                    author=self.name,
+                    branch=ctx.branch,
+                    actions=EventActions(
+                        state_delta={"served_project_ids": served + [saved.project_id]}
+                    ),
+                )
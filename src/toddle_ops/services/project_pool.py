@@ -0,0 +1,237 @@
+"""A background pool of pre-generated, QA-approved projects.
+
+Generating a project runs research, synthesis, the safety loop and
+editing while the user waits. `ProjectPool` does that work ahead of time:
+a background task keeps `depth` fresh projects per difficulty, with at
+most `concurrency` pipeline runs in flight. Requests take a project from
+the pool immediately, and the pool refills behind them. Projects older
+than `max_age_seconds` are evicted and replaced. A fill that adds
+nothing (a failed run, a QA rejection, or a project for a full bucket)
+holds its slot for `retry_delay`, doubling with each miss in a row up to
+`max_retry_delay`.
+
+Each pipeline fill asks for a different theme from `POOL_THEMES` and skips
+the research cache, so a bucket fills with distinct projects rather than
+replays of one cached search.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from toddle_ops.helpers.run import generate_project
+from toddle_ops.models.projects import Difficulty, Project
+from toddle_ops.services.research_cache import SKIP_CACHE_KEY
+
+logger = logging.getLogger(__name__)
+
+POOL_PROMPT = "Please provide {article} {difficulty} toddler project about {theme}."
+POOL_THEMES = (
+    "animals",
+    "colors",
+    "shapes",
+    "nature",
+    "music",
+    "water play",
+    "counting",
+    "vehicles",
+    "weather",
+    "bugs",
+    "food",
+    "the seasons",
+)
+
+
+def pool_prompt(difficulty: Difficulty, theme: str) -> str:
+    """Renders `POOL_PROMPT` for one difficulty and theme."""
+    article = "an" if difficulty.value[0] in "aeiou" else "a"
+    return POOL_PROMPT.format(article=article, difficulty=difficulty.value, theme=theme)
+
+
+class ProjectPool:
+    """Keeps `depth` ready projects per difficulty, refilled in the background.
+
+    Projects are generated by running `agent` (the research + QA pipeline)
+    with `POOL_PROMPT`, cycling through `POOL_THEMES`, or by a custom async `generate(difficulty)`. The
+    refill task starts on the first `take` (or an explicit `start`), so the
+    pool must be used from a running event loop.
+    """
+
+    def __init__(
+        self,
+        agent: Optional[BaseAgent] = None,
+        depth: int = 3,
+        concurrency: int = 2,
+        max_age_seconds: float = 6 * 3600,
+        retry_delay: float = 30.0,
+        max_retry_delay: float = 600.0,
+        generate: Optional[Callable[[Difficulty], Awaitable[Optional[Project]]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if generate is None and agent is None:
+            raise ValueError("ProjectPool needs an agent or a generate function")
+        self.depth = depth
+        self.concurrency = concurrency
+        self.max_age_seconds = max_age_seconds
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.clock = clock
+        self._generate = generate or self._run_pipeline
+        self._runner = (
+            Runner(
+                agent=agent,
+                app_name="toddle_ops_pool",
+                session_service=InMemorySessionService(),
+            )
+            if agent is not None
+            else None
+        )
+        self._buckets: dict[Difficulty, deque[tuple[Project, float]]] = {
+            difficulty: deque() for difficulty in Difficulty
+        }
+        self._in_flight = {difficulty: 0 for difficulty in Difficulty}
+        self._misses = {difficulty: 0 for difficulty in Difficulty}
+        self._turns = {difficulty: itertools.count() for difficulty in Difficulty}
+        self._fills: set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.served = 0
+        self.empty = 0
+        self.generated = 0
+        self.evicted = 0
+        self.wasted = 0
+
+    async def _run_pipeline(self, difficulty: Difficulty) -> Optional[Project]:
+        # a fixed prompt would replay the same cached research on every fill
+        turn = next(self._turns[difficulty])
+        prompt = pool_prompt(difficulty, POOL_THEMES[turn % len(POOL_THEMES)])
+        return await generate_project(
+            self._runner, prompt, user_id="pool", state={SKIP_CACHE_KEY: True}
+        )
+
+    def start(self):
+        """Starts the refill task if it is not running."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._refill_loop())
+
+    async def stop(self):
+        """Cancels the refill task and any generation in flight."""
+        tasks = [task for task in [self._task, *self._fills] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def _evict_stale(self):
+        cutoff = self.clock() - self.max_age_seconds
+        for bucket in self._buckets.values():
+            while bucket and bucket[0][1] < cutoff:
+                bucket.popleft()
+                self.evicted += 1
+
+    def take(
+        self,
+        difficulty: Optional[Difficulty] = None,
+        max_minutes: Optional[int] = None,
+    ) -> Optional[Project]:
+        """Removes and returns a ready project, oldest first.
+
+        Args:
+            difficulty: Only take a project of this difficulty.
+            max_minutes: Only take a project that fits in this many minutes.
+
+        Returns:
+            A project, or None if none fitting is ready.
+        """
+        self.start()
+        self._evict_stale()
+        if difficulty is not None:
+            difficulties = [difficulty]
+        else:
+            difficulties = sorted(
+                Difficulty, key=lambda d: len(self._buckets[d]), reverse=True
+            )
+        try:
+            for candidate in difficulties:
+                bucket = self._buckets[candidate]
+                for position, (project, _) in enumerate(bucket):
+                    if max_minutes is None or project.duration_minutes <= max_minutes:
+                        del bucket[position]
+                        self.served += 1
+                        return project
+            self.empty += 1
+            return None
+        finally:
+            self._wakeup.set()
+
+    def _add(self, project: Project) -> bool:
+        # the model may not honour the requested difficulty; file the
+        # project where it belongs, if there is room
+        bucket = self._buckets[project.difficulty]
+        if len(bucket) >= self.depth:
+            return False
+        bucket.append((project, self.clock()))
+        self.generated += 1
+        return True
+
+    async def _fill(self, difficulty: Difficulty, semaphore: asyncio.Semaphore):
+        try:
+            try:
+                async with semaphore:
+                    project = await self._generate(difficulty)
+            except Exception:
+                logger.exception("Pre-generating a %s project failed", difficulty.value)
+                project = None
+
+            if project is not None and self._add(project):
+                self._misses[difficulty] = 0
+            else:
+                # don't hammer a failing or off-target model; hold the slot,
+                # backing off further with each miss in a row
+                self.wasted += 1
+                self._misses[difficulty] += 1
+                doublings = min(self._misses[difficulty] - 1, 10)
+                delay = self.retry_delay * 2**doublings
+                await asyncio.sleep(min(delay, self.max_retry_delay))
+        finally:
+            self._in_flight[difficulty] -= 1
+            self._wakeup.set()
+
+    async def _refill_loop(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while True:
+            self._evict_stale()
+            for difficulty, bucket in self._buckets.items():
+                while len(bucket) + self._in_flight[difficulty] < self.depth:
+                    self._in_flight[difficulty] += 1
+                    task = asyncio.create_task(self._fill(difficulty, semaphore))
+                    self._fills.add(task)
+                    task.add_done_callback(self._fills.discard)
+            self._wakeup.clear()
+            try:
+                # wake up on takes and finished fills, or when the oldest
+                # projects may have gone stale
+                async with asyncio.timeout(self.max_age_seconds / 4):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        """Returns ready and in-flight counts per difficulty, and counters."""
+        return {
+            "ready": {d.value: len(bucket) for d, bucket in self._buckets.items()},
+            "in_flight": {d.value: n for d, n in self._in_flight.items()},
+            "served": self.served,
+            "empty": self.empty,
+            "generated": self.generated,
+            "evicted": self.evicted,
+            "wasted": self.wasted,
+        }
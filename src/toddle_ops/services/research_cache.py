@@ -0,0 +1,345 @@
+"""Disk-backed, TTL-bounded cache for research results.
+
+The craft researchers ask near-identical questions on every request. This
+cache stores their results in a small SQLite file keyed on the normalized
+query, so repeats skip the search (and its latency and cost) across
+sessions and processes. Entries expire after `ttl_seconds`, and the least
+recently used entries are evicted once the file holds more than
+`max_bytes` of results.
+
+`google_search` is a built-in Gemini tool that runs inside the model call,
+so the researchers are cached at the model level through
+`before_model`/`after_model` callbacks. Function tools can be wrapped in
+`CachedTool` instead. A session can opt out of the model-level cache by
+setting `SKIP_CACHE_KEY` in its state.
+
+Generic requests that name no topic ("Please provide a project.") are never
+cached: a cached answer would hand every such request the same research,
+and so near enough the same project, until it expired. They pay for a
+fresh search each time in exchange for varied projects; requests with a
+topic ("a painting project with leaves") are cached as usual.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+from toddle_ops.config.basic import research_cache_path, research_cache_ttl
+
+_WORD = re.compile(r"\w+")
+
+# session state key; when truthy, researcher calls bypass the cache
+SKIP_CACHE_KEY = "skip_research_cache"
+
+# words that ask for a project without saying what it should be about
+# fmt: off
+GENERIC_WORDS = frozenset({
+    "a", "an", "the", "any", "some", "something", "another", "one", "new",
+    "fun", "simple", "quick", "easy", "medium", "hard", "please", "provide",
+    "give", "get", "make", "suggest", "show", "find", "me", "i", "we", "us",
+    "my", "our", "you", "can", "could", "would", "like", "want", "need", "do",
+    "for", "to", "with", "of", "toddler", "toddlers", "kid", "kids", "child",
+    "children", "project", "projects", "idea", "ideas", "activity", "activities",
+})
+# fmt: on
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS research_cache (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created REAL NOT NULL,
+        accessed REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_research_cache_accessed
+        ON research_cache (accessed);
+"""
+
+
+def normalize_query(text: str) -> str:
+    """Lowercases `text` and reduces it to its words, in order.
+
+    Punctuation, case and spacing are dropped, but word order is kept:
+    "glue paper to cardboard" and "glue cardboard to paper" are different
+    requests.
+    """
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def is_generic_query(text: str) -> bool:
+    """Whether `text` asks for a project without naming a topic."""
+    return all(word in GENERIC_WORDS for word in normalize_query(text).split())
+
+
+class ResearchCache:
+    """A SQLite-backed key/value cache with a TTL and a size bound.
+
+    Every operation opens its own short-lived connection, so one file can
+    be shared by threads and processes; WAL mode keeps readers from
+    blocking on a writer.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl_seconds: float = 86400,
+        max_bytes: int = 50 * 2**20,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._ready = False
+        # model calls that missed, by (invocation, agent), awaiting a response
+        self._pending: dict[tuple[str, str], tuple[str, float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.lookup_seconds = 0.0
+        self.fetches = 0
+        self.fetch_seconds = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._ready = True
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the fresh value stored under `key`, or None."""
+        start = time.perf_counter()
+        now = self.clock()
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT value, created FROM research_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM research_cache WHERE key = ?", (key,))
+                    row, expired = None, True
+                else:
+                    expired = False
+                if row is not None:
+                    conn.execute(
+                        "UPDATE research_cache SET accessed = ? WHERE key = ?",
+                        (now, key),
+                    )
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.lookup_seconds += time.perf_counter() - start
+            if row is None:
+                self.misses += 1
+                self.expired += expired
+            else:
+                self.hits += 1
+        return row[0] if row else None
+
+    def put(self, key: str, value: str):
+        """Stores `value`, then evicts expired and least recently used entries."""
+        now = self.clock()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO research_cache VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value.encode()), now, now),
+                )
+                evicted = conn.execute(
+                    "DELETE FROM research_cache WHERE created < ?",
+                    (now - self.ttl_seconds,),
+                ).rowcount
+                evicted += conn.execute(
+                    """
+                    DELETE FROM research_cache WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(size) OVER (
+                                ORDER BY accessed DESC, created DESC
+                            ) AS running
+                            FROM research_cache
+                        )
+                        WHERE running > ?
+                    )
+                    """,
+                    (self.max_bytes,),
+                ).rowcount
+        finally:
+            conn.close()
+        with self._lock:
+            self.evictions += evicted
+
+    def record_fetch(self, seconds: float):
+        """Records how long an uncached search took."""
+        with self._lock:
+            self.fetches += 1
+            self.fetch_seconds += seconds
+
+    def clear(self):
+        """Removes every entry."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM research_cache")
+        finally:
+            conn.close()
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and average lookup and fetch latency."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            avg_fetch = self.fetch_seconds / self.fetches if self.fetches else 0.0
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "avg_lookup_ms": self.lookup_seconds / lookups * 1000
+                if lookups
+                else 0.0,
+                "avg_fetch_ms": avg_fetch * 1000,
+                "est_saved_seconds": self.hits * avg_fetch,
+            }
+
+    @staticmethod
+    def request_key(agent_name: str, llm_request: LlmRequest) -> str:
+        """Keys a model call on the agent, model, instruction and query.
+
+        The instruction goes in as a short fingerprint, so editing an
+        agent's prompt does not replay answers written for the old one.
+        """
+        instruction = (
+            llm_request.config.system_instruction if llm_request.config else None
+        )
+        if isinstance(instruction, types.Content):
+            instruction = " ".join(part.text or "" for part in instruction.parts or [])
+        fingerprint = hashlib.sha256(str(instruction or "").encode()).hexdigest()[:12]
+        query = ResearchCache.request_query(llm_request)
+        return (
+            f"model:{agent_name}:{llm_request.model}:{fingerprint}:"
+            f"{normalize_query(query)}"
+        )
+
+    @staticmethod
+    def request_query(llm_request: LlmRequest) -> str:
+        """Returns the user text of a model call."""
+        return " ".join(
+            part.text
+            for content in llm_request.contents
+            if content.role == "user"
+            for part in content.parts or []
+            if part.text
+        )
+
+    async def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """`before_model_callback`: answers the call from the cache on a hit.
+
+        Calls from sessions with `SKIP_CACHE_KEY` set, and generic requests,
+        always go to the model and are not stored.
+        """
+        if callback_context.state.get(SKIP_CACHE_KEY):
+            return None
+        if is_generic_query(self.request_query(llm_request)):
+            return None
+        key = self.request_key(callback_context.agent_name, llm_request)
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            return LlmResponse.model_validate_json(cached)
+        self._pending[(callback_context.invocation_id, callback_context.agent_name)] = (
+            key,
+            time.perf_counter(),
+        )
+        return None
+
+    async def after_model(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """`after_model_callback`: stores complete, successful responses."""
+        if llm_response.partial:
+            # streamed chunks; the aggregated response follows
+            return None
+        pending = self._pending.pop(
+            (callback_context.invocation_id, callback_context.agent_name), None
+        )
+        if pending is None:
+            return None
+        key, start = pending
+        self.record_fetch(time.perf_counter() - start)
+        if llm_response.error_code or not llm_response.content:
+            return None
+        await asyncio.to_thread(
+            self.put, key, llm_response.model_dump_json(exclude_none=True)
+        )
+        return None
+
+
+class CachedTool(BaseTool):
+    """Wraps a function tool so repeated calls are answered from a cache.
+
+    Calls are keyed on the tool name and its arguments, with string
+    arguments normalized like queries. Error results are not cached.
+    """
+
+    def __init__(self, tool: BaseTool, cache: ResearchCache):
+        super().__init__(
+            name=tool.name,
+            description=tool.description,
+            is_long_running=tool.is_long_running,
+        )
+        self.tool = tool
+        self.cache = cache
+
+    def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
+        return self.tool._get_declaration()
+
+    def _key(self, args: dict[str, Any]) -> str:
+        normalized = {
+            name: normalize_query(value) if isinstance(value, str) else value
+            for name, value in args.items()
+        }
+        return f"tool:{self.name}:{json.dumps(normalized, sort_keys=True)}"
+
+    async def run_async(
+        self, *, args: dict[str, Any], tool_context: ToolContext
+    ) -> Any:
+        key = self._key(args)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return json.loads(cached)
+
+        start = time.perf_counter()
+        result = await self.tool.run_async(args=args, tool_context=tool_context)
+        self.cache.record_fetch(time.perf_counter() - start)
+        if isinstance(result, dict) and "error" in result:
+            return result
+        try:
+            value = json.dumps(result)
+        except TypeError:
+            return result
+        await asyncio.to_thread(self.cache.put, key, value)
+        return result
+
+
+research_cache = ResearchCache(research_cache_path, ttl_seconds=research_cache_ttl)
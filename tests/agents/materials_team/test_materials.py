@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.materials_team.normalize import normalize_materials
+from toddle_ops.agents.materials_team.tools import find_projects_by_materials
+
+
+def test_normalize_materials_canonicalizes_items():
+    """Quantities, units, plurals, descriptors and synonyms collapse."""
+    assert normalize_materials(
+        "2 paper plates, yellow washable paint, Glue sticks (optional)\n"
+        "1/2 cup of salt and a few leaves"
+    ) == {"paper plate", "paint", "glue", "salt", "leaf"}
+    assert normalize_materials(["Construction paper", "school glue"]) == {
+        "paper",
+        "glue",
+    }
+
+
+def test_units_behind_descriptors_are_dropped():
+    """A descriptor before the unit doesn't keep the unit in the token."""
+    assert normalize_materials(
+        "a large sheet of paper; 2 small cups of flour; 3 big tubes of glue"
+    ) == {"paper", "flour", "glue"}
+
+
+def test_container_words_can_be_the_material():
+    """A unit word with nothing after it is the item, not a measure."""
+    assert normalize_materials(
+        "empty jars, a clean jar, 2 small boxes, bottles, cups, sticks, a box"
+    ) == {"jar", "box", "bottle", "cup", "stick"}
+    assert normalize_materials("bottle caps; 2 tsp salt; 1 roll of tape") == {
+        "bottle cap",
+        "salt",
+        "tape",
+    }
+
+
+def test_find_projects_on_a_fresh_database(tmp_path, monkeypatch):
+    """The index can be the first thing to open a new database."""
+    monkeypatch.setattr(tools, "DATABASE_FILE", tmp_path / "new.db")
+    assert find_projects_by_materials(["paper"])["projects"] == []
+
+
+def test_find_projects_by_materials(project_db, make_project):
+    """Set containment and "missing at most k" lookups over the catalog."""
+    collage = tools.create_project(
+        make_project(name="Collage", materials="paper, glue stick, scissors")
+    )
+    sun = tools.create_project(
+        make_project(name="Sun", materials="paper plates, paint, paintbrush")
+    )
+
+    exact = find_projects_by_materials(["Glue", "construction paper", "scissors"])
+    assert [p["project_id"] for p in exact["projects"]] == [collage.project_id]
+    assert exact["materials_on_hand"] == ["glue", "paper", "scissors"]
+
+    near = find_projects_by_materials(["paper plate", "paint"], max_missing=1)
+    assert near["projects"][0]["project_id"] == sun.project_id
+    assert near["projects"][0]["missing"] == ["paint brush"]
+
+    # the index follows writes made through the tools
+    tools.update_project(sun.project_id, {"materials": "paper plates, paint"})
+    tools.delete_project(collage.project_id)
+    after = find_projects_by_materials(["paper plate", "paint", "glue"])
+    assert [p["project_id"] for p in after["projects"]] == [sun.project_id]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+
+import toddle_ops.agents.project_database_team.async_tools as async_tools
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.agent import sql_agent
+
+
+def test_async_crud_round_trip(project_db, make_project):
+    """The async tools read and write the same catalog as the sync ones."""
+    project = make_project(name="Bubble Wrap Painting")
+
+    async def scenario():
+        await async_tools.create_project(project)
+        fetched = await async_tools.get_project(project.project_id)
+        updated = await async_tools.update_project(
+            project.project_id, {"duration_minutes": 10}
+        )
+        found = await async_tools.search_projects("bubble")
+        deleted = await async_tools.delete_project(project.project_id)
+        return fetched, updated, found, deleted
+
+    fetched, updated, found, deleted = asyncio.run(scenario())
+
+    assert fetched == project
+    assert updated.duration_minutes == 10
+    assert found[0]["project_id"] == project.project_id
+    assert deleted
+    assert tools.get_project(project.project_id) is None
+
+
+def test_async_tools_share_one_connection_under_concurrency(project_db, make_project):
+    """Concurrent calls reuse the single long-lived connection."""
+    tools.create_projects(make_project(name=f"Project {i}") for i in range(30))
+
+    async def scenario():
+        pages = await asyncio.gather(
+            *(async_tools.list_projects_page(limit=10) for _ in range(20))
+        )
+        return pages, len(async_tools._connections)
+
+    pages, connections = asyncio.run(scenario())
+
+    assert connections == 1
+    assert all(len(page["projects"]) == 10 for page in pages)
+    assert all(page["next_cursor"] for page in pages)
+
+
+def test_sql_agent_calls_the_async_tools(project_db, make_project):
+    """The agent's CRUD tools are the async ones, called with JSON arguments."""
+    registered = {tool.name: tool for tool in sql_agent.tools if hasattr(tool, "func")}
+    project = make_project(name="Sock Puppets")
+
+    async def scenario():
+        await registered["create_project"].run_async(
+            args={"project": project.model_dump(mode="json")}, tool_context=None
+        )
+        return await registered["get_project"].run_async(
+            args={"project_id": project.project_id}, tool_context=None
+        )
+
+    assert registered["create_project"].func is async_tools.create_project
+    assert asyncio.run(scenario()) == project
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import toddle_ops.agents.project_database_team.tools as tools
+
+
+def test_create_projects_accepts_generator_and_reports_conflicts(
+    project_db, make_project
+):
+    """Bulk inserts stream a generator and skip IDs that already exist."""
+    existing = tools.create_project(make_project(name="Existing"))
+
+    def generate():
+        yield make_project(project_id=existing.project_id, name="Clobbered")
+        for i in range(25):
+            yield make_project(name=f"Generated {i}")
+
+    result = tools.create_projects(generate(), chunk_size=10)
+
+    assert result.inserted == 25
+    assert result.updated == 0
+    assert result.conflicts == [existing.project_id]
+    assert tools.get_project(existing.project_id).name == "Existing"
+    assert len(tools.list_projects()) == 26
+
+
+def test_upsert_projects_overwrites_existing_rows(project_db, make_project):
+    """Upserts insert new IDs and overwrite existing ones."""
+    existing = tools.create_project(make_project(name="Old Name"))
+    fresh = make_project(name="Fresh")
+
+    result = tools.upsert_projects(
+        [make_project(project_id=existing.project_id, name="New Name"), fresh]
+    )
+
+    assert result.inserted == 1
+    assert result.updated == 1
+    assert result.conflicts == [existing.project_id]
+    assert tools.get_project(existing.project_id).name == "New Name"
+    assert tools.get_project(fresh.project_id) == fresh
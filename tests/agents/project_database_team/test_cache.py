@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import toddle_ops.agents.project_database_team.cache as cache
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Touching an entry protects it from the next eviction."""
+    lru = LRUCache(maxsize=2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1
+    lru.put("c", 3)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1 and lru.get("c") == 3
+    assert lru.stats()["evictions"] == 1
+    assert lru.stats()["hits"] == 3 and lru.stats()["misses"] == 1
+
+
+def test_lru_cache_expires_entries(monkeypatch):
+    """Entries older than the TTL count as misses."""
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    lru = LRUCache(maxsize=2, ttl=10)
+    lru.put("a", 1)
+    now[0] += 11
+
+    assert lru.get("a") is None
+    assert lru.stats()["expirations"] == 1
+
+
+def test_get_project_is_read_through_and_invalidated(project_db, make_project):
+    """Repeat reads hit the cache; updates and deletes invalidate exactly."""
+    project = tools.create_project(make_project(name="Cached"))
+    other = tools.create_project(make_project(name="Other"))
+    tools.get_project(other.project_id)
+
+    first = tools.get_project(project.project_id)
+    hits = tools.project_cache.hits
+    second = tools.get_project(project.project_id)
+    assert tools.project_cache.hits == hits + 1
+    assert second == first and second is not first
+
+    # callers mutating their copy never leak into the cache
+    second.name = "Mutated"
+    assert tools.get_project(project.project_id).name == "Cached"
+
+    assert tools.update_project(project.project_id, {"name": "Renamed"}).name == (
+        "Renamed"
+    )
+    tools.upsert_projects([make_project(project_id=other.project_id, name="Upserted")])
+    assert tools.get_project(other.project_id).name == "Upserted"
+
+    tools.delete_project(project.project_id)
+    assert tools.get_project(project.project_id) is None
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import toddle_ops.agents.project_database_team.async_tools as async_tools
+import toddle_ops.agents.project_database_team.codec as codec
+import toddle_ops.agents.project_database_team.tools as tools
+
+LONG_TEXT = "Tear the tissue paper into small pieces and stick them on. " * 10
+
+
+@pytest.mark.parametrize("storage_codec", ["json", "zlib"])
+@pytest.mark.parametrize("text", ["", "glue", "crème brûlée 🎨", LONG_TEXT])
+def test_round_trip(storage_codec, text):
+    assert codec.decode(codec.encode(text, storage_codec)) == text
+
+
+def test_compressed_blobs_are_tagged():
+    """Long text is deflated; text that would grow is stored raw."""
+    assert codec.codec_of(codec.encode(LONG_TEXT, "zlib")) == "zlib"
+    assert len(codec.encode(LONG_TEXT, "zlib")) < len(LONG_TEXT) // 4
+    assert codec.codec_of(codec.encode("glue", "zlib")) == "raw"
+    assert codec.codec_of(codec.encode("glue", "json")) == "json"
+
+
+def test_unknown_codec_and_format_are_rejected():
+    with pytest.raises(ValueError):
+        codec.encode("glue", "lz4")
+    with pytest.raises(ValueError):
+        codec.decode(b"\x7fglue")
+
+
+def test_zstd_round_trip():
+    pytest.importorskip("zstandard")
+    blob = codec.encode(LONG_TEXT, "zstd")
+    assert codec.codec_of(blob) == "zstd"
+    assert codec.decode(blob) == LONG_TEXT
+
+
+def test_zstd_without_zstandard(monkeypatch):
+    monkeypatch.setattr(codec, "zstandard", None)
+    with pytest.raises(RuntimeError, match="zstandard"):
+        codec.encode(LONG_TEXT, "zstd")
+
+
+@pytest.fixture
+def zlib_storage(project_db, monkeypatch):
+    monkeypatch.setattr(codec, "STORAGE_CODEC", "zlib")
+    return project_db
+
+
+def test_tools_read_and_search_compressed_rows(zlib_storage, make_project):
+    project = tools.create_project(make_project(instructions=LONG_TEXT))
+
+    with tools._get_db_connection() as conn:
+        stored = conn.execute(
+            "SELECT instructions FROM projects WHERE project_id = ?",
+            (project.project_id,),
+        ).fetchone()[0]
+    assert isinstance(stored, bytes)
+
+    tools.project_cache.clear()
+    assert tools.get_project(project.project_id) == project
+    assert asyncio.run(async_tools.get_project(project.project_id)) == project
+    [hit] = tools.search_projects("tissue")
+    assert "[tissue]" in hit["snippet"]
+    assert asyncio.run(async_tools.search_projects("tissue"))[0]["snippet"]
+
+    tools.update_project(project.project_id, {"instructions": "Crumple the foil."})
+    assert tools.search_projects("tissue") == []
+    assert tools.search_projects("foil")[0]["project_id"] == project.project_id
+
+
+def test_recompress_projects_converts_existing_rows(project_db, make_project):
+    projects = [make_project(instructions=f"{LONG_TEXT} {i}") for i in range(5)]
+    tools.create_projects(projects)
+
+    assert tools.recompress_projects("zlib", chunk_size=2) == 5
+    assert tools.recompress_projects("zlib", chunk_size=2) == 0
+
+    with tools._get_db_connection() as conn:
+        kinds = {
+            codec.codec_of(row[0])
+            for row in conn.execute("SELECT instructions FROM projects")
+        }
+    assert kinds == {"zlib"}
+    assert sorted(tools.list_projects(), key=lambda p: p.instructions) == projects
+    assert len(tools.search_projects("tissue")) == 5
+
+    assert tools.recompress_projects("json") == 5
+    assert tools.list_projects_page(columns=["instructions"])["projects"][0][
+        "instructions"
+    ].startswith("Tear")
+
+
+def test_lazy_projects_decode_on_access(zlib_storage, make_project, monkeypatch):
+    project = tools.create_project(make_project(instructions=LONG_TEXT))
+    decoded = []
+    real_decode = codec.decode
+    monkeypatch.setattr(
+        codec, "decode", lambda value: decoded.append(value) or real_decode(value)
+    )
+
+    [lazy] = tools.iter_projects(lazy=True)
+    assert lazy.name == project.name
+    assert decoded == []
+
+    assert lazy.instructions == LONG_TEXT
+    assert lazy.instructions == LONG_TEXT
+    assert len(decoded) == 1
+    assert lazy.to_project() == project
+
+
+def test_compressed_rows_stay_searchable_after_other_updates(
+    zlib_storage, make_project
+):
+    project = tools.create_project(make_project(instructions=LONG_TEXT))
+
+    tools.update_project(project.project_id, {"name": "Window Art"})
+    assert tools.search_projects("tissue")[0]["project_id"] == project.project_id
+    assert tools.search_projects("window")[0]["project_id"] == project.project_id
+
+    tools.rebuild_search_index()
+    assert tools.search_projects("tissue")[0]["project_id"] == project.project_id
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.connection import ConnectionPool
+
+
+def test_pool_configures_wal_and_reuses_connections(tmp_path):
+    """Connections are opened once, in WAL mode, and handed back out."""
+    pool = ConnectionPool(tmp_path / "pool.db", size=2)
+    with pool.connection() as conn:
+        first = conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    with pool.connection() as conn:
+        assert conn is first
+    pool.close()
+
+
+def test_pool_rolls_back_on_error(tmp_path):
+    """A failing `with` block leaves no partial writes behind."""
+    pool = ConnectionPool(tmp_path / "pool.db", size=1)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise RuntimeError("boom")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT count(*) FROM t").fetchone()[0] == 0
+    pool.close()
+
+
+def test_pool_times_out_when_exhausted(tmp_path):
+    """Checkouts beyond `size` wait, then raise instead of opening more."""
+    pool = ConnectionPool(tmp_path / "pool.db", size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(TimeoutError):
+            with pool.connection():
+                pass
+    pool.close()
+
+
+def test_tools_round_trip_across_threads(project_db, make_project):
+    """The CRUD tools share the pool safely from several threads."""
+    projects = [make_project(name=f"Project {i}") for i in range(20)]
+    threads = [
+        threading.Thread(target=tools.create_project, args=(p,)) for p in projects
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(tools.list_projects()) == 20
+    fetched = tools.get_project(projects[0].project_id)
+    assert fetched == projects[0]
+
+    updated = tools.update_project(projects[0].project_id, {"duration_minutes": 5})
+    assert updated.duration_minutes == 5
+    assert tools.delete_project(projects[0].project_id)
+    assert tools.get_project(projects[0].project_id) is None
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+import toddle_ops.agents.project_database_team.tools as tools
+
+HANDPRINTS = {
+    "name": "Salt Dough Handprints",
+    "materials": "2 cups flour, 1 cup salt, 3/4 cup water, rolling pin, paint",
+    "instructions": (
+        "Mix the flour, salt and water into a dough. Roll the dough flat. "
+        "Press your toddler's hand into the dough. Bake at a low heat until "
+        "hard, let it cool, then paint the handprint together."
+    ),
+}
+
+
+@pytest.fixture
+def original(project_db, make_project):
+    return tools.create_project(make_project(**HANDPRINTS))
+
+
+def _near_copy(make_project):
+    return make_project(
+        **{
+            **HANDPRINTS,
+            "name": "Salt Dough Hand Prints",
+            "instructions": HANDPRINTS["instructions"].replace("cool", "cool down"),
+        }
+    )
+
+
+def test_near_duplicates_are_flagged(original, make_project):
+    """The default policy stores the copy and points it at the original."""
+    copy = tools.create_project(_near_copy(make_project))
+    unrelated = tools.create_project(make_project(name="Leaf Rubbing"))
+
+    with tools._get_db_connection() as conn:
+        flags = dict(conn.execute("SELECT project_id, duplicate_of FROM projects"))
+    assert flags == {
+        original.project_id: None,
+        copy.project_id: original.project_id,
+        unrelated.project_id: None,
+    }
+    assert tools.find_duplicate_project(copy)["project_id"] == original.project_id
+
+
+def test_merge_policy_returns_the_original(original, make_project):
+    """Merging stores nothing and hands back the saved project."""
+    merged = tools.create_project(_near_copy(make_project), on_duplicate="merge")
+
+    assert merged == original
+    assert len(tools.list_projects()) == 1
+
+
+def test_bulk_writes_flag_duplicates_within_a_chunk(project_db, make_project):
+    """Bulk loads see near-duplicates earlier in the same chunk."""
+    first = make_project(**HANDPRINTS)
+    copy = _near_copy(make_project)
+    tools.create_projects([first, copy])
+
+    assert tools.find_duplicate_project(copy)["project_id"] == first.project_id
+    with tools._get_db_connection() as conn:
+        (duplicate_of,) = conn.execute(
+            "SELECT duplicate_of FROM projects WHERE project_id = ?",
+            (copy.project_id,),
+        ).fetchone()
+    assert duplicate_of == first.project_id
+
+
+def test_deleting_a_project_removes_its_buckets(original, make_project):
+    """Deleted projects are never reported as duplicates."""
+    tools.delete_project(original.project_id)
+    assert tools.find_duplicate_project(_near_copy(make_project)) is None
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+import toddle_ops.agents.project_database_team.schema as schema
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.models.projects import Difficulty
+
+
+@pytest.fixture
+def catalog(project_db, make_project):
+    tools.create_projects(
+        [
+            make_project(name="Quick Easy", duration_minutes=10),
+            make_project(name="Long Easy", duration_minutes=45),
+            make_project(
+                name="Quick Hard", difficulty=Difficulty.HARD, duration_minutes=15
+            ),
+            make_project(name="Mid Easy", duration_minutes=20),
+        ]
+    )
+
+
+def test_find_projects_filters_and_orders(catalog):
+    """Difficulty and duration filters combine; default order is shortest first."""
+    easy_short = tools.find_projects(difficulty="easy", max_minutes=20)
+    assert [p["name"] for p in easy_short] == ["Quick Easy", "Mid Easy"]
+    assert easy_short[0]["date_created"]
+
+    by_name = tools.find_projects(max_minutes=15, order_by="name")
+    assert [p["name"] for p in by_name] == ["Quick Easy", "Quick Hard"]
+
+    with pytest.raises(ValueError):
+        tools.find_projects(order_by="rowid; DROP TABLE projects")
+
+
+@pytest.mark.parametrize("order_by", sorted(tools.FIND_ORDERINGS))
+@pytest.mark.parametrize(
+    ("difficulty", "max_minutes"), [("easy", 20), (None, 20), ("hard", None)]
+)
+def test_find_projects_uses_covering_index(catalog, difficulty, max_minutes, order_by):
+    """Every filter/order combination is answered from the index alone."""
+    sql, params = tools._find_projects_query(difficulty, max_minutes, order_by)
+    with tools._get_db_connection() as conn:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", (*params, 10)).fetchall()
+    details = " ".join(row["detail"] for row in plan)
+    assert "USING COVERING INDEX idx_projects_difficulty_duration" in details
+
+
+def test_migrate_upgrades_unversioned_database(tmp_path, monkeypatch, make_project):
+    """A pre-versioning database gains the date columns and index."""
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(schema.PROJECTS_SCHEMA)
+        conn.execute(
+            "INSERT INTO projects VALUES (?, ?, ?, ?, ?, ?, ?)",
+            tools._project_to_row(make_project(name="Legacy")),
+        )
+    monkeypatch.setattr(tools, "DATABASE_FILE", path)
+
+    tools.init_db()
+    tools.init_db()  # already current: a no-op
+
+    with tools._get_db_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == (
+            schema.SCHEMA_VERSION
+        )
+    assert tools.find_projects()[0]["date_created"]
+    assert tools.search_projects("legacy")
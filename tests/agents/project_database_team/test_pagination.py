@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+import toddle_ops.agents.project_database_team.tools as tools
+
+
+@pytest.fixture
+def catalog(project_db, make_project):
+    projects = [make_project(name=f"Project {i:02d}") for i in range(25)]
+    tools.create_projects(projects)
+    return sorted(projects, key=lambda p: p.project_id)
+
+
+def test_iter_projects_walks_catalog_in_keyset_order(catalog):
+    """Small batches still yield every project exactly once, in ID order."""
+    streamed = list(tools.iter_projects(batch_size=4))
+    assert streamed == catalog
+
+
+def test_iter_projects_projects_columns(catalog):
+    """Projected reads return dicts with only the requested fields."""
+    rows = list(tools.iter_projects(columns=["name", "difficulty"]))
+    assert rows[0] == {
+        "project_id": catalog[0].project_id,
+        "name": catalog[0].name,
+        "difficulty": "easy",
+    }
+    with pytest.raises(ValueError):
+        next(tools.iter_projects(columns=["name; DROP TABLE projects"]))
+
+
+def test_list_projects_page_follows_cursor(catalog):
+    """Following `next_cursor` visits every project and then stops."""
+    seen, cursor = [], None
+    while True:
+        page = tools.list_projects_page(limit=10, cursor=cursor)
+        seen.extend(row["project_id"] for row in page["projects"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [p.project_id for p in catalog]
+    assert set(page["projects"][0]) == {"project_id", *tools.SUMMARY_COLUMNS}
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.persistence import (
+    ProjectPersistenceAgent,
+)
+
+
+def _run(agent, state: dict):
+    """Runs `agent` once against a session seeded with `state`."""
+
+    async def scenario():
+        sessions = InMemorySessionService()
+        session = await sessions.create_session(
+            app_name="test", user_id="user", state=state
+        )
+        runner = Runner(agent=agent, app_name="test", session_service=sessions)
+        events = [
+            event
+            async for event in runner.run_async(
+                user_id="user",
+                session_id=session.id,
+                new_message=types.Content(role="user", parts=[types.Part(text="save")]),
+            )
+        ]
+        session = await sessions.get_session(
+            app_name="test", user_id="user", session_id=session.id
+        )
+        return events, session.state
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("key", ["final_project", "standard_project"])
+def test_saves_confirmed_project(project_db, make_project, key):
+    summaries = []
+    agent = ProjectPersistenceAgent(
+        name="Persist", confirm=lambda summary: summaries.append(summary) or "yes"
+    )
+    project = make_project()
+
+    events, state = _run(agent, {key: project.model_dump(mode="json")})
+
+    assert "Paper Plate Sun" in summaries[0]
+    assert tools.get_project(project.project_id) == project
+    assert state["database_queue"]["project_id"] == project.project_id
+    assert events[-1].content.parts[0].text.startswith("Saved project")
+
+
+def test_already_saved_project_is_reported(project_db, make_project):
+    agent = ProjectPersistenceAgent(name="Persist", confirm=lambda summary: "yes")
+    project = make_project()
+    tools.create_project(project)
+
+    events, state = _run(agent, {"final_project": project.model_dump(mode="json")})
+
+    assert tools.list_projects() == [project]
+    assert state["database_queue"]["project_id"] == project.project_id
+    assert events[-1].content.parts[0].text.endswith("is already saved.")
+
+
+def test_declined_project_is_not_saved(project_db, make_project):
+    agent = ProjectPersistenceAgent(name="Persist", confirm=lambda summary: "no")
+
+    events, state = _run(agent, {"standard_project": make_project().model_dump_json()})
+
+    assert tools.list_projects() == []
+    assert state["database_queue"] is None
+    assert events[-1].content.parts[0].text == "Action Cancelled by user."
+
+
+def test_invalid_project_is_reported(project_db):
+    agent = ProjectPersistenceAgent(name="Persist", confirm=lambda summary: "yes")
+
+    events, _ = _run(agent, {"standard_project": "A lovely project about glue."})
+
+    assert tools.list_projects() == []
+    assert events[-1].content.parts[0].text.startswith("Could not save")
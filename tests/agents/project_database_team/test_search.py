@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import sqlite3
+
+import toddle_ops.agents.project_database_team.tools as tools
+
+
+def test_search_ranks_matches_and_returns_snippets(project_db, make_project):
+    """Name matches outrank body matches; snippets highlight the hit."""
+    handprints = tools.create_project(
+        make_project(name="Salt Dough Handprints", materials="flour, salt, water")
+    )
+    tools.create_project(
+        make_project(
+            name="Sensory Bag",
+            description="Squish a bag of gel.",
+            instructions="Mention salt dough handprints as a follow up.",
+        )
+    )
+    tools.create_project(make_project(name="Leaf Rubbing", materials="crayons"))
+
+    results = tools.search_projects("salt dough handprint")
+
+    assert [r["name"] for r in results] == ["Salt Dough Handprints", "Sensory Bag"]
+    assert results[0]["project_id"] == handprints.project_id
+    assert "[" in results[0]["snippet"]
+    assert tools.search_projects("!!!") == []
+
+
+def test_search_index_follows_updates_and_deletes(project_db, make_project):
+    """Triggers keep the index in sync with writes to `projects`."""
+    project = tools.create_project(make_project(name="Paper Chain"))
+    tools.update_project(project.project_id, {"name": "Rainbow Garland"})
+
+    assert tools.search_projects("chain") == []
+    assert tools.search_projects("garland")[0]["project_id"] == project.project_id
+
+    tools.delete_project(project.project_id)
+    assert tools.search_projects("garland") == []
+
+
+def test_init_db_indexes_existing_rows(tmp_path, monkeypatch, make_project):
+    """Databases created before search existed are backfilled."""
+    path = tmp_path / "legacy.db"
+    project = make_project(name="Legacy Collage")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE projects (project_id TEXT PRIMARY KEY, name TEXT NOT NULL,"
+            " description TEXT, difficulty TEXT, duration_minutes INTEGER,"
+            " materials TEXT, instructions TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO projects VALUES (?, ?, ?, ?, ?, ?, ?)",
+            tools._project_to_row(project),
+        )
+    monkeypatch.setattr(tools, "DATABASE_FILE", path)
+
+    tools.init_db()
+
+    assert tools.search_projects("collage")[0]["project_id"] == project.project_id
+
+
+def test_plain_sqlite_clients_can_write_projects(project_db, make_project):
+    """Writers without our SQL functions (the MCP server, the shell) work."""
+    project = make_project(name="Shell Collage", materials="shells, glue")
+    with sqlite3.connect(project_db) as conn:
+        conn.execute(
+            "INSERT INTO projects (project_id, name, description, difficulty,"
+            " duration_minutes, materials, instructions) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            tools._project_to_row(project),
+        )
+        # free-form SQL may store plain text rather than JSON
+        conn.execute(
+            "UPDATE projects SET materials = 'pebbles, glue' WHERE project_id = ?",
+            (project.project_id,),
+        )
+
+    assert tools.search_projects("pebbles")[0]["project_id"] == project.project_id
+    assert tools.search_projects("shells")[0]["project_id"] == project.project_id
+
+    with sqlite3.connect(project_db) as conn:
+        conn.execute("DELETE FROM projects WHERE project_id = ?", (project.project_id,))
+    assert tools.search_projects("collage") == []
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+
+import toddle_ops.agents.project_database_team.tools as tools
+import toddle_ops.agents.project_database_team.transfer as transfer
+
+
+@pytest.fixture
+def catalog(project_db, make_project):
+    projects = [make_project(name=f"Project {i}") for i in range(7)]
+    tools.create_projects(projects)
+    return sorted(projects, key=lambda p: p.project_id)
+
+
+@pytest.mark.parametrize("filename", ["catalog.ndjson", "catalog.ndjson.gz"])
+def test_round_trip(catalog, tmp_path, monkeypatch, filename):
+    path = tmp_path / filename
+    exported = []
+
+    assert transfer.export_projects(path, batch_size=3, progress=exported.append) == 7
+    assert exported == [3, 6, 7]
+    assert (path.read_bytes()[:2] == b"\x1f\x8b") == filename.endswith(".gz")
+    assert not path.with_name(path.name + ".partial").exists()
+
+    monkeypatch.setattr(tools, "DATABASE_FILE", tmp_path / "restored.db")
+    tools.init_db()
+    imported = []
+    result = transfer.import_projects(path, batch_size=3, progress=imported.append)
+
+    assert (result.inserted, result.conflicts, result.invalid) == (7, [], [])
+    assert imported == [3, 6, 7]
+    assert tools.list_projects() == catalog
+
+
+def test_round_trip_keeps_catalog_flags(
+    project_db, tmp_path, monkeypatch, make_project
+):
+    approved = make_project(name="Approved")
+    draft = make_project(name="Draft")
+    tools.create_projects([approved], qa_approved=True)
+    tools.create_projects([draft])
+    with tools._get_db_connection() as conn:
+        conn.execute(
+            "UPDATE projects SET duplicate_of = ? WHERE project_id = ?",
+            (approved.project_id, draft.project_id),
+        )
+    path = tmp_path / "backup.ndjson"
+    transfer.export_projects(path)
+
+    monkeypatch.setattr(tools, "DATABASE_FILE", tmp_path / "restored.db")
+    tools.init_db()
+    transfer.import_projects(path)
+
+    with tools._get_db_connection() as conn:
+        rows = conn.execute(
+            "SELECT name, qa_approved, duplicate_of FROM projects ORDER BY name"
+        ).fetchall()
+    assert [tuple(row) for row in rows] == [
+        ("Approved", 1, None),
+        ("Draft", 0, approved.project_id),
+    ]
+
+
+def test_import_skips_invalid_lines(project_db, tmp_path, make_project):
+    good = make_project(name="Good")
+    path = tmp_path / "mixed.ndjson"
+    path.write_text(
+        "\n".join(
+            [
+                good.model_dump_json(),
+                "",
+                '{"name": "Missing everything else"}',
+                "{not json",
+                json.dumps({**good.model_dump(mode="json"), "project_id": "second"}),
+            ]
+        )
+    )
+
+    result = transfer.import_projects(path, batch_size=10)
+
+    assert result.inserted == 2
+    assert result.invalid == [3, 4]
+    assert {p.project_id for p in tools.list_projects()} == {good.project_id, "second"}
+
+
+def test_import_conflicts_keep_or_overwrite(catalog, tmp_path):
+    path = tmp_path / "catalog.ndjson.gz"
+    transfer.export_projects(path)
+    tools.update_project(catalog[0].project_id, {"name": "Renamed"})
+
+    kept = transfer.import_projects(path)
+    assert (kept.inserted, len(kept.conflicts)) == (0, 7)
+    assert tools.get_project(catalog[0].project_id).name == "Renamed"
+
+    overwritten = transfer.import_projects(path, overwrite=True)
+    assert overwritten.updated == 7
+    assert tools.get_project(catalog[0].project_id) == catalog[0]
+
+
+def test_failed_export_leaves_no_file(catalog, tmp_path):
+    path = tmp_path / "catalog.ndjson"
+
+    def fail(count):
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        transfer.export_projects(path, batch_size=2, progress=fail)
+    assert list(tmp_path.glob("catalog*")) == []
+
+
+def test_gzip_is_detected_without_suffix(catalog, tmp_path):
+    path = tmp_path / "backup"
+    transfer.export_projects(path, compress=True)
+    with gzip.open(path, "rt") as f:
+        assert len(f.readlines()) == 7
+    assert transfer.import_projects(path).conflicts
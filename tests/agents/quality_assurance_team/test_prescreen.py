@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents import BaseAgent, LoopAgent
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from pydantic import Field
+
+import toddle_ops.agents.quality_assurance_team.prescreen as prescreen_module
+from toddle_ops.agents.quality_assurance_team.prescreen import (
+    ApprovalGate,
+    finish_critic,
+    finish_refiner,
+    prescreen,
+    screen_before_critic,
+    start_refiner,
+)
+from toddle_ops.agents.quality_assurance_team.verdicts import VerdictMemo
+
+
+@pytest.mark.parametrize(
+    ("materials", "instructions", "verdict"),
+    [
+        ("crayons, paper", "Scribble on the paper.", "pass"),
+        ("2 paper plates, washable paint, glue stick", "Paint the plates.", "pass"),
+        ("marbles, paper", "Roll the marbles on paint.", "fail"),
+        ("bleach, cotton", "Soak the cotton.", "fail"),
+        ("paper, button batteries", "Make a light.", "fail"),
+        ("paper, glue", "Keep buttons out of reach.", "unsure"),
+        ("paper, scissors", "An adult cuts the paper.", "unsure"),
+        ("paper, pinecones", "Roll the pinecones in paint.", "unsure"),
+    ],
+)
+def test_verdicts(make_project, materials, instructions, verdict):
+    project = make_project(materials=materials, instructions=instructions)
+    assert prescreen(project).verdict == verdict
+
+
+@pytest.mark.parametrize(
+    ("materials", "instructions"),
+    [
+        ("cotton balls, glue, paper plate", "Glue cotton balls on to make a sheep."),
+        ("balloons, paint, paper", "An adult inflates a balloon for stamping."),
+        ("marshmallows, spaghetti", "Build towers with a grown-up."),
+    ],
+)
+def test_common_projects_go_to_the_critic(make_project, materials, instructions):
+    # supervised staples of toddler crafts are judged, not rejected
+    project = make_project(materials=materials, instructions=instructions)
+    assert prescreen(project).verdict == "unsure"
+
+
+def test_rolling_pin_is_not_a_pin(make_project):
+    project = make_project(
+        materials="play dough, rolling pin", instructions="Roll the dough flat."
+    )
+    assert prescreen(project).verdict == "pass"
+
+
+def test_fail_report_names_the_hazard(make_project):
+    result = prescreen(make_project(materials="paper, marbles"))
+    report = result.to_report()
+    assert report.status == "NEEDS_REVISION"
+    assert "marble (choking)" in report.summary
+
+
+class _Stub(BaseAgent):
+    """Stands in for an LLM agent; counts runs and writes `state_delta`."""
+
+    runs: int = 0
+    state_delta: dict = Field(default_factory=dict)
+
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        self.runs += 1
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=self.state_delta),
+        )
+
+
+def _run_loop(project):
+    critic = _Stub(
+        name="SafetyCriticAgent",
+        state_delta={"safety_report": {"status": "APPROVED", "summary": "ok"}},
+        before_agent_callback=screen_before_critic,
+        after_agent_callback=finish_critic,
+    )
+    refiner = _Stub(
+        name="SafetyRefinerAgent",
+        before_agent_callback=start_refiner,
+        after_agent_callback=finish_refiner,
+    )
+    gate = ApprovalGate(name="SafetyApprovalGate")
+    loop = LoopAgent(name="Loop", sub_agents=[critic, gate, refiner], max_iterations=2)
+
+    async def scenario():
+        sessions = InMemorySessionService()
+        session = await sessions.create_session(
+            app_name="test",
+            user_id="user",
+            state={"standard_project": project.model_dump(mode="json")},
+        )
+        runner = Runner(agent=loop, app_name="test", session_service=sessions)
+        async for _ in runner.run_async(
+            user_id="user",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="go")]),
+        ):
+            pass
+        session = await sessions.get_session(
+            app_name="test", user_id="user", session_id=session.id
+        )
+        return session.state
+
+    state = asyncio.run(scenario())
+    return critic.runs, refiner.runs, state
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    """Fresh pre-screen counters, and no verdict memo unless a test adds one."""
+    fresh = prescreen_module.PrescreenStats()
+    monkeypatch.setattr(prescreen_module, "prescreen_stats", fresh)
+    monkeypatch.setattr(prescreen_module, "verdict_memo", VerdictMemo())
+    return fresh
+
+
+def test_clear_pass_skips_both_llm_agents(make_project, stats):
+    critic_runs, refiner_runs, state = _run_loop(make_project(materials="crayons"))
+
+    assert (critic_runs, refiner_runs) == (0, 0)
+    assert state["safety_report"]["status"] == "APPROVED"
+    assert stats.stats()["skipped_llm_calls"] == {"critic": 1, "refiner": 1}
+
+
+def test_clear_fail_goes_straight_to_the_refiner(make_project, stats):
+    critic_runs, refiner_runs, state = _run_loop(make_project(materials="marbles"))
+
+    # both loop iterations: pre-screen fails it, the refiner revises
+    assert (critic_runs, refiner_runs) == (0, 2)
+    assert state["safety_report"]["status"] == "NEEDS_REVISION"
+    assert stats.stats()["fail"] == 2
+
+
+def test_ambiguous_project_runs_the_critic(make_project, stats):
+    critic_runs, refiner_runs, _ = _run_loop(make_project(materials="pinecones"))
+
+    # the (stub) critic approves, so the refiner's exit_loop call is skipped
+    assert (critic_runs, refiner_runs) == (1, 0)
+    result = stats.stats()
+    assert result["unsure"] == 1 and result["hit_rate"] == 0.0
+    assert stats.llm_runs["critic"] == 1
+
+
+def test_memoized_verdicts_skip_repeat_reviews(
+    project_db, make_project, stats, monkeypatch
+):
+    memo = VerdictMemo(rubric="test")
+    monkeypatch.setattr(prescreen_module, "verdict_memo", memo)
+    project = make_project(materials="pinecones")
+
+    first = _run_loop(project)
+    second = _run_loop(project)
+
+    assert first[:2] == (1, 0)
+    assert second[:2] == (0, 0)
+    assert second[2]["safety_report"]["status"] == "APPROVED"
+    assert stats.stats()["memo_hits"] == 1
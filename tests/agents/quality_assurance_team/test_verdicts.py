@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from toddle_ops.agents.quality_assurance_team.verdicts import (
+    VerdictMemo,
+    content_hash,
+)
+from toddle_ops.models.projects import SafetyReport
+
+REPORT = SafetyReport(status="APPROVED", summary="Supervised pinecone painting.")
+
+
+def test_content_hash_ignores_formatting_and_name(make_project):
+    project = make_project()
+    same = make_project(
+        name="Sunny Plate",
+        materials="Paper plate,  yellow paint,\n paintbrush, Glue stick",
+        instructions="  paint the plate.\nGlue on the rays.   Let it dry. ",
+    )
+    different = make_project(instructions="Paint the plate and eat the paint.")
+
+    assert content_hash(project) == content_hash(same)
+    assert content_hash(project) != content_hash(different)
+
+
+def test_content_hash_keeps_sizes_and_quantities(make_project):
+    # canonical materials would drop "large"/"small", which a verdict
+    # about choking depends on
+    large = make_project(materials="large pom-poms, glue, paper")
+    small = make_project(materials="small pom-poms, glue, paper")
+    assert content_hash(large) != content_hash(small)
+
+
+def test_memo_round_trip(project_db, make_project):
+    memo = VerdictMemo(rubric="v1")
+    project = make_project()
+
+    assert memo.get(project) is None
+    memo.put(project, REPORT)
+    assert memo.get(project) == REPORT
+    assert (memo.hits, memo.misses) == (1, 1)
+
+
+def test_rubric_change_invalidates(project_db, make_project):
+    project = make_project()
+    VerdictMemo(rubric="v1").put(project, REPORT)
+
+    memo = VerdictMemo(rubric="v2")
+    assert memo.get(project) is None
+    # verdicts from older rubrics are purged on first use
+    VerdictMemo(rubric="v1")
+    assert VerdictMemo(rubric="v1").get(project) is None
+
+
+def test_empty_rubric_disables_the_memo(project_db, make_project):
+    memo = VerdictMemo()
+    memo.put(make_project(), REPORT)
+    assert memo.get(make_project()) is None
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import toddle_ops.agents.project_database_team.async_tools as async_tools
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.project_database_team.connection import close_pools
+from toddle_ops.models.projects import Difficulty, Project
+
+
+@pytest.fixture(autouse=True)
+def _close_pools():
+    """Drops pooled connections and caches so tests never share state."""
+    yield
+    close_pools()
+    tools.project_cache.clear()
+    if async_tools._connections:
+        asyncio.run(async_tools.close_connections())
+
+
+@pytest.fixture
+def project_db(tmp_path, monkeypatch):
+    """Points the project tools at a fresh, initialized database."""
+    monkeypatch.setattr(tools, "DATABASE_FILE", tmp_path / "projects.db")
+    tools.init_db()
+    return tmp_path / "projects.db"
+
+
+@pytest.fixture
+def make_project():
+    """Factory for valid `Project` objects."""
+
+    def _make(**overrides) -> Project:
+        data = {
+            "name": "Paper Plate Sun",
+            "description": "Paint a paper plate yellow and add paper rays.",
+            "difficulty": Difficulty.EASY,
+            "duration_minutes": 20,
+            "materials": "paper plate, yellow paint, paintbrush, glue stick",
+            "instructions": "Paint the plate. Glue on the rays. Let it dry.",
+        }
+        data.update(overrides)
+        return Project(**data)
+
+    return _make
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from pydantic import Field
+
+import toddle_ops.agents.project_database_team.tools as tools
+import toddle_ops.helpers.batch as batch
+from toddle_ops.helpers.batch import run_batch
+from toddle_ops.models.projects import Difficulty, Project
+
+
+class _StubPipeline(BaseAgent):
+    """Makes a project named after the prompt; "unsafe" ones fail QA."""
+
+    in_flight: int = 0
+    max_in_flight: int = 0
+    fail_on: set[str] = Field(default_factory=set)
+
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        prompt = ctx.user_content.parts[0].text
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if prompt in self.fail_on:
+            raise RuntimeError("503 Service Unavailable")
+        project = Project(
+            name=f"{prompt.title()} Craft",
+            description=f"A project about {prompt}.",
+            difficulty=Difficulty.EASY,
+            duration_minutes=15,
+            materials=f"{prompt} stickers, paper",
+            instructions=f"Stick the {prompt} stickers on {prompt} paper.",
+        )
+        status = "NEEDS_REVISION" if prompt.startswith("unsafe") else "APPROVED"
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(
+                state_delta={
+                    "standard_project": project.model_dump(mode="json"),
+                    "safety_report": {"status": status},
+                }
+            ),
+        )
+
+
+def _runner(pipeline):
+    return Runner(
+        agent=pipeline, app_name="batch", session_service=InMemorySessionService()
+    )
+
+
+PROMPTS = ["dinosaur", "rainbow", "unsafe magnets", "ocean", "garden", "space"]
+
+
+def test_batch_saves_approved_projects(project_db, tmp_path):
+    pipeline = _StubPipeline(name="Pipeline")
+    prompts = tmp_path / "prompts.txt"
+    prompts.write_text("  # overnight run\n" + "\n".join(PROMPTS) + "\n\n")
+    seen = []
+
+    result = asyncio.run(
+        run_batch(
+            _runner(pipeline),
+            prompts,
+            checkpoint=tmp_path / "checkpoint.jsonl",
+            concurrency=2,
+            flush_size=2,
+            progress=lambda done, total: seen.append((done, total)),
+        )
+    )
+
+    assert pipeline.max_in_flight == 2
+    assert len(result.saved) == 5
+    assert result.rejected == [2]
+    assert seen[-1] == (6, 6)
+    assert {project.name for project in tools.list_projects()} == {
+        f"{p.title()} Craft" for p in PROMPTS if not p.startswith("unsafe")
+    }
+    with tools._get_db_connection() as conn:
+        assert (
+            conn.execute(
+                "SELECT COUNT(*) FROM projects WHERE qa_approved = 1"
+            ).fetchone()[0]
+            == 5
+        )
+
+
+def test_batch_resumes_from_checkpoint(project_db, tmp_path):
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    flaky = _StubPipeline(name="Pipeline", fail_on={"ocean", "space"})
+
+    first = asyncio.run(
+        run_batch(_runner(flaky), PROMPTS, checkpoint=checkpoint, flush_size=1)
+    )
+    assert sorted(first.failed) == [3, 5]
+    # a crash can leave a torn last line behind
+    with checkpoint.open("a") as f:
+        f.write('{"index": 3, "pro')
+
+    pipeline = _StubPipeline(name="Pipeline")
+    second = asyncio.run(run_batch(_runner(pipeline), PROMPTS, checkpoint=checkpoint))
+
+    assert second.skipped == 4
+    assert len(second.saved) == 2 and second.failed == []
+    assert len(tools.list_projects()) == 5
+    entries = [
+        json.loads(line)
+        for line in checkpoint.read_text().splitlines()
+        if line.endswith("}")
+    ]
+    assert sorted(entry["index"] for entry in entries) == list(range(6))
+
+
+def test_batch_setup_runs_off_the_event_loop(project_db, tmp_path, monkeypatch):
+    threads = {}
+
+    def recorded(module, name):
+        original = getattr(module, name)
+
+        def wrapper(*args, **kwargs):
+            threads[name] = threading.current_thread()
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(module, name, wrapper)
+
+    recorded(batch, "read_prompts")
+    recorded(batch, "_load_checkpoint")
+    recorded(tools, "init_db")
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    checkpoint.write_text('{"index": 0, "pro')
+
+    asyncio.run(
+        run_batch(
+            _runner(_StubPipeline(name="Pipeline")), PROMPTS[:2], checkpoint=checkpoint
+        )
+    )
+
+    assert set(threads) == {"read_prompts", "_load_checkpoint", "init_db"}
+    assert threading.main_thread() not in threads.values()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+
+from google.adk.agents import LlmAgent
+from google.adk.evaluation.eval_case import IntermediateData, Invocation
+from google.adk.evaluation.eval_set import EvalCase, EvalSet
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from toddle_ops.helpers.evals import graph_hash, run_evals
+from toddle_ops.services.fake_llm import FakeGemini
+
+CONFIG = {"criteria": {"tool_trajectory_avg_score": 1.0}}
+
+
+def count_crayons(box: str) -> dict:
+    """Counts the crayons in a box."""
+    return {"crayons": 3}
+
+
+def _worker(llm_request: LlmRequest, call: int) -> list[types.Part]:
+    last = llm_request.contents[-1].parts[0]
+    if last.function_response:
+        return [types.Part(text="Use 3 crayons.")]
+    return [
+        types.Part(
+            function_call=types.FunctionCall(name="count_crayons", args={"box": "big"})
+        )
+    ]
+
+
+def _agent(llm: FakeGemini, instruction: str = "Count.") -> LlmAgent:
+    return LlmAgent(
+        name="Worker", model=llm, instruction=instruction, tools=[count_crayons]
+    )
+
+
+def _eval_set(boxes: list[str]) -> EvalSet:
+    def case(index: int, box: str) -> EvalCase:
+        return EvalCase(
+            eval_id=f"case_{index}",
+            conversation=[
+                Invocation(
+                    user_content=types.Content(
+                        role="user", parts=[types.Part(text=f"count {index}")]
+                    ),
+                    final_response=types.Content(
+                        role="model", parts=[types.Part(text="Use 3 crayons.")]
+                    ),
+                    intermediate_data=IntermediateData(
+                        tool_uses=[
+                            types.FunctionCall(name="count_crayons", args={"box": box})
+                        ]
+                    ),
+                )
+            ],
+        )
+
+    return EvalSet(
+        eval_set_id="crayons",
+        eval_cases=[case(index, box) for index, box in enumerate(boxes)],
+    )
+
+
+def _run(agent, eval_set, cache, **kwargs):
+    return asyncio.run(
+        run_evals(agent, [eval_set], workers=2, config=CONFIG, cache=cache, **kwargs)
+    )
+
+
+def test_skips_cases_that_passed_unchanged(tmp_path):
+    cache = tmp_path / "cache.json"
+    llm = FakeGemini(script={"Worker": _worker})
+    eval_set = _eval_set(["big", "big", "big"])
+
+    first = _run(_agent(llm), eval_set, cache)
+    assert first.count("passed") == 3
+    assert llm.calls == 6
+    assert first.agents["Worker"]["count"] == 3
+
+    second = _run(_agent(llm), eval_set, cache)
+    assert second.count("skipped") == 3
+    assert llm.calls == 6
+    assert second.cases[0].scores == {"tool_trajectory_avg_score": 1.0}
+
+    # a new instruction changes the graph hash, so every case runs again
+    third = _run(_agent(llm, "Count carefully."), eval_set, cache)
+    assert third.count("passed") == 3
+    assert llm.calls == 12
+
+
+def test_failed_cases_run_again(tmp_path):
+    cache = tmp_path / "cache.json"
+    llm = FakeGemini(script={"Worker": _worker})
+    eval_set = _eval_set(["big", "small"])
+
+    first = _run(_agent(llm), eval_set, cache)
+    assert [case.status for case in first.cases] == ["passed", "failed"]
+
+    second = _run(_agent(llm), eval_set, cache)
+    assert [case.status for case in second.cases] == ["skipped", "failed"]
+
+    third = _run(_agent(llm), eval_set, cache, rerun=True)
+    assert third.count("skipped") == 0
+
+
+def test_graph_hash_ignores_the_agent_object():
+    llm = FakeGemini()
+    assert graph_hash(_agent(llm)) == graph_hash(_agent(llm))
+    assert graph_hash(_agent(llm)) != graph_hash(_agent(llm, "Count twice."))
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from toddle_ops.helpers.stream import (
+    ProjectRenderer,
+    partial_fields,
+    stream_project,
+    stream_text,
+)
+
+PROJECT_JSON = (
+    '```json\n{"project_id": "p-1", "name": "Sponge \\"Stamps\\"", '
+    '"description": "Stamp shapes.", "difficulty": "easy", '
+    '"duration_minutes": 15, "materials": "sponges, paint", '
+    '"instructions": "Dip the sponge.\\nPress it on paper."}\n```'
+)
+
+RENDERED = (
+    'Sponge "Stamps"\n\nStamp shapes.\n\nDifficulty: easy\n\n'
+    "Duration (minutes): 15\n\nMaterials: sponges, paint\n\n"
+    "Instructions: Dip the sponge.\nPress it on paper."
+)
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class _ChunkedLlm(BaseLlm):
+    """Streams `text` in small chunks when asked to, like Gemini with SSE."""
+
+    text: str
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        if stream:
+            for chunk in _chunks(self.text, 7):
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                    partial=True,
+                )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=self.text)])
+        )
+
+
+def test_partial_fields_reads_an_unfinished_object():
+    fields = partial_fields('{"name": "Leaf \\"Pri')
+    assert fields == {"name": ('Leaf "Pri', False)}
+
+    fields = partial_fields('{"name": "Leaf", "duration_minutes": 1')
+    # the number may still grow, so it is left out
+    assert fields == {"name": ("Leaf", True)}
+
+
+@pytest.mark.parametrize("size", [1, 3, 16, len(PROJECT_JSON)])
+def test_renderer_output_does_not_depend_on_chunking(size):
+    renderer = ProjectRenderer()
+    rendered = "".join(renderer.feed(chunk) for chunk in _chunks(PROJECT_JSON, size))
+    assert rendered == RENDERED
+    assert renderer.buffer == PROJECT_JSON
+
+
+def test_renderer_passes_prose_through():
+    renderer = ProjectRenderer()
+    text = "Here is a project: make leaf prints."
+    assert "".join(renderer.feed(chunk) for chunk in _chunks(text, 4)) == text
+
+
+def test_stream_text_yields_editor_chunks_once():
+    llm = _ChunkedLlm(model="fake", text=PROJECT_JSON)
+    editor = LlmAgent(name="EditorialAgent", model=llm, instruction="Edit.")
+
+    async def scenario():
+        sessions = InMemorySessionService()
+        runner = Runner(agent=editor, app_name="test", session_service=sessions)
+        session = await sessions.create_session(app_name="test", user_id="user")
+        chunks = [
+            chunk
+            async for chunk in stream_text(runner, "user", session.id, "a project")
+        ]
+        out = io.StringIO()
+        await stream_project(runner, "user", session.id, "another", out=out)
+        return chunks, out.getvalue()
+
+    chunks, printed = asyncio.run(scenario())
+
+    assert len(chunks) > 1
+    # the aggregated final event is not repeated
+    assert "".join(chunks) == PROJECT_JSON
+    assert printed == RENDERED + "\n"
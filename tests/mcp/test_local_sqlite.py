@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+
+from toddle_ops.mcp.local_sqlite import LocalSqliteToolset
+from toddle_ops.mcp.sqlite import make_sqlite_toolset
+
+
+def test_tools_match_the_mcp_server(tmp_path):
+    toolset = LocalSqliteToolset(tmp_path / "data.db")
+    tools = asyncio.run(toolset.get_tools())
+    assert [tool.name for tool in tools] == [
+        "read_query",
+        "write_query",
+        "create_table",
+        "list_tables",
+        "describe_table",
+    ]
+
+    filtered = LocalSqliteToolset(tmp_path / "data.db", tool_filter=["read_query"])
+    assert [tool.name for tool in asyncio.run(filtered.get_tools())] == ["read_query"]
+
+
+def test_queries_round_trip(tmp_path):
+    toolset = LocalSqliteToolset(tmp_path / "data.db")
+
+    async def scenario():
+        created = await toolset.create_table(
+            "CREATE TABLE toddle_ops_projects (id INTEGER PRIMARY KEY, name TEXT)"
+        )
+        written = await toolset.write_query(
+            "INSERT INTO toddle_ops_projects (name) VALUES ('Glue Art'), ('Leaf Rubbing')"
+        )
+        rows = await toolset.read_query(
+            "SELECT name FROM toddle_ops_projects ORDER BY id"
+        )
+        tables = await toolset.list_tables()
+        columns = await toolset.describe_table("toddle_ops_projects")
+        await toolset.close()
+        return created, written, rows, tables, columns
+
+    created, written, rows, tables, columns = asyncio.run(scenario())
+
+    assert created == "Table created successfully"
+    assert written == [{"affected_rows": 2}]
+    assert rows == [{"name": "Glue Art"}, {"name": "Leaf Rubbing"}]
+    assert tables == [{"name": "toddle_ops_projects"}]
+    assert [column["name"] for column in columns] == ["id", "name"]
+
+
+def test_errors_are_returned_to_the_model(tmp_path):
+    toolset = LocalSqliteToolset(tmp_path / "data.db")
+
+    async def scenario():
+        results = [
+            await toolset.read_query("DELETE FROM anything"),
+            await toolset.write_query("SELECT 1"),
+            await toolset.create_table("DROP TABLE anything"),
+            await toolset.read_query("SELECT * FROM missing"),
+            await toolset.describe_table("missing"),
+        ]
+        await toolset.close()
+        return results
+
+    for result in asyncio.run(scenario()):
+        assert set(result) == {"error"}
+
+
+def test_config_switch(tmp_path):
+    assert isinstance(
+        make_sqlite_toolset("local", tmp_path / "a.db"), LocalSqliteToolset
+    )
+    assert isinstance(make_sqlite_toolset("mcp", str(tmp_path / "a.db")), McpToolset)
+    with pytest.raises(ValueError):
+        make_sqlite_toolset("carrier-pigeon")
+
+
+def test_a_failed_write_never_rolls_back_another(tmp_path):
+    toolset = LocalSqliteToolset(tmp_path / "data.db")
+
+    async def scenario():
+        await toolset.create_table(
+            "CREATE TABLE toddle_ops_projects (id INTEGER PRIMARY KEY, name TEXT)"
+        )
+        writes = []
+        for i in range(20):
+            writes.append(
+                toolset.write_query(
+                    f"INSERT INTO toddle_ops_projects (name) VALUES ('Project {i}')"
+                )
+            )
+            # fails after starting its transaction and rolls it back
+            writes.append(
+                toolset.write_query(
+                    "INSERT INTO toddle_ops_projects (id, name) VALUES (1, 'again')"
+                )
+            )
+        await asyncio.gather(*writes)
+        rows = await toolset.read_query("SELECT COUNT(*) AS n FROM toddle_ops_projects")
+        await toolset.close()
+        return rows
+
+    assert asyncio.run(scenario()) == [{"n": 20}]
+
+
+def test_one_toolset_serves_several_event_loops(tmp_path):
+    # like the module-level toolset, shared by successive `asyncio.run` calls
+    toolset = LocalSqliteToolset(tmp_path / "data.db")
+
+    async def scenario(name):
+        await toolset.write_query(
+            "CREATE TABLE IF NOT EXISTS toddle_ops_projects (name TEXT)"
+        )
+        await asyncio.gather(
+            *(
+                toolset.write_query(
+                    f"INSERT INTO toddle_ops_projects (name) VALUES ('{name} {i}')"
+                )
+                for i in range(5)
+            )
+        )
+        return await toolset.read_query("SELECT COUNT(*) AS n FROM toddle_ops_projects")
+
+    assert asyncio.run(scenario("first")) == [{"n": 5}]
+    assert asyncio.run(scenario("second")) == [{"n": 10}]
+    asyncio.run(toolset.close())
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import json
 import uuid
 
-from toddle_ops.models.projects import Difficulty, Project
+import pytest
+
+from toddle_ops.models.projects import Difficulty, Project, parse_project
 
 
 def test_create_project():
@@ -26,3 +29,34 @@ def test_create_project():
     assert project.materials[0].name == "paper"
     assert len(project.instructions) == 2
     assert isinstance(project.project_id, uuid.UUID)
+
+
+@pytest.mark.parametrize(
+    "wrap",
+    [
+        lambda data: data,
+        json.dumps,
+        lambda data: f"```json\n{json.dumps(data, indent=2)}\n```",
+    ],
+)
+def test_parse_project_from_state(wrap):
+    """Dicts, JSON strings and fenced JSON from agent output all parse."""
+    data = {
+        "name": "Sock Puppets",
+        "description": "Turn old socks into puppets.",
+        "difficulty": "easy",
+        "duration_minutes": 15,
+        "materials": "socks, markers",
+        "instructions": "Draw faces on the socks.",
+    }
+    project = parse_project(wrap(data))
+    assert project.name == "Sock Puppets"
+    assert project.difficulty == Difficulty.EASY
+
+
+@pytest.mark.parametrize(
+    "value", ["Here is your project!", "[]", {"name": "x"}, None, 42]
+)
+def test_parse_project_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_project(value)
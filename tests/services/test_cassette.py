@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.apps.app import App
+from google.adk.memory import InMemoryMemoryService
+from google.adk.models.llm_request import LlmRequest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.root_agent.agent import root_agent
+from toddle_ops.helpers.run import approved_project
+from toddle_ops.services.cassette import CassetteMiss, CassettePlugin, model_key
+from toddle_ops.services.fake_llm import (
+    DEFAULT_SCRIPT,
+    FakeGemini,
+    fake_models,
+    fake_project,
+)
+from toddle_ops.services.research_cache import research_cache
+
+tool_calls = []
+
+
+def count_crayons(box: str) -> dict:
+    """Counts the crayons in a box."""
+    tool_calls.append(box)
+    return {"crayons": 3}
+
+
+def _worker(llm_request: LlmRequest, call: int) -> list[types.Part]:
+    last = llm_request.contents[-1].parts[0]
+    if last.function_response:
+        count = last.function_response.response["crayons"]
+        return [types.Part(text=f"Use {count} crayons (call {call}).")]
+    return [
+        types.Part(
+            function_call=types.FunctionCall(name="count_crayons", args={"box": "big"})
+        )
+    ]
+
+
+def _run(plugin: CassettePlugin, prompt: str = "go") -> tuple[str, FakeGemini]:
+    llm = FakeGemini(script={"Worker": _worker})
+    agent = LlmAgent(
+        name="Worker", model=llm, instruction="Count.", tools=[count_crayons]
+    )
+
+    async def scenario():
+        sessions = InMemorySessionService()
+        runner = Runner(
+            agent=agent, app_name="test", session_service=sessions, plugins=[plugin]
+        )
+        session = await sessions.create_session(app_name="test", user_id="user")
+        texts = []
+        async for event in runner.run_async(
+            user_id="user",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=prompt)]),
+        ):
+            if event.content and event.content.parts and event.content.parts[0].text:
+                texts.append(event.content.parts[0].text)
+        return texts[-1]
+
+    return asyncio.run(scenario()), llm
+
+
+@pytest.fixture(autouse=True)
+def _reset_tool_calls():
+    tool_calls.clear()
+
+
+def test_replay_serves_recorded_calls_without_running_them(tmp_path):
+    path = tmp_path / "cassette.jsonl.gz"
+    recorded, llm = _run(CassettePlugin(path, mode="record"))
+    assert (llm.calls, len(tool_calls)) == (2, 1)
+
+    replay = CassettePlugin(path, mode="replay")
+    replayed, llm = _run(replay)
+
+    assert replayed == recorded
+    assert (llm.calls, len(tool_calls)) == (0, 1)
+    assert replay.replayed == 3
+
+
+def test_replay_raises_on_unrecorded_calls(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    _run(CassettePlugin(path, mode="record"))
+
+    # ADK's plugin manager re-raises plugin errors as RuntimeError
+    with pytest.raises(RuntimeError, match="no recording") as raised:
+        _run(CassettePlugin(path, mode="replay"), prompt="something else")
+    assert isinstance(raised.value.__cause__, CassetteMiss)
+
+
+def test_auto_records_only_what_is_missing(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    _run(CassettePlugin(path, mode="record"))
+
+    auto = CassettePlugin(path, mode="auto")
+    _run(auto)
+    _run(auto, prompt="something else")
+
+    # the new prompt needs a first model call; the tool call is shared
+    assert (auto.replayed, auto.recorded) == (4, 2)
+    assert len(CassettePlugin(path, mode="replay").cassette) == 5
+
+
+def test_model_key_ignores_function_call_ids():
+    def request(call_id: str) -> LlmRequest:
+        call = types.FunctionCall(id=call_id, name="count_crayons", args={})
+        return LlmRequest(
+            model="gemini-2.5-flash-lite",
+            contents=[
+                types.Content(role="model", parts=[types.Part(function_call=call)])
+            ],
+        )
+
+    assert model_key("Worker", request("adk-1")) == model_key(
+        "Worker", request("adk-2")
+    )
+    assert model_key("Worker", request("adk-1")) != model_key("Other", request("adk-1"))
+
+
+def test_model_key_pins_generated_ids():
+    def request(*project_ids: str) -> LlmRequest:
+        text = " and ".join(f"project {project_id}" for project_id in project_ids)
+        return LlmRequest(
+            model="gemini-2.5-flash-lite",
+            contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+        )
+
+    a, b = str(uuid.uuid4()), str(uuid.uuid4())
+    assert model_key("Editor", request(a)) == model_key("Editor", request(b))
+    # which IDs repeat still counts
+    assert model_key("Editor", request(a, b)) != model_key("Editor", request(a, a))
+
+
+def _synthesize_without_id(llm_request: LlmRequest, call: int) -> list[types.Part]:
+    # like the real model, leave the ID out, so every run generates its own
+    project = fake_project(call).model_dump(mode="json", exclude={"project_id"})
+    return [types.Part(text=json.dumps(project))]
+
+
+def _run_root_agent(plugin: CassettePlugin, llm: FakeGemini) -> dict:
+    app = App(name="test", root_agent=root_agent, plugins=[plugin])
+    runner = Runner(
+        app=app,
+        session_service=InMemorySessionService(),
+        memory_service=InMemoryMemoryService(),
+    )
+
+    async def scenario():
+        sessions = runner.session_service
+        session = await sessions.create_session(app_name="test", user_id="user")
+        async for _ in runner.run_async(
+            user_id="user",
+            session_id=session.id,
+            new_message=types.Content(
+                role="user", parts=[types.Part(text="Please provide a project.")]
+            ),
+        ):
+            pass
+        session = await sessions.get_session(
+            app_name="test", user_id="user", session_id=session.id
+        )
+        return session.state
+
+    with fake_models(root_agent, llm):
+        return asyncio.run(scenario())
+
+
+def test_root_agent_replays_offline(tmp_path, monkeypatch):
+    monkeypatch.setattr(research_cache, "path", tmp_path / "research.db")
+    monkeypatch.setattr(research_cache, "_ready", False)
+    path = tmp_path / "cassette.jsonl"
+    script = {**DEFAULT_SCRIPT, "ProjectSynthesizer": _synthesize_without_id}
+
+    monkeypatch.setattr(tools, "DATABASE_FILE", tmp_path / "recorded.db")
+    recorder = CassettePlugin(path, mode="record")
+    recorded = _run_root_agent(recorder, FakeGemini(script=script))
+
+    # a fresh database and research cache, so nothing is served from them
+    monkeypatch.setattr(tools, "DATABASE_FILE", tmp_path / "replayed.db")
+    research_cache.clear()
+    llm = FakeGemini(script=script)
+    replay = CassettePlugin(path, mode="replay")
+    replayed = _run_root_agent(replay, llm)
+
+    # the editor's prompt carries the new project's generated ID, and the
+    # researchers the hedged team cancelled left nothing to replay
+    assert llm.calls == 0
+    assert replay.replayed == recorder.recorded
+    assert approved_project(replayed) == approved_project(recorded)
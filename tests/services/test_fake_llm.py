@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+
+from google.adk.memory import InMemoryMemoryService
+from google.adk.models.llm_request import LlmRequest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+import toddle_ops.agents.project_database_team.tools as tools
+import toddle_ops.agents.quality_assurance_team.agent as qa
+from toddle_ops.agents.root_agent.agent import root_agent
+from toddle_ops.helpers.run import approved_project
+from toddle_ops.models.projects import Project
+from toddle_ops.services.fake_llm import FakeGemini, fake_models
+from toddle_ops.services.research_cache import research_cache
+
+
+def _ask(runner: Runner, text: str) -> dict:
+    async def scenario():
+        sessions = runner.session_service
+        session = await sessions.create_session(app_name="test", user_id="user")
+        async for _ in runner.run_async(
+            user_id="user",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=text)]),
+        ):
+            pass
+        session = await sessions.get_session(
+            app_name="test", user_id="user", session_id=session.id
+        )
+        return session.state
+
+    return asyncio.run(scenario())
+
+
+def test_full_graph_runs_offline(tmp_path, monkeypatch):
+    monkeypatch.setattr(tools, "DATABASE_FILE", tmp_path / "projects.db")
+    tools.init_db()
+    monkeypatch.setattr(research_cache, "path", tmp_path / "research.db")
+    monkeypatch.setattr(research_cache, "_ready", False)
+    runner = Runner(
+        agent=root_agent,
+        app_name="test",
+        session_service=InMemorySessionService(),
+        memory_service=InMemoryMemoryService(),
+    )
+    editor_model = qa.editorial_agent.model
+
+    with fake_models(root_agent, FakeGemini()) as llm:
+        state = _ask(runner, "Please provide a project.")
+
+    project = approved_project(state)
+    assert project is not None and project.name
+    assert state["safety_report"]["status"] == "APPROVED"
+    assert tools.get_project(project.project_id) is not None
+    # researchers, synthesizer, editor and the root agent's two turns
+    assert llm.calls >= 5
+    # agents behind the root agent's AgentTool get their model back too
+    assert qa.editorial_agent.model is editor_model
+
+
+def test_streams_and_reports_usage():
+    llm = FakeGemini(latency=0.01, chunk_size=5)
+    request = LlmRequest(
+        model=llm.model,
+        contents=[types.Content(role="user", parts=[types.Part(text="hi")])],
+        config=types.GenerateContentConfig(
+            system_instruction='Your internal name is "ProjectSynthesizer".'
+        ),
+    )
+
+    async def scenario():
+        return [r async for r in llm.generate_content_async(request, stream=True)]
+
+    responses = asyncio.run(scenario())
+
+    *chunks, final = responses
+    assert all(chunk.partial for chunk in chunks) and len(chunks) > 1
+    text = final.content.parts[0].text
+    assert Project.model_validate_json(text)
+    assert "".join(chunk.content.parts[0].text for chunk in chunks) == text
+    assert final.usage_metadata.candidates_token_count > 0
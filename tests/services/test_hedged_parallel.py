@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from toddle_ops.services.hedged_parallel import HedgedParallelAgent
+
+
+class _Researcher(BaseAgent):
+    """Writes `output_key` after `delay` seconds, or raises if `fail`."""
+
+    output_key: str
+    delay: float = 0.0
+    fail: bool = False
+
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("429 Too Many Requests")
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=self.name)]),
+            actions=EventActions(state_delta={self.output_key: self.name}),
+        )
+
+
+def _run(agent, state: dict | None = None, events: list | None = None):
+    """Runs `agent` once; returns the elapsed seconds and the final state.
+
+    The events, if wanted, are appended to `events`.
+    """
+
+    async def scenario():
+        sessions = InMemorySessionService()
+        session = await sessions.create_session(
+            app_name="test", user_id="user", state=state or {}
+        )
+        runner = Runner(agent=agent, app_name="test", session_service=sessions)
+        start = time.perf_counter()
+        async for event in runner.run_async(
+            user_id="user",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="go")]),
+        ):
+            if events is not None:
+                events.append(event)
+        elapsed = time.perf_counter() - start
+        session = await sessions.get_session(
+            app_name="test", user_id="user", session_id=session.id
+        )
+        return elapsed, session.state
+
+    return asyncio.run(scenario())
+
+
+def _team(**kwargs):
+    return HedgedParallelAgent(
+        name="Team",
+        sub_agents=[
+            _Researcher(name="Fast", output_key="fast", delay=0.01),
+            _Researcher(name="Quick", output_key="quick", delay=0.02),
+            _Researcher(name="Slow", output_key="slow", delay=5),
+        ],
+        outcomes_key="outcomes",
+        **kwargs,
+    )
+
+
+def test_first_k_cancels_stragglers():
+    elapsed, state = _run(_team(min_completed=2), state={"slow": "last request"})
+
+    assert elapsed < 1
+    assert state["fast"] == "Fast" and state["quick"] == "Quick"
+    # the stale result from an earlier request is cleared, not reused
+    assert state["slow"] is None
+    assert state["outcomes"] == {
+        "Fast": "completed",
+        "Quick": "completed",
+        "Slow": "cancelled",
+    }
+
+
+def test_branch_deadline():
+    elapsed, state = _run(_team(branch_timeout=0.2))
+
+    assert elapsed < 1
+    assert state["outcomes"]["Slow"] == "timed_out"
+    assert state["slow"] is None
+
+
+def test_failed_branch_does_not_fail_the_team():
+    team = HedgedParallelAgent(
+        name="Team",
+        sub_agents=[
+            _Researcher(name="Broken", output_key="broken", fail=True),
+            _Researcher(name="Fine", output_key="fine", delay=0.05),
+        ],
+        min_completed=1,
+        outcomes_key="outcomes",
+    )
+
+    _, state = _run(team)
+
+    assert state["outcomes"] == {"Broken": "failed", "Fine": "completed"}
+    assert state["fine"] == "Fine"
+
+
+def test_too_few_completed_branches_is_an_error():
+    team = HedgedParallelAgent(
+        name="Team",
+        sub_agents=[
+            _Researcher(name="Broken", output_key="broken", fail=True),
+            _Researcher(name="Fine", output_key="fine", delay=0.05),
+        ],
+        min_completed=2,
+        outcomes_key="outcomes",
+    )
+    events = []
+
+    _, state = _run(team, events=events)
+
+    assert events[-1].error_code == "BRANCHES_INCOMPLETE"
+    assert state["outcomes"] == {"Broken": "failed", "Fine": "completed"}
+
+
+def test_branches_are_isolated():
+    events = []
+
+    _run(_team(min_completed=2), events=events)
+
+    branches = {event.author: event.branch for event in events if event.content}
+    assert branches == {"Fast": "Team.Fast", "Quick": "Team.Quick"}
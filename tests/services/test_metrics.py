@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents import LlmAgent, LoopAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from toddle_ops.services.metrics import Histogram, MetricsPlugin
+
+MODEL = "gemini-2.5-flash-lite"
+
+
+class _ScriptedLlm(BaseLlm):
+    """Asks for the `count_crayons` tool, then answers, on every turn."""
+
+    fail: bool = False
+
+    async def generate_content_async(
+        self, llm_request, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.fail:
+            raise RuntimeError("503 Service Unavailable")
+        last = llm_request.contents[-1].parts[0]
+        if last.function_response:
+            part = types.Part(text="Use 3 crayons.")
+        else:
+            part = types.Part(
+                function_call=types.FunctionCall(name="count_crayons", args={})
+            )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=1000, candidates_token_count=100
+            ),
+        )
+
+
+def count_crayons() -> dict:
+    """Counts the crayons in the box."""
+    return {"crayons": 3}
+
+
+def _run(plugin: MetricsPlugin, fail: bool = False):
+    worker = LlmAgent(
+        name="Worker",
+        model=_ScriptedLlm(model=MODEL, fail=fail),
+        instruction="Count the crayons.",
+        tools=[count_crayons],
+    )
+    loop = LoopAgent(name="Loop", sub_agents=[worker], max_iterations=2)
+
+    async def scenario():
+        sessions = InMemorySessionService()
+        runner = Runner(
+            agent=loop, app_name="test", session_service=sessions, plugins=[plugin]
+        )
+        session = await sessions.create_session(app_name="test", user_id="user")
+        async for _ in runner.run_async(
+            user_id="user",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text="go")]),
+        ):
+            pass
+
+    asyncio.run(scenario())
+
+
+def test_histogram_quantiles():
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.observe(value)
+
+    summary = histogram.summary()
+    assert (summary["p50"], summary["p95"], summary["p99"]) == (50, 95, 99)
+    assert (summary["count"], summary["sum"], summary["max"]) == (100, 5050, 100)
+
+
+def test_plugin_records_agents_models_tools_and_loops():
+    plugin = MetricsPlugin()
+    _run(plugin)
+    snapshot = plugin.snapshot()
+
+    series = f"Worker/{MODEL}"
+    # two loop iterations of tool call + answer
+    assert snapshot["loop_iterations"]["Loop"]["sum"] == 2
+    assert snapshot["agent_seconds"]["Worker"]["count"] == 2
+    assert snapshot["agent_seconds"]["Loop"]["count"] == 1
+    assert snapshot["model_seconds"][series]["count"] == 4
+    assert snapshot["tool_seconds"]["count_crayons"]["count"] == 2
+    assert snapshot["prompt_tokens"][series] == 4000
+    assert snapshot["completion_tokens"][series] == 400
+    assert snapshot["cost_usd"][series] == pytest.approx(4 * 0.00014)
+    # nothing left in flight once the run is over
+    assert not plugin._started and not plugin._models
+
+
+def test_prometheus_text():
+    plugin = MetricsPlugin()
+    _run(plugin)
+    text = plugin.to_prometheus()
+
+    assert "# TYPE toddle_ops_agent_seconds summary" in text
+    assert 'toddle_ops_agent_seconds{agent="Worker",quantile="0.99"}' in text
+    assert 'toddle_ops_loop_iterations_count{loop="Loop"} 1' in text
+    assert (
+        f'toddle_ops_prompt_tokens_total{{agent="Worker",model="{MODEL}"}} 4000' in text
+    )
+
+
+def test_model_errors_are_counted():
+    plugin = MetricsPlugin()
+    with pytest.raises(RuntimeError):
+        _run(plugin, fail=True)
+
+    assert plugin.snapshot()["model_errors"] == {f"Worker/{MODEL}": 1}
+
+
+def test_spans(monkeypatch):
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(trace, "get_tracer", provider.get_tracer)
+
+    _run(MetricsPlugin(spans=True))
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans["agent Loop"].attributes["toddle_ops.loop_iterations"] == 2
+    assert spans["call_llm Worker"].attributes["toddle_ops.prompt_tokens"] == 1000
+    assert "tool count_crayons" in spans
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+import toddle_ops.agents.project_database_team.tools as tools
+from toddle_ops.agents.materials_team.index import materials_index
+from toddle_ops.models.projects import Difficulty
+from toddle_ops.services.project_cache import (
+    CachedPipelineAgent,
+    CachePolicy,
+    find_cached_project,
+    parse_request,
+)
+from toddle_ops.services.project_pool import ProjectPool
+
+
+class _StubPipeline(BaseAgent):
+    """Stands in for the research + QA pipeline; counts its runs."""
+
+    runs: int = 0
+    project: dict | None = None
+    status: str = "APPROVED"
+
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        self.runs += 1
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text="generated")]),
+            actions=EventActions(
+                state_delta={
+                    "standard_project": self.project,
+                    "safety_report": {"status": self.status},
+                }
+            ),
+        )
+
+
+def _run(agent, requests: list[str]):
+    """Sends each request to `agent` in one session; returns replies and state."""
+
+    async def scenario():
+        sessions = InMemorySessionService()
+        session = await sessions.create_session(app_name="test", user_id="user")
+        runner = Runner(agent=agent, app_name="test", session_service=sessions)
+        replies = []
+        for request in requests:
+            events = [
+                event
+                async for event in runner.run_async(
+                    user_id="user",
+                    session_id=session.id,
+                    new_message=types.Content(
+                        role="user", parts=[types.Part(text=request)]
+                    ),
+                )
+            ]
+            replies.append([e.content.parts[0].text for e in events if e.content])
+        session = await sessions.get_session(
+            app_name="test", user_id="user", session_id=session.id
+        )
+        return replies, session.state
+
+    return asyncio.run(scenario())
+
+
+def _approved(project):
+    saved = tools.create_project(project)
+    tools.mark_qa_approved(saved.project_id)
+    return saved
+
+
+def test_parse_request():
+    known = frozenset({"paper plate", "glue stick", "crayon"})
+    features = parse_request(
+        "An easy dinosaur craft under 15 minutes, we have paper plates and crayons",
+        known,
+    )
+    assert features.difficulty is Difficulty.EASY
+    assert features.max_minutes == 15
+    assert features.materials == {"paper plate", "crayon"}
+    assert features.topics == ("dinosaur",)
+    assert features.key == ("easy", 20, ("crayon", "paper plate"), ("dinosaur",))
+
+    assert parse_request("something for half an hour", known).max_minutes == 30
+    assert parse_request("a 1.5 hour project", known).max_minutes == 90
+    assert parse_request("a challenging project", known).difficulty is Difficulty.HARD
+
+
+def test_find_respects_features(project_db, make_project):
+    sun = _approved(make_project())
+    _approved(make_project(name="Long Sun", duration_minutes=60))
+    tools.create_project(make_project(name="Unreviewed Moon", difficulty="medium"))
+    known = materials_index.known_materials()
+    policy = CachePolicy()
+
+    def find(text, **kwargs):
+        return find_cached_project(parse_request(text, known), policy, **kwargs)
+
+    assert find("easy sun project in 30 minutes") == sun
+    # the medium project was never approved by QA
+    assert find("a medium project") is None
+    # one material may be missing, two may not
+    assert find("20 minutes, paper plate, yellow paint, paintbrush") == sun
+    assert find("20 minutes with a paper plate and glue stick") is None
+    assert find("20 minute rocket craft") is None
+    assert find("20 minutes", exclude_ids=[sun.project_id]) is None
+
+
+def test_stale_projects_are_not_served(project_db, make_project):
+    sun = _approved(make_project())
+    with tools._get_db_connection() as conn:
+        conn.execute(
+            "UPDATE projects SET date_created = datetime('now', '-1 year') "
+            "WHERE project_id = ?",
+            (sun.project_id,),
+        )
+    features = parse_request("easy", frozenset())
+    assert find_cached_project(features, CachePolicy()) is None
+    assert find_cached_project(features, CachePolicy(max_age_days=None)) == sun
+
+
+def test_miss_stores_approved_project_then_hits(project_db, make_project):
+    pipeline = _StubPipeline(
+        name="Pipeline", project=make_project().model_dump(mode="json")
+    )
+    agent = CachedPipelineAgent(
+        name="Cached", sub_agents=[pipeline], policy=CachePolicy(explore_rate=0)
+    )
+
+    replies, state = _run(agent, ["easy sun, 30 minutes", "easy sun, 30 minutes"])
+
+    # the stored project was generated in this session, so it is not served
+    # back; a second session gets it from the cache
+    assert pipeline.runs == 2
+    assert replies[0] == ["generated"]
+    assert len(tools.list_projects()) == 1
+    assert len(state["served_project_ids"]) == 1
+
+    replies, state = _run(agent, ["easy sun, 30 minutes"])
+    assert pipeline.runs == 2
+    assert "Paper Plate Sun" in replies[0][0]
+    assert state["standard_project"]["name"] == "Paper Plate Sun"
+    assert agent.metrics.stats() == {
+        "requests": 3,
+        "hits": 1,
+        "pool_hits": 0,
+        "misses": {"no_match": 2},
+        "stored": 1,
+        "hit_rate": 1 / 3,
+    }
+
+
+def test_rejected_projects_are_not_stored(project_db, make_project):
+    pipeline = _StubPipeline(
+        name="Pipeline",
+        project=make_project().model_dump(mode="json"),
+        status="REVISION_NEEDED",
+    )
+    agent = CachedPipelineAgent(
+        name="Cached", sub_agents=[pipeline], policy=CachePolicy(explore_rate=0)
+    )
+
+    _run(agent, ["easy sun"])
+
+    assert tools.list_projects() == []
+
+
+def test_first_write_to_a_fresh_database(tmp_path, monkeypatch, make_project):
+    """With the lookup off, storing can be the first use of a new database."""
+    monkeypatch.setattr(tools, "DATABASE_FILE", tmp_path / "new.db")
+    pipeline = _StubPipeline(
+        name="Pipeline", project=make_project().model_dump(mode="json")
+    )
+    agent = CachedPipelineAgent(
+        name="Cached", sub_agents=[pipeline], policy=CachePolicy(enabled=False)
+    )
+
+    _run(agent, ["easy sun"])
+
+    assert [p.name for p in tools.list_projects()] == ["Paper Plate Sun"]
+
+
+def test_explore_and_disabled_skip_the_lookup(project_db, make_project):
+    _approved(make_project())
+    pipeline = _StubPipeline(name="Pipeline")
+    explore = CachedPipelineAgent(
+        name="Cached", sub_agents=[pipeline], policy=CachePolicy(explore_rate=1)
+    )
+    _run(explore, ["easy"])
+    assert explore.metrics.misses == {"explore": 1}
+
+    disabled = CachedPipelineAgent(
+        name="Cached",
+        sub_agents=[_StubPipeline(name="Pipeline")],
+        policy=CachePolicy(enabled=False),
+    )
+    _run(disabled, ["easy"])
+    assert disabled.metrics.misses == {"disabled": 1}
+
+
+def test_generic_requests_are_served_from_the_pool(project_db, make_project):
+    async def generate(difficulty):
+        return make_project(name=f"Pooled {difficulty.value}", difficulty=difficulty)
+
+    pipeline = _StubPipeline(name="Pipeline")
+    pool = ProjectPool(generate=generate, depth=1)
+    agent = CachedPipelineAgent(
+        name="Cached",
+        sub_agents=[pipeline],
+        policy=CachePolicy(explore_rate=0),
+        pool=pool,
+    )
+
+    async def fill():
+        pool.start()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(fill())
+    replies, _ = _run(agent, ["Please provide a medium project."])
+
+    assert pipeline.runs == 0
+    assert "Pooled medium" in replies[0][0]
+    assert agent.metrics.pool_hits == 1
+    # served pool projects join the catalog like any other approved result
+    assert [project.name for project in tools.list_projects()] == ["Pooled medium"]
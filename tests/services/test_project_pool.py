@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from google.adk.agents import BaseAgent
+
+import toddle_ops.services.project_pool as project_pool
+from toddle_ops.models.projects import Difficulty, Project
+from toddle_ops.services.project_pool import ProjectPool
+from toddle_ops.services.research_cache import SKIP_CACHE_KEY
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _generator(calls: list, fail: bool = False):
+    async def generate(difficulty: Difficulty):
+        calls.append(difficulty)
+        await asyncio.sleep(0.01)
+        if fail:
+            raise RuntimeError("429 Too Many Requests")
+        return Project(
+            name=f"{difficulty.value.title()} Project {len(calls)}",
+            description="A pre-generated project.",
+            difficulty=difficulty,
+            duration_minutes=10 * len(calls),
+            materials="paper, crayons",
+            instructions="Draw on the paper.",
+        )
+
+    return generate
+
+
+async def _settle(pool: ProjectPool):
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if not any(pool.stats()["in_flight"].values()):
+            return
+
+
+def test_pool_fills_to_depth_and_refills():
+    calls = []
+
+    async def scenario():
+        pool = ProjectPool(generate=_generator(calls), depth=2, concurrency=3)
+        assert pool.take() is None
+        await _settle(pool)
+        ready = pool.stats()["ready"]
+
+        project = pool.take(Difficulty.HARD)
+        await _settle(pool)
+        await pool.stop()
+        return ready, project, pool.stats()
+
+    ready, project, stats = asyncio.run(scenario())
+
+    assert ready == {"easy": 2, "medium": 2, "hard": 2}
+    assert project.difficulty is Difficulty.HARD
+    # the taken project was replaced in the background
+    assert stats["ready"]["hard"] == 2
+    assert len(calls) == 7
+    assert (stats["served"], stats["empty"]) == (1, 1)
+
+
+def test_take_filters_by_duration():
+    async def scenario():
+        pool = ProjectPool(generate=_generator([]), depth=1)
+        pool.start()
+        await _settle(pool)
+        shortest = min(
+            project.duration_minutes
+            for bucket in pool._buckets.values()
+            for project, _ in bucket
+        )
+        fits = pool.take(max_minutes=shortest)
+        too_short = pool.take(max_minutes=shortest - 1)
+        await pool.stop()
+        return shortest, fits, too_short
+
+    shortest, fits, too_short = asyncio.run(scenario())
+
+    assert fits.duration_minutes == shortest
+    assert too_short is None
+
+
+def test_stale_projects_are_evicted():
+    clock = _Clock()
+
+    async def scenario():
+        pool = ProjectPool(
+            generate=_generator([]), depth=1, max_age_seconds=60, clock=clock
+        )
+        pool.start()
+        await _settle(pool)
+        clock.now += 61
+        stale = pool.take(Difficulty.EASY)
+        await _settle(pool)
+        fresh = pool.take(Difficulty.EASY)
+        await pool.stop()
+        return stale, fresh, pool.stats()
+
+    stale, fresh, stats = asyncio.run(scenario())
+
+    assert stale is None
+    assert fresh is not None
+    assert stats["evicted"] == 3
+
+
+def test_failures_back_off():
+    calls = []
+
+    async def scenario():
+        pool = ProjectPool(
+            generate=_generator(calls, fail=True), depth=1, retry_delay=60
+        )
+        pool.start()
+        await asyncio.sleep(0.1)
+        await pool.stop()
+
+    asyncio.run(scenario())
+
+    # one attempt per difficulty, then each slot waits out the retry delay
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("result", ["easy", None])
+def test_fills_that_add_nothing_back_off(result):
+    calls = []
+
+    async def generate(difficulty: Difficulty):
+        # a model that ignores the requested difficulty, or QA rejecting
+        # everything
+        calls.append(difficulty)
+        await asyncio.sleep(0.01)
+        if result is None:
+            return None
+        return Project(
+            name="Always Easy",
+            description="A pre-generated project.",
+            difficulty=Difficulty(result),
+            duration_minutes=10,
+            materials="paper, crayons",
+            instructions="Draw on the paper.",
+        )
+
+    async def scenario():
+        pool = ProjectPool(generate=generate, depth=1, retry_delay=60)
+        pool.start()
+        await asyncio.sleep(0.1)
+        await pool.stop()
+        return pool.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert len(calls) == 3
+    assert stats["generated"] == (1 if result else 0)
+    assert stats["wasted"] == (2 if result else 3)
+
+
+def test_needs_agent_or_generate():
+    with pytest.raises(ValueError):
+        ProjectPool()
+
+
+def test_pipeline_fills_vary_the_prompt_and_skip_the_research_cache(monkeypatch):
+    runs = []
+
+    async def generate_project(runner, prompt, user_id="default", state=None):
+        runs.append((prompt, state))
+
+    monkeypatch.setattr(project_pool, "generate_project", generate_project)
+    pool = ProjectPool(agent=BaseAgent(name="pipeline"))
+
+    async def scenario():
+        for _ in range(2):
+            await pool._run_pipeline(Difficulty.EASY)
+
+    asyncio.run(scenario())
+
+    prompts = [prompt for prompt, _ in runs]
+    assert prompts == [
+        "Please provide an easy toddler project about animals.",
+        "Please provide an easy toddler project about colors.",
+    ]
+    assert all(state == {SKIP_CACHE_KEY: True} for _, state in runs)
+    assert project_pool.pool_prompt(Difficulty.HARD, "bugs") == (
+        "Please provide a hard toddler project about bugs."
+    )
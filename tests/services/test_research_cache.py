@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools import FunctionTool
+from google.genai import types
+
+from toddle_ops.services.research_cache import (
+    SKIP_CACHE_KEY,
+    CachedTool,
+    ResearchCache,
+    is_generic_query,
+    normalize_query,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_query():
+    assert normalize_query("Safe toddler ART crafts!") == normalize_query(
+        "safe  toddler art, crafts"
+    )
+    # word order is part of the request
+    assert normalize_query("glue paper to cardboard") != normalize_query(
+        "glue cardboard to paper"
+    )
+
+
+def test_is_generic_query():
+    assert is_generic_query("Please provide a project.")
+    assert is_generic_query("Give me an easy toddler activity idea!")
+    assert not is_generic_query("An easy painting project with leaves")
+
+
+def test_request_key_includes_the_instruction():
+    def request(instruction):
+        return LlmRequest(
+            model="gemini-2.5-flash-lite",
+            contents=[types.Content(role="user", parts=[types.Part(text="paint")])],
+            config=types.GenerateContentConfig(system_instruction=instruction),
+        )
+
+    key = ResearchCache.request_key
+    assert key("A", request("Find crafts.")) == key("A", request("Find crafts."))
+    assert key("A", request("Find crafts.")) != key("A", request("Find games."))
+
+
+def test_ttl_and_sharing_across_instances(tmp_path):
+    clock = _Clock()
+    cache = ResearchCache(tmp_path / "cache.db", ttl_seconds=60, clock=clock)
+    cache.put("q", "answer")
+
+    # a second instance (another process, say) sees the same entries
+    other = ResearchCache(tmp_path / "cache.db", ttl_seconds=60, clock=clock)
+    assert other.get("q") == "answer"
+
+    clock.now += 61
+    assert cache.get("q") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path):
+    clock = _Clock()
+    cache = ResearchCache(tmp_path / "cache.db", max_bytes=350, clock=clock)
+    for key in "abc":
+        clock.now += 1
+        cache.put(key, "x" * 100)
+    clock.now += 1
+    assert cache.get("a") is not None
+    clock.now += 1
+    cache.put("d", "x" * 100)
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    assert cache.evictions == 1
+
+
+def test_cached_tool_against_stub_search(tmp_path):
+    calls = []
+
+    def search(query: str) -> dict:
+        """Stub search tool."""
+        calls.append(query)
+        if query == "boom":
+            return {"error": "quota exceeded"}
+        return {"results": [f"result for {query}"]}
+
+    cache = ResearchCache(tmp_path / "cache.db")
+    tool = CachedTool(FunctionTool(search), cache)
+    assert tool.name == "search"
+    assert tool._get_declaration().name == "search"
+
+    async def scenario():
+        return [
+            await tool.run_async(args={"query": q}, tool_context=None)
+            for q in ["toddler art crafts", "Toddler ART crafts!", "boom", "boom"]
+        ]
+
+    results = asyncio.run(scenario())
+
+    assert results[0] == results[1] == {"results": ["result for toddler art crafts"]}
+    assert calls == ["toddler art crafts", "boom", "boom"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+    assert stats["avg_fetch_ms"] > 0
+
+
+def test_model_callbacks_cache_researcher_responses(tmp_path):
+    cache = ResearchCache(tmp_path / "cache.db")
+
+    def request(text):
+        return LlmRequest(
+            model="gemini-2.5-flash-lite",
+            contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+        )
+
+    def context(invocation_id, **state):
+        return SimpleNamespace(
+            agent_name="ArtCraftResearcher", invocation_id=invocation_id, state=state
+        )
+
+    response = LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text="Leaf prints")])
+    )
+
+    async def scenario():
+        first = await cache.before_model(context("1"), request("easy art project"))
+        # with SSE streaming, chunks arrive before the aggregated response
+        chunk = response.model_copy(update={"partial": True})
+        await cache.after_model(context("1"), chunk)
+        await cache.after_model(context("1"), response)
+        second = await cache.before_model(context("2"), request("Easy, art project"))
+        skipped = await cache.before_model(
+            context("3", **{SKIP_CACHE_KEY: True}), request("easy art project")
+        )
+        # generic requests are neither stored nor answered from the cache
+        for invocation_id in ("4", "5"):
+            generic = await cache.before_model(
+                context(invocation_id), request("Please provide a project.")
+            )
+            await cache.after_model(context(invocation_id), response)
+        return first, second, skipped, generic
+
+    first, second, skipped, generic = asyncio.run(scenario())
+
+    assert first is None
+    assert second.content.parts[0].text == "Leaf prints"
+    # sessions that opt out go to the model even when an answer is cached
+    assert skipped is None
+    assert generic is None
+    assert cache.stats()["hits"] == 1